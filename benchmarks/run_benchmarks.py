@@ -0,0 +1,240 @@
+"""Benchmarks of the conversion stages on synthetic LandXML and 2DM files.
+
+Every stage is timed (best of `--repeat` runs) and its peak memory is measured by `tracemalloc` in an additional run.
+Memory allocated by QGIS and MDAL outside of Python is not included. Results are written as JSON and compared
+with the baseline if it exists, stages slower or using more memory than `--threshold` are reported as regressions.
+
+    python -m benchmarks.run_benchmarks --surfaces 3 --points 100000
+    python -m benchmarks.run_benchmarks --surfaces 3 --points 100000 --save-baseline
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing
+
+import numpy as np
+
+from .synthetic import synthetic_surfaces, write_2dm, write_landxml
+
+RESULTS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def measure(function: typing.Callable[[], typing.Any], repeat: int) -> typing.Dict[str, float]:
+    """Best time of `repeat` runs in seconds and peak memory of one run traced by `tracemalloc` in bytes."""
+    times = []
+
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"time": min(times), "peak_memory": peak_memory}
+
+
+def stages(folder: str, landxml_file: str, mesh_2dm_file: str) -> typing.Dict[str, typing.Callable[[], typing.Any]]:
+    """Benchmarked stages by name. Modules using QGIS providers are imported after QGIS is initialized."""
+    from qgis.core import QgsCoordinateReferenceSystem, QgsProcessingContext, QgsProcessingFeedback
+
+    from landxmlconvertor.classes.landxml_cache import LANDXML_READER_CACHE
+    from landxmlconvertor.classes.landxml_reader import LandXMLReader, lxml_available
+    from landxmlconvertor.classes.landxml_writer import LandXMLWriter
+    from landxmlconvertor.classes.mesh2dm_reader import Mesh2DMReader
+    from landxmlconvertor.classes.mesh2dm_writer import Mesh2DMWriter
+    from landxmlconvertor.classes.qgs_mesh import create_qgs_mesh
+    from landxmlconvertor.tool_convert_landxml_2_mesh import ConvertLandXML2Mesh
+    from landxmlconvertor.tool_convert_mesh_to_landxml import ConvertMesh2LandXML
+
+    land_xml = LandXMLReader(landxml_file, streaming=True)
+
+    def write_landxml_surfaces() -> None:
+        writer = LandXMLWriter(QgsCoordinateReferenceSystem("EPSG:3007"))
+        for surface in land_xml.surfaces:
+            writer.add_surface_arrays(surface.name, surface.arrays())
+        writer.write(os.path.join(folder, "written.xml"))
+
+    def run_algorithm(algorithm_class: type, parameters: typing.Dict[str, typing.Any]) -> None:
+        LANDXML_READER_CACHE.clear()
+
+        algorithm = algorithm_class()
+        algorithm.initAlgorithm()
+
+        context = QgsProcessingContext()
+        feedback = QgsProcessingFeedback()
+
+        ok, message = algorithm.checkParameterValues(parameters, context)
+        if not ok:
+            raise RuntimeError(message)
+
+        algorithm.processAlgorithm(parameters, context, feedback)
+
+    def landxml_2_mesh_parameters(merge_surfaces: bool) -> typing.Dict[str, typing.Any]:
+        return {
+            ConvertLandXML2Mesh.INPUT: landxml_file,
+            ConvertLandXML2Mesh.UNION_SURFACES: merge_surfaces,
+            ConvertLandXML2Mesh.MESH_FORMAT: ConvertLandXML2Mesh.driver_names.index("2DM"),
+            ConvertLandXML2Mesh.OUTPUT: os.path.join(folder, "meshes"),
+        }
+
+    stages = {
+        "landxml_read": lambda: LandXMLReader(landxml_file),
+        "landxml_read_streaming": lambda: LandXMLReader(landxml_file, streaming=True),
+        "landxml_read_expat": lambda: LandXMLReader(landxml_file, parser="expat"),
+        "landxml_read_mmap": lambda: LandXMLReader(landxml_file, parser="mmap"),
+        "landxml_scan": lambda: LandXMLReader.scan(landxml_file),
+        "2dm_write": lambda: Mesh2DMWriter(land_xml.all_points, land_xml.all_faces).write(
+            os.path.join(folder, "written.2dm")
+        ),
+        "2dm_read": lambda: Mesh2DMReader(mesh_2dm_file),
+        "landxml_write": write_landxml_surfaces,
+        "qgs_mesh": lambda: create_qgs_mesh(land_xml.all_points, land_xml.all_faces),
+        "algorithm_landxml_to_mesh": lambda: run_algorithm(ConvertLandXML2Mesh, landxml_2_mesh_parameters(False)),
+        "algorithm_landxml_to_mesh_merged": lambda: run_algorithm(ConvertLandXML2Mesh, landxml_2_mesh_parameters(True)),
+        "algorithm_mesh_to_landxml": lambda: run_algorithm(
+            ConvertMesh2LandXML,
+            {
+                ConvertMesh2LandXML.INPUT: [mesh_2dm_file],
+                ConvertMesh2LandXML.OUTPUT: os.path.join(folder, "algorithm.xml"),
+            },
+        ),
+    }
+
+    if lxml_available():
+        stages["landxml_read_lxml"] = lambda: LandXMLReader(landxml_file, parser="lxml")
+
+    return stages
+
+
+def compare(
+    results: typing.Dict[str, typing.Any], baseline: typing.Dict[str, typing.Any], threshold: float
+) -> typing.List[str]:
+    """Returns descriptions of stages that are slower or use more memory than the baseline by more than `threshold`."""
+    regressions = []
+
+    for stage, values in results["stages"].items():
+        if stage not in baseline["stages"]:
+            continue
+
+        for metric in ["time", "peak_memory"]:
+            baseline_value = baseline["stages"][stage][metric]
+
+            if baseline_value > 0 and values[metric] > baseline_value * (1 + threshold):
+                regressions.append(
+                    f"{stage}: {metric} {values[metric]:.6g} exceeds baseline {baseline_value:.6g} "
+                    f"by {100 * (values[metric] / baseline_value - 1):.1f} %"
+                )
+
+    return regressions
+
+
+def main(arguments: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark conversion stages on synthetic surfaces.")
+    parser.add_argument("--surfaces", type=int, default=3, help="number of surfaces")
+    parser.add_argument("--points", type=int, default=100_000, help="number of points of each surface")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic surfaces")
+    parser.add_argument("--without-namespace", action="store_true", help="write LandXML without namespace")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs of each stage")
+    parser.add_argument("--stages", nargs="+", help="run only these stages")
+    parser.add_argument("--output", default=os.path.join(RESULTS_FOLDER, "results.json"), help="results file")
+    parser.add_argument("--baseline", default=os.path.join(RESULTS_FOLDER, "baseline.json"), help="baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="store results as new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative regression, 0.25 is 25 %%")
+    args = parser.parse_args(arguments)
+
+    from qgis.core import Qgis, QgsApplication
+
+    application = QgsApplication([], False)
+    application.initQgis()
+
+    config = {
+        "surfaces": args.surfaces,
+        "points": args.points,
+        "seed": args.seed,
+        "namespace": not args.without_namespace,
+    }
+
+    results: typing.Dict[str, typing.Any] = {
+        "config": config,
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "qgis": Qgis.version(),
+            "platform": platform.platform(),
+        },
+        "stages": {},
+    }
+
+    with tempfile.TemporaryDirectory() as folder:
+        landxml_file = os.path.join(folder, "synthetic.xml")
+        mesh_2dm_file = os.path.join(folder, "synthetic.2dm")
+
+        surfaces = synthetic_surfaces(args.surfaces, args.points, args.seed)
+
+        write_landxml(landxml_file, surfaces, namespace=config["namespace"])
+        write_2dm(mesh_2dm_file, surfaces[0])
+
+        results["files"] = {"landxml_size": os.path.getsize(landxml_file), "2dm_size": os.path.getsize(mesh_2dm_file)}
+
+        for name, function in stages(folder, landxml_file, mesh_2dm_file).items():
+            if args.stages and name not in args.stages:
+                continue
+
+            results["stages"][name] = measure(function, args.repeat)
+
+            print(
+                f"{name:<36} {results['stages'][name]['time']:>10.3f} s "
+                f"{results['stages'][name]['peak_memory'] / 1024 / 1024:>10.1f} MiB"
+            )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=4)
+
+    status = 0
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+
+        print(f"Baseline saved: {args.baseline}")
+
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+        if baseline["config"] != config:
+            print(f"Baseline was recorded with different configuration {baseline['config']}, not compared.")
+        else:
+            regressions = compare(results, baseline, args.threshold)
+
+            for regression in regressions:
+                print(f"REGRESSION {regression}")
+
+            if regressions:
+                status = 1
+            else:
+                print("No regressions against baseline.")
+
+    application.exitQgis()
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+import math
+import typing
+
+import numpy as np
+
+from landxmlconvertor.classes.mesh_arrays import MeshArrays
+
+LANDXML_NAMESPACE = "http://www.landxml.org/schema/LandXML-1.2"
+
+# number of records formatted at once when writing synthetic files
+_CHUNK_SIZE = 65_536
+
+
+def synthetic_surface(points: int, seed: int = 0, origin: typing.Tuple[float, float] = (0.0, 0.0)) -> MeshArrays:
+    """Deterministic TIN of at least `points` vertices on a jittered regular grid with spacing 1.
+
+    Every grid cell is split into two triangles, so the surface has about twice as many faces as vertices.
+    Vertex ids are numbered from 1, as they usually are in LandXML surfaces.
+    """
+    columns = max(2, math.ceil(math.sqrt(points)))
+    rows = max(2, math.ceil(points / columns))
+
+    rng = np.random.default_rng(seed)
+
+    grid_x, grid_y = np.meshgrid(np.arange(columns, dtype=np.float64), np.arange(rows, dtype=np.float64))
+
+    x = origin[0] + grid_x.ravel() + rng.uniform(-0.25, 0.25, rows * columns)
+    y = origin[1] + grid_y.ravel() + rng.uniform(-0.25, 0.25, rows * columns)
+    z = 100 + np.sin(x / 25) * 10 + np.cos(y / 40) * 5 + rng.normal(0, 0.1, rows * columns)
+
+    # lower left corners of the grid cells
+    corners = (np.arange(rows - 1)[:, np.newaxis] * columns + np.arange(columns - 1)).ravel()
+
+    lower = np.column_stack([corners, corners + 1, corners + columns + 1])
+    upper = np.column_stack([corners, corners + columns + 1, corners + columns])
+    faces = np.stack([lower, upper], axis=1).reshape(-1, 3) + 1
+
+    return MeshArrays(
+        np.arange(1, rows * columns + 1, dtype=np.int64),
+        x,
+        y,
+        z,
+        np.arange(1, faces.shape[0] + 1, dtype=np.int64),
+        faces,
+    )
+
+
+def synthetic_surfaces(surfaces: int, points: int, seed: int = 0) -> typing.List[MeshArrays]:
+    """Surfaces placed side by side, each with its own seed."""
+    meshes = []
+
+    for i in range(surfaces):
+        origin = (i * (math.sqrt(points) + 10), 0.0)
+        meshes.append(synthetic_surface(points, seed + i, origin))
+
+    return meshes
+
+
+def write_landxml(
+    path: str, surfaces: typing.Sequence[MeshArrays], namespace: bool = True, epsg_code: int = 3007
+) -> None:
+    """Writes surfaces into LandXML file, with or without LandXML 1.2 namespace."""
+    root_attributes = f' xmlns="{LANDXML_NAMESPACE}" version="1.2"' if namespace else ' version="1.2"'
+
+    with open(path, "w", encoding="utf-8", buffering=1024 * 1024) as file:
+        file.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        file.write(f"<LandXML{root_attributes}>\n")
+        file.write(f'    <CoordinateSystem epsgCode="{epsg_code}"/>\n')
+        file.write("    <Surfaces>\n")
+
+        for i, mesh in enumerate(surfaces):
+            file.write(f'        <Surface name="Surface {i + 1}">\n')
+            file.write('            <Definition surfType="TIN">\n')
+
+            file.write("                <Pnts>\n")
+            for start in range(0, mesh.vertex_count, _CHUNK_SIZE):
+                end = start + _CHUNK_SIZE
+                file.write(
+                    "".join(
+                        map(
+                            '                    <P id="{}">{} {} {}</P>\n'.format,
+                            mesh.vertex_ids[start:end].tolist(),
+                            mesh.y[start:end].tolist(),
+                            mesh.x[start:end].tolist(),
+                            mesh.z[start:end].tolist(),
+                        )
+                    )
+                )
+            file.write("                </Pnts>\n")
+
+            file.write("                <Faces>\n")
+            for start in range(0, mesh.face_count, _CHUNK_SIZE):
+                end = start + _CHUNK_SIZE
+                file.write(
+                    "".join(map("                    <F>{} {} {}</F>\n".format, *mesh.faces[start:end].T.tolist()))
+                )
+            file.write("                </Faces>\n")
+
+            file.write("            </Definition>\n")
+            file.write("        </Surface>\n")
+
+        file.write("    </Surfaces>\n")
+        file.write("</LandXML>\n")
+
+
+def write_2dm(path: str, mesh: MeshArrays) -> None:
+    """Writes triangular mesh into 2DM file."""
+    with open(path, "w", encoding="utf-8", buffering=1024 * 1024) as file:
+        file.write("MESH2D\n")
+
+        for start in range(0, mesh.vertex_count, _CHUNK_SIZE):
+            end = start + _CHUNK_SIZE
+            file.write(
+                "".join(
+                    map(
+                        "ND {} {} {} {}\n".format,
+                        mesh.vertex_ids[start:end].tolist(),
+                        mesh.x[start:end].tolist(),
+                        mesh.y[start:end].tolist(),
+                        mesh.z[start:end].tolist(),
+                    )
+                )
+            )
+
+        for start in range(0, mesh.face_count, _CHUNK_SIZE):
+            end = start + _CHUNK_SIZE
+            file.write(
+                "".join(
+                    map(
+                        "E3T {} {} {} {} 1\n".format,
+                        mesh.face_ids[start:end].tolist(),
+                        *mesh.faces[start:end].T.tolist(),
+                    )
+                )
+            )
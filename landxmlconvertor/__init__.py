@@ -1,6 +1,6 @@
-from .plugin import LandXMLConvertorPlugin
-
-
 # noinspection PyPep8Naming
 def classFactory(iface):
+    # plugin with its algorithms is imported only by QGIS, worker processes import just `classes` of the package
+    from .plugin import LandXMLConvertorPlugin
+
     return LandXMLConvertorPlugin(iface)
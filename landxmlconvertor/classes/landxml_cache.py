@@ -0,0 +1,92 @@
+import collections
+import os
+import threading
+import typing
+
+from .landxml_reader import LandXMLReader
+from .progress import ProgressCallback
+
+CacheKey = typing.Tuple[str, int, int, typing.Tuple[typing.Tuple[str, typing.Any], ...]]
+
+
+class LandXMLReaderCache:
+    """LRU cache of parsed `LandXMLReader` objects, so that the same file is not parsed repeatedly.
+
+    Readers are identified by absolute path, size and modification time of the file and by the reader options,
+    a modified file is parsed again. Total memory of decoded surfaces is kept under `memory_budget` bytes
+    by evicting least recently used readers, readers bigger than the budget are not cached at all.
+    """
+
+    def __init__(self, memory_budget: int = 1024 * 1024 * 1024) -> None:
+        self.memory_budget = memory_budget
+
+        self._readers: typing.OrderedDict[CacheKey, LandXMLReader] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: str, options: typing.Dict[str, typing.Any]) -> CacheKey:
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, tuple(sorted(options.items())))
+
+    @property
+    def memory_used(self) -> int:
+        return sum(reader.nbytes for reader in self._readers.values())
+
+    def __len__(self) -> int:
+        return len(self._readers)
+
+    def peek(self, path: str, **options) -> typing.Optional[LandXMLReader]:
+        """Returns cached reader of the file if it is available and up to date, the file is never parsed."""
+        try:
+            key = self._key(path, options)
+        except OSError:
+            return None
+
+        with self._lock:
+            reader = self._readers.get(key)
+            if reader is not None:
+                self._readers.move_to_end(key)
+            return reader
+
+    def get(self, path: str, progress: typing.Optional[ProgressCallback] = None, **options) -> LandXMLReader:
+        """Returns reader of the file, parses the file with given `LandXMLReader` options if it is not cached.
+
+        `progress` is only used if the file is parsed and it is not part of the options identifying the reader.
+        """
+        reader = self.peek(path, **options)
+
+        if reader is not None:
+            return reader
+
+        key = self._key(path, options)
+
+        reader = LandXMLReader(path, progress=progress, **options)
+
+        # callback of the finished run is not kept alive by the cached reader
+        reader.progress = None
+
+        self._add(key, reader)
+
+        return reader
+
+    def _add(self, key: CacheKey, reader: LandXMLReader) -> None:
+        if reader.nbytes > self.memory_budget:
+            return
+
+        with self._lock:
+            # drop readers of the same file that was modified since, readers with other options are kept
+            for cached_key in [x for x in self._readers.keys() if x[0] == key[0] and x[1:3] != key[1:3]]:
+                del self._readers[cached_key]
+
+            self._readers[key] = reader
+
+            while self.memory_used > self.memory_budget:
+                self._readers.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._readers.clear()
+
+
+# cache shared by processing algorithms, so validation and execution of the same file parse it only once
+LANDXML_READER_CACHE = LandXMLReaderCache()
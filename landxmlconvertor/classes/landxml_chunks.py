@@ -0,0 +1,150 @@
+import mmap
+import re
+import typing
+import xml.parsers.expat as expat
+
+import numpy as np
+
+from .landxml_decoder import decode_coordinates, decode_faces, decode_ids
+from .landxml_elements import LandXMLSurface
+
+# size of the parts of `<Pnts>` and `<Faces>` contents decoded by single task
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# start tag of `<Pnts>` or `<Faces>` element with optional namespace prefix
+_BLOCK_START = re.compile(rb"<((?:[A-Za-z_][\w.-]*:)?)(Pnts|Faces)(?:\s[^>]*)?>")
+
+
+class Block:
+    """Content of `<Pnts>` or `<Faces>` element as byte range of the file, without its start and end tags."""
+
+    def __init__(self, kind: str, start: int, end: int) -> None:
+        self.kind = kind
+        self.start = start
+        self.end = end
+
+    def chunks(self, data: mmap.mmap, chunk_size: typing.Optional[int] = None) -> typing.List[typing.Tuple[int, int]]:
+        """Splits the content into byte ranges of about `chunk_size` bytes (`CHUNK_SIZE` by default), each ends after
+        the end tag of an element."""
+        chunk_size = chunk_size or CHUNK_SIZE
+        ranges = []
+
+        start = self.start
+        while start < self.end:
+            end = data.find(b"</", min(start + chunk_size, self.end), self.end)
+            end = self.end if end == -1 else data.find(b">", end, self.end) + 1
+
+            # end tag without `>` is an error found by the parser of the chunk
+            if end == 0:
+                end = self.end
+
+            ranges.append((start, end))
+            start = end
+
+        return ranges
+
+
+def find_blocks(data: mmap.mmap) -> typing.List[Block]:
+    """Finds contents of all non-empty `<Pnts>` and `<Faces>` elements in the document, in their order.
+
+    The search does not understand XML, elements inside of comments or CDATA are found too. Number and kinds of
+    blocks have to be checked against the elements found by a parser.
+    """
+    blocks = []
+
+    position = 0
+    while match := _BLOCK_START.search(data, position):
+        start = match.end()
+        position = start
+
+        if match.group(0).endswith(b"/>"):
+            continue
+
+        end = data.find(b"</" + match.group(1) + match.group(2), start)
+        if end == -1:
+            break
+
+        blocks.append(Block(match.group(2).decode("ascii"), start, end))
+        position = end
+
+    return blocks
+
+
+def _chunk_elements(
+    path: str, start: int, end: int, tag: str
+) -> typing.Tuple[typing.List[typing.Dict[str, str]], typing.List[str]]:
+    """Parses the byte range of the file with child elements of `<Pnts>` or `<Faces>`.
+
+    Returns attributes and texts of elements named `tag`, with any namespace prefix. Namespaces are not processed,
+    so the prefixes need not be declared in the chunk.
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        content = data[start:end]
+
+    attributes = []
+    texts = []
+    text: typing.Optional[typing.List[str]] = None
+    depth = 0
+
+    def start_element(name: str, element_attributes: typing.Dict[str, str]) -> None:
+        nonlocal text, depth
+
+        depth += 1
+        if depth == 2 and name.rpartition(":")[2] == tag:
+            attributes.append(element_attributes)
+            text = []
+
+    def end_element(name: str) -> None:
+        nonlocal text, depth
+
+        if depth == 2 and text is not None:
+            texts.append("".join(text))
+            text = None
+        depth -= 1
+
+    def character_data(data: str) -> None:
+        if text is not None:
+            text.append(data)
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+
+    parser.Parse(b"<chunk>", False)
+    parser.Parse(content, False)
+    parser.Parse(b"</chunk>", True)
+
+    return attributes, texts
+
+
+def decode_points_chunk(path: str, start: int, end: int, surface_name: str = "") -> typing.Tuple[np.ndarray, ...]:
+    """Decodes `<P>` elements in the byte range of the file, returns vertex ids, x, y and z. Runs in worker process."""
+    attributes, texts = _chunk_elements(path, start, end, "P")
+    point_ids = [x["id"] for x in attributes]
+
+    coordinates = decode_coordinates(texts, surface_name, point_ids)
+
+    return decode_ids(point_ids, surface_name), coordinates[:, 1], coordinates[:, 0], coordinates[:, 2]
+
+
+def decode_faces_chunk(
+    path: str, start: int, end: int, surface_name: str = "", face_offset: int = 0
+) -> typing.Tuple[np.ndarray, ...]:
+    """Decodes `<F>` elements in the byte range of the file. Runs in worker process.
+
+    Returns numbers of visible faces counted from 1 in the chunk, their connectivity and number of all faces in the
+    chunk, including the hidden ones, so that the numbers can be offset by faces of the preceding chunks.
+    Invalid faces are reported by their number in the block, `face_offset` is number of faces in preceding chunks.
+    """
+    attributes, texts = _chunk_elements(path, start, end, "F")
+
+    numbers = np.arange(1, len(texts) + 1, dtype=np.int64)
+
+    hidden = np.array([LandXMLSurface.is_hidden_face_attributes(x) for x in attributes], dtype=bool)
+    if hidden.any():
+        numbers = numbers[~hidden]
+        texts = [x for x, x_hidden in zip(texts, hidden) if not x_hidden]
+
+    return numbers, decode_faces(numbers + face_offset, texts, surface_name), np.int64(len(attributes))
@@ -0,0 +1,207 @@
+import typing
+
+import numpy as np
+
+from .mesh_arrays import NO_VERTEX, MeshArraysBuilder
+
+# number of `<P>` or `<F>` elements whose texts are collected and decoded at once
+DECODE_CHUNK_SIZE = 65_536
+
+# whitespace characters separating values in texts of elements
+_WHITESPACE = np.frombuffer(b" \t\n\r\v\f", dtype=np.uint8)
+
+
+def decode_rows(texts: typing.Sequence[typing.Optional[str]], dtype: type) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Decodes whitespace separated numbers of all texts in one vectorized pass.
+
+    Returns values of all texts joined and number of values in each text. Values may be separated by any whitespace,
+    including new lines inside the text. Raises `RowDecodeError` with index of the first text that is not a number.
+    """
+    if not texts:
+        return np.empty(0, dtype=dtype), np.empty(0, dtype=np.int64)
+
+    texts = ["" if x is None else x for x in texts]
+
+    # texts are separated by new line, that is also whitespace for the numeric parser
+    joined = "\n".join(texts) + "\n"
+    data = joined.encode("utf-8")
+
+    values = None
+
+    # non ASCII text is never valid and character positions would not match the texts
+    if len(data) == len(joined):
+        try:
+            values = np.fromstring(data, dtype=dtype, sep=" ")
+        except ValueError:
+            values = None
+
+    if values is not None:
+        # number of values in each text, from starts of the tokens between starts of the texts
+        characters = np.frombuffer(data, dtype=np.uint8)
+        is_separator = np.isin(characters, _WHITESPACE)
+        token_starts = ~is_separator & np.concatenate(([True], is_separator[:-1]))
+
+        text_ends = np.cumsum(np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)) + 1)
+        counts = np.diff(np.concatenate(([0], np.cumsum(token_starts)[text_ends - 1])))
+
+        if values.size == counts.sum():
+            return values, counts
+
+    # some value is not a number, find the text with it
+    convert = float if np.issubdtype(dtype, np.floating) else int
+    for i, text in enumerate(texts):
+        try:
+            [convert(x) for x in text.split()]
+        except ValueError:
+            raise RowDecodeError(i) from None
+
+    # values accepted by Python but not by the vectorized parser, e.g. `nan`
+    rows = [[convert(x) for x in text.split()] for text in texts]
+
+    return np.array([x for row in rows for x in row], dtype=dtype), np.array([len(x) for x in rows], dtype=np.int64)
+
+
+class RowDecodeError(ValueError):
+    """Text of the element at `row` contains value that is not a number."""
+
+    def __init__(self, row: int) -> None:
+        super().__init__(f"Invalid number in text {row}.")
+        self.row = row
+
+
+def decode_coordinates(
+    texts: typing.Sequence[typing.Optional[str]],
+    surface_name: str = "",
+    point_ids: typing.Optional[typing.Sequence[str]] = None,
+) -> np.ndarray:
+    """Decodes texts of `<P>` elements, i.e. `northing easting elevation`, into array of shape (N, 3) in that order.
+
+    Raises `ValueError` naming the first invalid point, by its id if `point_ids` are given.
+    """
+
+    def invalid_point(row: int) -> ValueError:
+        point = f"`{point_ids[row]}` " if point_ids is not None else ""
+        return ValueError(f"Invalid point {point}in surface `{surface_name}`: `{texts[row]}`.")
+
+    try:
+        values, counts = decode_rows(texts, np.float64)
+    except RowDecodeError as e:
+        raise invalid_point(e.row) from None
+
+    if np.any(counts != 3):
+        raise invalid_point(int(np.argmax(counts != 3)))
+
+    return values.reshape(-1, 3)
+
+
+def decode_ids(texts: typing.Sequence[typing.Optional[str]], surface_name: str = "") -> np.ndarray:
+    """Decodes `id` attributes of `<P>` elements."""
+    try:
+        values, counts = decode_rows(texts, np.int64)
+    except RowDecodeError as e:
+        raise ValueError(f"Invalid point id `{texts[e.row]}` in surface `{surface_name}`.") from None
+
+    if np.any(counts != 1):
+        row = int(np.argmax(counts != 1))
+        raise ValueError(f"Invalid point id `{texts[row]}` in surface `{surface_name}`.")
+
+    return values
+
+
+def decode_faces(
+    face_ids: typing.Sequence[int], texts: typing.Sequence[typing.Optional[str]], surface_name: str = ""
+) -> np.ndarray:
+    """Decodes texts of `<F>` elements into connectivity array, (N, 3) or (N, 4) with triangles padded by `NO_VERTEX`."""
+    try:
+        values, counts = decode_rows(texts, np.int64)
+    except RowDecodeError as e:
+        raise ValueError(f"Invalid face `{face_ids[e.row]}` in surface `{surface_name}`: `{texts[e.row]}`.") from None
+
+    invalid = (counts != 3) & (counts != 4)
+    if np.any(invalid):
+        row = int(np.argmax(invalid))
+        raise ValueError(f"Face `{face_ids[row]}` has {counts[row]} vertices, only triangles and quads are supported.")
+
+    if np.all(counts == 3):
+        return values.reshape(-1, 3)
+
+    faces = np.full((counts.size, 4), NO_VERTEX, dtype=np.int64)
+    faces[np.arange(4) < counts[:, np.newaxis]] = values
+
+    return faces
+
+
+class SurfaceDecoder:
+    """Collects texts of `<P>` and `<F>` elements of single surface and decodes them into the builder in chunks.
+
+    Elements are given by their id or number and text, so they can be released as soon as they are added.
+    `flush()` has to be called once all elements are added.
+    """
+
+    def __init__(self, builder: MeshArraysBuilder, surface_name: str = "") -> None:
+        self.builder = builder
+        self.surface_name = surface_name
+
+        self._point_ids: typing.List[str] = []
+        self._point_texts: typing.List[typing.Optional[str]] = []
+
+        self._face_ids: typing.List[int] = []
+        self._face_texts: typing.List[typing.Optional[str]] = []
+
+    def add_point(self, point_id: str, text: typing.Optional[str]) -> None:
+        self._point_ids.append(point_id)
+        self._point_texts.append(text)
+
+        if len(self._point_texts) >= DECODE_CHUNK_SIZE:
+            self.flush_points()
+
+    def add_face(self, face_id: int, text: typing.Optional[str]) -> None:
+        self._face_ids.append(face_id)
+        self._face_texts.append(text)
+
+        if len(self._face_texts) >= DECODE_CHUNK_SIZE:
+            self.flush_faces()
+
+    def add_points(self, point_ids: typing.Sequence[str], texts: typing.Sequence[typing.Optional[str]]) -> None:
+        """Adds many points at once, e.g. texts extracted by XPath."""
+        self._point_ids.extend(point_ids)
+        self._point_texts.extend(texts)
+
+        if len(self._point_texts) >= DECODE_CHUNK_SIZE:
+            self.flush_points()
+
+    def add_faces(self, face_ids: typing.Sequence[int], texts: typing.Sequence[typing.Optional[str]]) -> None:
+        """Adds many faces at once, e.g. texts extracted by XPath."""
+        self._face_ids.extend(face_ids)
+        self._face_texts.extend(texts)
+
+        if len(self._face_texts) >= DECODE_CHUNK_SIZE:
+            self.flush_faces()
+
+    def flush_points(self) -> None:
+        if not self._point_texts:
+            return
+
+        coordinates = decode_coordinates(self._point_texts, self.surface_name, self._point_ids)
+
+        self.builder.add_vertices(
+            decode_ids(self._point_ids, self.surface_name), coordinates[:, 1], coordinates[:, 0], coordinates[:, 2]
+        )
+
+        self._point_ids = []
+        self._point_texts = []
+
+    def flush_faces(self) -> None:
+        if not self._face_texts:
+            return
+
+        self.builder.add_faces(
+            np.array(self._face_ids, dtype=np.int64), decode_faces(self._face_ids, self._face_texts, self.surface_name)
+        )
+
+        self._face_ids = []
+        self._face_texts = []
+
+    def flush(self) -> None:
+        self.flush_points()
+        self.flush_faces()
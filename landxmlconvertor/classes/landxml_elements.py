@@ -1,20 +1,30 @@
-import copy
 import typing
 import xml.etree.ElementTree as ET
 
-from .mesh_elements import MeshFace, MeshVertex
+from .landxml_decoder import SurfaceDecoder, decode_coordinates
+from .mesh_arrays import MeshArrays, MeshArraysBuilder
+from .mesh_operations import ClipArea
+from .mesh_views import MeshFacesView, MeshVerticesView
+
+# number of points decoded at once when the file is scanned
+SCAN_CHUNK_SIZE = 65_536
 
 
 class LandXMLSurface:
-    """Class for reading individual surface from LandXML"""
+    """Class for reading individual surface from LandXML.
+
+    Vertices and faces are stored in columnar `MeshArrays`, `MeshVertex` and `MeshFace` objects are only created
+    when accessed through the read-only views. With `clip_area` only faces intersecting it and their vertices are kept.
+    """
 
     def __init__(
         self,
-        surface: ET.Element,
+        surface: typing.Optional[ET.Element],
         surface_number: int,
-        id_offset: int = 0,
         namespace_prefix: str = "",
         namespace: typing.Optional[typing.Dict[str, str]] = None,
+        name: str = "",
+        clip_area: typing.Optional[ClipArea] = None,
     ) -> None:
         self.namespace_prefix = namespace_prefix
 
@@ -23,47 +33,55 @@ class LandXMLSurface:
         else:
             self.namespace = {"": ""}
 
-        self.name = ""
+        self.name = name
 
         self.surface = surface
-        self.name = self.surface.attrib["name"]
+        if self.surface is not None:
+            self.name = self.surface.attrib.get("name", "")
 
         if not self.name:
             self.name = f"Surface_{surface_number}"
 
-        self.id_offset = int(id_offset)
+        self._arrays = MeshArrays.empty()
 
-        self._points: typing.List[MeshVertex] = []
-        self._get_points()
+        if self.surface is not None:
+            builder = MeshArraysBuilder()
+            self._get_points(builder)
+            self._get_faces(builder)
+            self._arrays = builder.build()
 
-        self._faces: typing.List[MeshFace] = []
-        self._get_faces()
+            if clip_area is not None:
+                self._arrays = clip_area.clip(self._arrays)
+
+    @classmethod
+    def from_mesh_arrays(
+        cls,
+        name: str,
+        surface_number: int,
+        mesh_arrays: MeshArrays,
+    ) -> "LandXMLSurface":
+        """Create surface from already decoded vertices and faces, without keeping any XML element."""
+        surface = cls(None, surface_number, name=name)
+        surface._arrays = mesh_arrays
+        return surface
 
     @property
     def _definition(self) -> ET.Element:
         return self.surface.find(f"{self.namespace_prefix}Definition", namespaces=self.namespace)
 
-    def points(self, add_id_offset: bool = False) -> typing.List[MeshVertex]:
-        """Returns deep copy of the vertices"""
-        points = copy.deepcopy(self._points)
-        if add_id_offset is False:
-            return points
-        else:
-            for point in points:
-                point.apply_id_offset(self.id_offset)
-            return points
-
-    def faces(self, add_id_offset: bool = False) -> typing.List[MeshFace]:
-        """Returns deep copy of the faces"""
-        faces = copy.deepcopy(self._faces)
-        if add_id_offset is False:
-            return faces
-        else:
-            for face in faces:
-                face.apply_vertices_id_offset(self.id_offset)
-            return faces
+    def arrays(self) -> MeshArrays:
+        """Returns vertices and faces as columnar arrays."""
+        return self._arrays
+
+    def points(self) -> MeshVerticesView:
+        """Returns read-only view of the vertices"""
+        return MeshVerticesView([self._arrays])
+
+    def faces(self) -> MeshFacesView:
+        """Returns read-only view of the faces"""
+        return MeshFacesView([self._arrays])
 
-    def _get_points(self) -> None:
+    def _get_points(self, builder: MeshArraysBuilder) -> None:
         if not self._definition:
             return
 
@@ -72,10 +90,33 @@ class LandXMLSurface:
         if not points:
             return
 
+        decoder = SurfaceDecoder(builder, self.name)
+
         for point_element in points.findall(f"{self.namespace_prefix}P", namespaces=self.namespace):
-            self._points.append(MeshVertex.from_xml_element(point_element))
+            decoder.add_point(point_element.attrib["id"], point_element.text)
+
+        decoder.flush()
+
+    @staticmethod
+    def is_hidden_face(face_element: ET.Element) -> bool:
+        """Checks if the face is marked as invisible (`i="1"`), such faces are not part of the surface."""
+        return LandXMLSurface.is_hidden_face_attributes(face_element.attrib)
+
+    @staticmethod
+    def is_hidden_face_attributes(attrs: typing.Dict[str, str]) -> bool:
+        """Checks if the attributes of face element mark it as invisible."""
+        if "i" in attrs.keys():
+            try:
+                i_value = int(attrs["i"])
+            except ValueError:
+                # atrribute cannot be converted to int and we expect its value to be 0
+                i_value = 0
 
-    def _get_faces(self) -> None:
+            return i_value == 1
+
+        return False
+
+    def _get_faces(self, builder: MeshArraysBuilder) -> None:
         if not self._definition:
             return
 
@@ -84,20 +125,62 @@ class LandXMLSurface:
         if not faces:
             return
 
+        decoder = SurfaceDecoder(builder, self.name)
+
         for i, face_element in enumerate(faces.findall(f"{self.namespace_prefix}F", namespaces=self.namespace)):
-            attrs = face_element.attrib
-            if "i" in attrs.keys():
-                try:
-                    i_value = int(attrs["i"])
-                except ValueError:
-                    # atrribute cannot be converted to int and we expect its value to be 0
-                    i_value = 0
+            if self.is_hidden_face(face_element):
+                continue
+
+            decoder.add_face(i + 1, face_element.text)
+
+        decoder.flush()
+
+    def empty(self) -> bool:
+        """Checks if the surface is empty - has no vertices."""
+        return self._arrays.vertex_count == 0
+
+
+class LandXMLSurfaceSummary:
+    """Name, number of points and faces and extent of the surface, collected when the LandXML file is scanned."""
+
+    def __init__(self, name: str, surface_number: int) -> None:
+        self.name = name
+
+        if not self.name:
+            self.name = f"Surface_{surface_number}"
+
+        self.point_count = 0
+        self.face_count = 0
+
+        self.x_min: typing.Optional[float] = None
+        self.y_min: typing.Optional[float] = None
+        self.z_min: typing.Optional[float] = None
+        self.x_max: typing.Optional[float] = None
+        self.y_max: typing.Optional[float] = None
+        self.z_max: typing.Optional[float] = None
+
+    def add_points_text(self, points_text: typing.List[str]) -> None:
+        """Extends the extent by points given as texts of `<P>` elements, i.e. `northing easting elevation`."""
+        if not points_text:
+            return
+
+        coordinates = decode_coordinates(points_text, self.name)
+        y_min, x_min, z_min = coordinates.min(axis=0).tolist()
+        y_max, x_max, z_max = coordinates.max(axis=0).tolist()
+
+        if self.x_min is not None:
+            x_min, y_min, z_min = min(x_min, self.x_min), min(y_min, self.y_min), min(z_min, self.z_min)
+            x_max, y_max, z_max = max(x_max, self.x_max), max(y_max, self.y_max), max(z_max, self.z_max)
 
-                if i_value == 1:
-                    continue
+        self.x_min, self.y_min, self.z_min = x_min, y_min, z_min
+        self.x_max, self.y_max, self.z_max = x_max, y_max, z_max
 
-            self._faces.append(MeshFace.from_xml_element(i + 1, face_element))
+    def extent(self) -> typing.Optional[typing.Tuple[float, float, float, float]]:
+        """Returns `(x_min, y_min, x_max, y_max)` of the surface or `None` if it has no points."""
+        if self.x_min is None:
+            return None
+        return (self.x_min, self.y_min, self.x_max, self.y_max)
 
     def empty(self) -> bool:
         """Checks if the surface is empty - has no vertices."""
-        return len(self._points) == 0
+        return self.point_count == 0
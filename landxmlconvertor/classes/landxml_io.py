@@ -0,0 +1,135 @@
+import gzip
+import os
+import struct
+import typing
+import zipfile
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZIP_MAGIC = b"PK\x03\x04"
+
+# suffixes of compressed LandXML files, the document is decompressed while it is read
+COMPRESSED_SUFFIXES = (".gz", ".zip")
+
+# compression level of written `.gz` files, higher levels are several times slower and save only few percent
+GZIP_COMPRESS_LEVEL = 3
+
+# file filter of file parameters accepting LandXML files
+LANDXML_FILE_FILTER = "LandXML Files (*.xml *.XML *.xml.gz *.zip);;All Files (*.*)"
+
+
+def detect_compression(path: str) -> typing.Optional[str]:
+    """Compression of the file by its content, `gzip`, `zip` or `None` for plain file."""
+    with open(path, "rb") as file:
+        magic = file.read(4)
+
+    if magic.startswith(GZIP_MAGIC):
+        return "gzip"
+    if magic == ZIP_MAGIC:
+        return "zip"
+
+    return None
+
+
+def open_archive(file: typing.Union[str, typing.BinaryIO]) -> zipfile.ZipFile:
+    """Opens zip archive, raises `ValueError` if it is not valid."""
+    try:
+        return zipfile.ZipFile(file)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Invalid zip archive: {e}") from e
+
+
+def archive_member(archive: zipfile.ZipFile) -> zipfile.ZipInfo:
+    """The first `.xml` file in the archive, raises `ValueError` if there is none."""
+    for info in archive.infolist():
+        if not info.is_dir() and info.filename.lower().endswith(".xml"):
+            return info
+
+    raise ValueError("No LandXML file in the archive.")
+
+
+def document_size(path: str) -> int:
+    """Size of the XML document in the file, after decompression if the file is compressed.
+
+    Size of gzip file is stored modulo 4 GiB, so it is never taken as less than size of the compressed file.
+    """
+    size = os.path.getsize(path)
+    compression = detect_compression(path)
+
+    if compression == "gzip":
+        with open(path, "rb") as file:
+            file.seek(-4, os.SEEK_END)
+            return max(size, struct.unpack("<I", file.read(4))[0])
+
+    if compression == "zip":
+        with open_archive(path) as archive:
+            return archive_member(archive).file_size
+
+    return size
+
+
+def landxml_base_name(path: str) -> str:
+    """Path without compression suffix and extension, e.g. `surface.xml.gz` -> `surface`."""
+    for suffix in COMPRESSED_SUFFIXES:
+        if path.lower().endswith(suffix):
+            path = path[: -len(suffix)]
+            break
+
+    return os.path.splitext(path)[0]
+
+
+class LandXMLInputFile:
+    """Binary file of the LandXML document for reading, gzip files and zip archives are decompressed while read.
+
+    Compression is detected from the content of the file, so compressed files do not need specific suffix.
+    From zip archive the first `.xml` file is read. `size` and `tell()` give the position for progress reporting,
+    in the compressed file for gzip files and in the decompressed document for zip archives.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.compression = detect_compression(path)
+
+        self._raw = open(path, "rb")
+        self._file: typing.BinaryIO = self._raw
+        self._archive: typing.Optional[zipfile.ZipFile] = None
+
+        self.size = os.fstat(self._raw.fileno()).st_size
+        self.tell = self._raw.tell
+
+        try:
+            if self.compression == "gzip":
+                self._file = gzip.GzipFile(fileobj=self._raw, mode="rb")
+            elif self.compression == "zip":
+                self._archive = open_archive(self._raw)
+
+                info = archive_member(self._archive)
+                self._file = self._archive.open(info)
+                self.size = info.file_size
+                self.tell = self._file.tell
+        except Exception:
+            self.close()
+            raise
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def close(self) -> None:
+        if self._file is not self._raw:
+            self._file.close()
+        if self._archive is not None:
+            self._archive.close()
+        self._raw.close()
+
+    def __enter__(self) -> "LandXMLInputFile":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def open_landxml_output(file_name: str) -> typing.TextIO:
+    """Opens text file for writing the LandXML document, files with `.gz` suffix are gzip compressed."""
+    if file_name.lower().endswith(".gz"):
+        return gzip.open(file_name, "wt", encoding="utf-8", compresslevel=GZIP_COMPRESS_LEVEL)
+
+    return open(file_name, "w", encoding="utf-8", buffering=1024 * 1024)
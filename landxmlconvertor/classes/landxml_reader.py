@@ -1,88 +1,985 @@
+import concurrent.futures
+import importlib.util
+import mmap
+import os
 import typing
 import xml.etree.ElementTree as ET
+import xml.parsers.expat as expat
 
+import numpy as np
 from qgis.core import QgsCoordinateReferenceSystem
 
-from . import get_namespace
-from .landxml_elements import LandXMLSurface
+from . import get_namespace, landxml_chunks
+from .landxml_chunks import Block, decode_faces_chunk, decode_points_chunk, find_blocks
+from .landxml_decoder import SurfaceDecoder
+from .landxml_elements import SCAN_CHUNK_SIZE, LandXMLSurface, LandXMLSurfaceSummary
+from .landxml_io import LandXMLInputFile, detect_compression, document_size
+from .landxml_sidecar import LandXMLSidecar
+from .mesh_arrays import MeshArrays, MeshArraysBuilder
 from .mesh_elements import MeshFace, MeshVertex
+from .mesh_operations import ClipArea, drop_unreferenced_vertices
+from .mesh_views import MeshFacesView, MeshVerticesView
+from .processes import process_pool
+from .progress import ProgressCallback, ProgressPoller
+
+SURFACE_POINT_PATH = ("Surfaces", "Surface", "Definition", "Pnts", "P")
+SURFACE_FACE_PATH = ("Surfaces", "Surface", "Definition", "Faces", "F")
+
+# size of the blocks of file fed to the parser, progress is reported after each block
+PARSE_BLOCK_SIZE = 1024 * 1024
+
+# number of faces collected before they are clipped, when the file is streamed with clip area
+CLIP_CHUNK_SIZE = 1024 * 1024
+
+# largest files parsed by `lxml` backend with `auto` parser, it holds the whole surface in memory
+LXML_MAX_SIZE = 128 * 1024 * 1024
+
+# largest files parsed into element tree with `auto` parser if `lxml` is not available
+ETREE_MAX_SIZE = 4 * 1024 * 1024
+
+
+def iterparse_landxml(
+    path: str, progress: typing.Optional[ProgressCallback] = None
+) -> typing.Iterator[typing.Tuple[str, typing.Tuple[str, ...], ET.Element]]:
+    """Walks the document with incremental parser, yields event, path of the element below root and the element.
+
+    Path consists of tag names without namespace of the root element, root element itself has empty path.
+    Content of the element is released from memory once its `end` event is processed, so only the currently open
+    elements are kept. Progress is the position in the file, polled every `POLL_INTERVAL` elements.
+    """
+    tag_prefix = ""
+
+    # stack of currently open elements, the processed ones are removed from their parents
+    elements: typing.List[ET.Element] = []
+    tags: typing.List[str] = []
+
+    with LandXMLInputFile(path) as file:
+        poller = ProgressPoller(progress, file.size, file.tell)
+
+        for event, element in ET.iterparse(file, events=("start", "end")):
+            if event == "start":
+                if not elements and element.tag.startswith("{"):
+                    tag_prefix = element.tag[: element.tag.index("}") + 1]
+
+                if elements:
+                    tags.append(element.tag[len(tag_prefix) :] if element.tag.startswith(tag_prefix) else element.tag)
+                elements.append(element)
+
+                yield event, tuple(tags), element
+                continue
+
+            yield event, tuple(tags), element
+
+            elements.pop()
+            if tags:
+                tags.pop()
+
+            # release the processed element, its content is either decoded or not needed
+            if elements:
+                del elements[-1][:]
+
+            poller.step()
+
+    poller.finish()
+
+
+def parse_blocks(
+    path: str, feed: typing.Callable[[bytes], typing.Any], progress: typing.Optional[ProgressCallback] = None
+) -> None:
+    """Feeds the file to the parser in blocks of `PARSE_BLOCK_SIZE` bytes, polls progress after each block.
+
+    Compressed files are decompressed block by block (see `LandXMLInputFile`).
+    """
+    with LandXMLInputFile(path) as file:
+        poller = ProgressPoller(progress, file.size, file.tell, interval=1)
+
+        while block := file.read(PARSE_BLOCK_SIZE):
+            feed(block)
+            poller.step()
+
+
+def landxml_namespace(root_element: ET.Element) -> typing.Tuple[str, typing.Dict[str, str]]:
+    """Checks that the root element is LandXML, returns namespace prefix and namespace to be used in `find*()`."""
+    if not "LandXML".lower() in root_element.tag.lower():
+        raise ValueError("Not a valid LandXML file.")
+
+    namespace_name, namespace = get_namespace(root_element)
+
+    namespace_prefix = ""
+    if namespace_name:
+        namespace_prefix = f"{namespace_name}:"
+
+    return namespace_prefix, namespace
+
+
+def read_crs(path: str) -> QgsCoordinateReferenceSystem:
+    """Reads CRS of the LandXML file from `CoordinateSystem` element, parsing stops at the start of surfaces."""
+    for event, element_path, element in iterparse_landxml(path):
+        if event == "start" and element_path == ("Surfaces",):
+            break
+        if event == "end" and element_path == ("CoordinateSystem",):
+            return crs_from_attributes(dict(element.attrib))
+
+    return QgsCoordinateReferenceSystem()
+
+
+def crs_from_attributes(attributes: typing.Optional[typing.Dict[str, str]]) -> QgsCoordinateReferenceSystem:
+    """Creates CRS from attributes of LandXML `CoordinateSystem` element."""
+    crs = QgsCoordinateReferenceSystem()
+
+    if attributes is not None:
+        if "epsgCode" in attributes.keys():
+            crs = QgsCoordinateReferenceSystem(f"EPSG:{attributes['epsgCode']}")
+        if "ogcWktCode" in attributes.keys():
+            crs.fromWkt(attributes["ogcWktCode"])
+
+    return crs
+
+
+class SurfacesHandler:
+    """Builds surfaces from elements reported by streaming parser backend, so that all backends produce the same result.
+
+    Backend reports start of every element with its path below root (see `iterparse_landxml`), tag and attributes,
+    and end of every element with its path, attributes and text. Only texts of elements on `TEXT_PATHS` are used.
+    Only elements on the path `LandXML/Surfaces/Surface/Definition/{Pnts/P, Faces/F}` and `LandXML/CoordinateSystem`
+    are considered, same as in the element tree mode. Backends that extract texts of the whole surface at once
+    report them by `add_points` and `add_faces` between the start and the end of the surface instead.
+
+    With `clip_area` faces are clipped in chunks as they are read, so only the points of the current surface are held
+    in addition to the clipped mesh.
+    """
+
+    TEXT_PATHS = (SURFACE_POINT_PATH, SURFACE_FACE_PATH)
+
+    def __init__(self, clip_area: typing.Optional[ClipArea] = None) -> None:
+        self.clip_area = clip_area
+
+        # root element of the document without any children
+        self.root: typing.Optional[ET.Element] = None
+        self.namespace_prefix = ""
+        self.namespace: typing.Dict[str, str] = {"": ""}
+        self.crs_attributes: typing.Optional[typing.Dict[str, str]] = None
+
+        self.surfaces: typing.List[LandXMLSurface] = []
+
+        self._surface_name = ""
+        self._builder = MeshArraysBuilder()
+        self._decoder = SurfaceDecoder(self._builder)
+        self._face_number = 0
+        # faces of the current surface already clipped
+        self._clipped_faces = 0
+
+    def start(self, path: typing.Tuple[str, ...], tag: str, attributes: typing.Mapping[str, str]) -> None:
+        if not path:
+            self.root = ET.Element(tag, dict(attributes))
+            self.namespace_prefix, self.namespace = landxml_namespace(self.root)
+        elif path == ("Surfaces", "Surface"):
+            self._surface_name = attributes.get("name", "")
+            self._builder = MeshArraysBuilder()
+            self._decoder = SurfaceDecoder(self._builder, self._surface_name)
+            self._face_number = 0
+            self._clipped_faces = 0
+        elif path == ("CoordinateSystem",):
+            self.crs_attributes = dict(attributes)
+
+    def end(
+        self, path: typing.Tuple[str, ...], attributes: typing.Mapping[str, str], text: typing.Optional[str]
+    ) -> None:
+        if path == SURFACE_POINT_PATH:
+            self._decoder.add_point(attributes["id"], text)
+        elif path == SURFACE_FACE_PATH:
+            self._face_number += 1
+            if not LandXMLSurface.is_hidden_face_attributes(attributes):
+                self._decoder.add_face(self._face_number, text)
+                self._clip_chunk()
+        elif path == ("Surfaces", "Surface"):
+            self._decoder.flush()
+
+            if self.clip_area is not None:
+                self._clip_faces(self._clipped_faces)
+                mesh_arrays = drop_unreferenced_vertices(self._builder.build())
+            else:
+                mesh_arrays = self._builder.build()
+
+            self.surfaces.append(LandXMLSurface.from_mesh_arrays(self._surface_name, len(self.surfaces), mesh_arrays))
+
+    def add_points(self, point_ids: typing.Sequence[str], texts: typing.Sequence[typing.Optional[str]]) -> None:
+        """Adds points of the current surface at once, instead of reporting their elements one by one."""
+        self._decoder.add_points(point_ids, texts)
+
+    def add_faces(self, texts: typing.Sequence[typing.Optional[str]], hidden: typing.Sequence[bool] = ()) -> None:
+        """Adds faces of the current surface at once, `hidden` marks faces that are not visible if any."""
+        face_numbers = range(self._face_number + 1, self._face_number + len(texts) + 1)
+        self._face_number += len(texts)
+
+        if any(hidden):
+            face_numbers = [x for x, x_hidden in zip(face_numbers, hidden) if not x_hidden]
+            texts = [x for x, x_hidden in zip(texts, hidden) if not x_hidden]
+
+        self._decoder.add_faces(face_numbers, texts)
+        self._clip_chunk()
+
+    def add_vertex_arrays(self, vertex_ids: np.ndarray, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> None:
+        """Adds already decoded points of the current surface."""
+        self._decoder.flush_points()
+        self._builder.add_vertices(vertex_ids, x, y, z)
+
+    def add_face_arrays(self, face_numbers: np.ndarray, faces: np.ndarray, face_count: int) -> None:
+        """Adds already decoded faces of the current surface, `face_numbers` are counted from 1 among `face_count`
+        faces read, including the hidden ones."""
+        self._decoder.flush_faces()
+        self._builder.add_faces(face_numbers + self._face_number, faces)
+        self._face_number += int(face_count)
+        self._clip_chunk()
+
+    def _clip_chunk(self) -> None:
+        if self.clip_area is not None and self._builder.face_count - self._clipped_faces >= CLIP_CHUNK_SIZE:
+            self._clipped_faces = self._clip_faces(self._clipped_faces)
+
+    def _clip_faces(self, first_face: int) -> int:
+        """Drops faces added from `first_face` on that do not intersect the clip area, returns number of kept faces."""
+        mesh_arrays = self._builder.build()
+
+        keep = np.ones(mesh_arrays.face_count, dtype=bool)
+        keep[first_face:] = self.clip_area.face_mask(
+            MeshArrays(
+                mesh_arrays.vertex_ids,
+                mesh_arrays.x,
+                mesh_arrays.y,
+                mesh_arrays.z,
+                mesh_arrays.face_ids[first_face:],
+                mesh_arrays.faces[first_face:],
+            )
+        )
+
+        self._builder.retain_faces(keep)
+
+        return self._builder.face_count
+
+
+def iterparse_backend(path: str, handler: SurfacesHandler, progress: typing.Optional[ProgressCallback] = None) -> None:
+    """Reports elements of the document walked by `iterparse_landxml`."""
+    for event, element_path, element in iterparse_landxml(path, progress):
+        if event == "start":
+            handler.start(element_path, element.tag, element.attrib)
+        else:
+            handler.end(element_path, element.attrib, element.text)
+
+
+def lxml_backend(path: str, handler: SurfacesHandler, progress: typing.Optional[ProgressCallback] = None) -> None:
+    """Parses the document with `lxml`, that is an optional dependency, in blocks of `PARSE_BLOCK_SIZE` bytes.
+
+    Elements are created only inside surfaces, texts and attributes of all `<P>` and `<F>` elements of the surface
+    are extracted at once by XPath and the surface is released. Surfaces with elements without text or with
+    hidden faces fall back to reading the elements one by one. `huge_tree` lifts the limits of `libxml2` on size
+    of texts and depth of the document.
+    """
+    from lxml import etree
+
+    # comments and processing instructions are dropped so that texts are not split by them, as in `ElementTree`
+    parser = etree.XMLPullParser(
+        events=("start", "end"),
+        tag=("{*}Surface", "{*}CoordinateSystem"),
+        huge_tree=True,
+        remove_comments=True,
+        remove_pis=True,
+    )
+
+    root = None
+    tag_prefix = ""
+    queries: typing.Dict[str, etree.XPath] = {}
+
+    def start_root(element: etree._Element) -> None:
+        nonlocal root, tag_prefix
+
+        root = element
+        handler.start((), root.tag, root.attrib)
+
+        namespace = etree.QName(root).namespace
+        tag_prefix = f"{{{namespace}}}" if namespace else ""
+
+        xpath_prefix = "l:" if namespace else ""
+        definition = f"{xpath_prefix}Definition/{xpath_prefix}"
+        for name, query in (
+            ("point_ids", f"{definition}Pnts/{xpath_prefix}P/@id"),
+            ("point_texts", f"{definition}Pnts/{xpath_prefix}P/text()"),
+            ("points", f"{definition}Pnts/{xpath_prefix}P"),
+            ("point_count", f"count({definition}Pnts/{xpath_prefix}P)"),
+            ("face_texts", f"{definition}Faces/{xpath_prefix}F/text()"),
+            ("faces", f"{definition}Faces/{xpath_prefix}F"),
+            ("face_count", f"count({definition}Faces/{xpath_prefix}F)"),
+            ("has_face_attributes", f"boolean({definition}Faces/{xpath_prefix}F[@i])"),
+        ):
+            queries[name] = etree.XPath(query, namespaces={"l": namespace} if namespace else None, smart_strings=False)
+
+    def read_surface(surface: etree._Element) -> None:
+        point_count = int(queries["point_count"](surface))
+        point_ids = queries["point_ids"](surface)
+        point_texts = queries["point_texts"](surface)
+
+        # some point misses id or text
+        if len(point_ids) != point_count or len(point_texts) != point_count:
+            points = queries["points"](surface)
+            point_ids = [x.attrib["id"] for x in points]
+            point_texts = [x.text for x in points]
+
+        handler.add_points(point_ids, point_texts)
+
+        face_count = int(queries["face_count"](surface))
+        face_texts = queries["face_texts"](surface)
+
+        if len(face_texts) != face_count or queries["has_face_attributes"](surface):
+            faces = queries["faces"](surface)
+            handler.add_faces(
+                [x.text for x in faces], [LandXMLSurface.is_hidden_face_attributes(x.attrib) for x in faces]
+            )
+        else:
+            handler.add_faces(face_texts)
+
+    def read_events() -> None:
+        for event, element in parser.read_events():
+            if root is None:
+                start_root(element.getroottree().getroot())
+
+            parent = element.getparent()
+
+            if element.tag == f"{tag_prefix}CoordinateSystem":
+                if event == "end" and parent is root:
+                    handler.start(("CoordinateSystem",), element.tag, element.attrib)
+                continue
+
+            if parent is None or parent.tag != f"{tag_prefix}Surfaces" or parent.getparent() is not root:
+                continue
+
+            if event == "start":
+                handler.start(("Surfaces", "Surface"), element.tag, element.attrib)
+                continue
+
+            read_surface(element)
+            handler.end(("Surfaces", "Surface"), element.attrib, None)
+
+            # release the surface, only empty elements of processed surfaces are kept
+            element.clear()
+
+    def feed(block: bytes) -> None:
+        parser.feed(block)
+        read_events()
+
+    try:
+        parse_blocks(path, feed, progress)
+        document_root = parser.close()
+        read_events()
+    except etree.XMLSyntaxError as e:
+        raise ET.ParseError(str(e)) from e
+
+    if root is None:
+        start_root(document_root)
+
+
+def expat_parser(handler: SurfacesHandler) -> "expat.XMLParserType":
+    """Creates `expat` parser reporting elements of the document fed to it to the handler."""
+    tag_prefix = ""
+    # paths and attributes of currently open elements
+    paths: typing.List[typing.Tuple[str, ...]] = []
+    attributes_stack: typing.List[typing.Dict[str, str]] = []
+    # text of currently open element on `TEXT_PATHS`, `None` outside of them
+    text: typing.Optional[typing.List[str]] = None
+
+    def start_element(name: str, attributes: typing.Dict[str, str]) -> None:
+        nonlocal tag_prefix, text
+
+        if not paths:
+            # `expat` reports namespaced tags as `namespace}tag`
+            tag_prefix = name[: name.index("}") + 1] if "}" in name else ""
+            element_path = ()
+            name = f"{{{name}" if tag_prefix else name
+        else:
+            element_path = paths[-1] + (name[len(tag_prefix) :] if name.startswith(tag_prefix) else name,)
+
+        paths.append(element_path)
+        attributes_stack.append(attributes)
+
+        if element_path in SurfacesHandler.TEXT_PATHS:
+            text = []
+
+        handler.start(element_path, name, attributes)
+
+    def end_element(name: str) -> None:
+        nonlocal text
+
+        handler.end(paths.pop(), attributes_stack.pop(), "".join(text) if text is not None else None)
+        text = None
+
+    def character_data(data: str) -> None:
+        if text is not None:
+            text.append(data)
+
+    parser = expat.ParserCreate(namespace_separator="}")
+    parser.buffer_text = True
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+
+    return parser
+
+
+def expat_backend(path: str, handler: SurfacesHandler, progress: typing.Optional[ProgressCallback] = None) -> None:
+    """Reports elements of the document walked by `expat` parser directly, no elements are created."""
+    parser = expat_parser(handler)
+
+    try:
+        parse_blocks(path, parser.Parse, progress)
+        parser.Parse(b"", True)
+    except expat.ExpatError as e:
+        raise ET.ParseError(str(e)) from e
+
+
+class _SkeletonHandler:
+    """Handles elements of the document with contents of `<Pnts>` and `<Faces>` blocks cut out (see `mmap_backend`).
+
+    Elements of the blocks are recognized by position of their end tags in the skeleton. Without `handler` only paths
+    and surface names of the blocks are recorded. With `handler` elements are forwarded to it and decoded contents
+    of the blocks are added to it at the end of their elements.
+    """
+
+    def __init__(
+        self,
+        blocks: typing.Sequence[Block],
+        handler: typing.Optional[SurfacesHandler] = None,
+        decoded: typing.Optional[typing.Sequence[typing.List[typing.Tuple[np.ndarray, ...]]]] = None,
+    ) -> None:
+        self.blocks = blocks
+        self.handler = handler
+        self.decoded = decoded
+
+        self.parser = expat_parser(self)
+
+        self.paths: typing.List[typing.Optional[typing.Tuple[str, ...]]] = [None] * len(blocks)
+        self.surface_names = [""] * len(blocks)
+        self._surface_name = ""
+
+        # positions of the end tags of blocks' elements in the skeleton
+        self._block_ends: typing.Dict[int, int] = {}
+        cut = 0
+        for i, block in enumerate(blocks):
+            cut += block.end - block.start
+            self._block_ends[block.end - cut] = i
+
+    def start(self, path: typing.Tuple[str, ...], tag: str, attributes: typing.Mapping[str, str]) -> None:
+        if path == ("Surfaces", "Surface"):
+            self._surface_name = attributes.get("name", "")
+
+        if self.handler is not None:
+            self.handler.start(path, tag, attributes)
+
+    def end(
+        self, path: typing.Tuple[str, ...], attributes: typing.Mapping[str, str], text: typing.Optional[str]
+    ) -> None:
+        i = self._block_ends.get(self.parser.CurrentByteIndex)
+
+        if i is not None and path[-1:] == (self.blocks[i].kind,):
+            self.paths[i] = path
+            self.surface_names[i] = self._surface_name
+
+            if self.handler is not None and self.decoded[i]:
+                add = (
+                    self.handler.add_vertex_arrays if path == SURFACE_POINT_PATH[:-1] else self.handler.add_face_arrays
+                )
+                # chunks are released once copied to the handler, so that decoded arrays are not held twice
+                chunks = self.decoded[i]
+                chunks.reverse()
+                while chunks:
+                    add(*chunks.pop())
+
+        if self.handler is not None:
+            self.handler.end(path, attributes, text)
+
+    def parse(self, data: mmap.mmap) -> None:
+        """Feeds the document without contents of the blocks to the parser, in blocks of `PARSE_BLOCK_SIZE` bytes."""
+        start = 0
+        try:
+            for end, next_start in [(x.start, x.end) for x in self.blocks] + [(len(data), len(data))]:
+                for position in range(start, end, PARSE_BLOCK_SIZE):
+                    self.parser.Parse(data[position : min(position + PARSE_BLOCK_SIZE, end)], False)
+                start = next_start
+
+            self.parser.Parse(b"", True)
+        finally:
+            # handlers of the parser refer back to this object, the cycle would keep the handler and its arrays
+            # alive until garbage collection
+            self.parser = None
+
+
+def _decode_chunks_in_order(
+    path: str,
+    tasks: typing.Sequence[typing.Tuple[int, typing.Callable, int, int, str]],
+    results: typing.List[typing.Optional[typing.Tuple[np.ndarray, ...]]],
+    poller: typing.Optional[ProgressPoller] = None,
+) -> None:
+    """Decodes chunks of `mmap_backend` in this process in document order, faces of invalid chunks are reported
+    by their number in the block, as by other backends."""
+    face_offsets: typing.Dict[int, int] = {}
+
+    for j, (i, decode, start, end, surface_name) in enumerate(tasks):
+        if decode is decode_faces_chunk:
+            results[j] = decode(path, start, end, surface_name, face_offsets.get(i, 0))
+            face_offsets[i] = face_offsets.get(i, 0) + int(results[j][2])
+        else:
+            results[j] = decode(path, start, end, surface_name)
+
+        if poller is not None:
+            poller.step(end - start)
+
+
+def mmap_backend(
+    path: str,
+    handler: SurfacesHandler,
+    progress: typing.Optional[ProgressCallback] = None,
+    workers: typing.Optional[int] = None,
+) -> None:
+    """Decodes contents of `<Pnts>` and `<Faces>` elements of the memory-mapped file in chunks by `workers`
+    processes, number of CPUs by default.
+
+    Contents of the elements are located by byte search (see `find_blocks`) and split at element boundaries into
+    chunks of about `CHUNK_SIZE` bytes, that worker processes parse and decode from the file themselves. Rest of
+    the document is small and is parsed by `expat` twice, first to check that the blocks are the elements of
+    surfaces, then to report elements to the handler with decoded chunks merged in their order. Compressed or empty
+    files, documents where the blocks do not match the elements and chunks that cannot be parsed on their own
+    (e.g. with entities declared in the document) are parsed by `expat_backend` instead.
+
+    Documents with contents smaller than single chunk, or with single worker, are decoded in this process.
+
+    Workers do not write into shared memory, decoded arrays of each chunk are pickled back to this process and held
+    until they are copied into the surfaces in document order, one chunk at a time. Peak memory is about twice
+    the size of the resulting arrays, as with the other streaming backends.
+    """
+    if detect_compression(path) is not None or os.path.getsize(path) == 0:
+        expat_backend(path, handler, progress)
+        return
+
+    workers = workers or os.cpu_count() or 1
+
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        blocks = find_blocks(data)
+
+        locator = _SkeletonHandler(blocks)
+        try:
+            locator.parse(data)
+            matched = None not in locator.paths
+        except expat.ExpatError:
+            matched = False
+
+        if not matched:
+            expat_backend(path, handler, progress)
+            return
+
+        tasks = []
+        for i, block in enumerate(blocks):
+            if locator.paths[i] == SURFACE_POINT_PATH[:-1]:
+                decode = decode_points_chunk
+            elif locator.paths[i] == SURFACE_FACE_PATH[:-1]:
+                decode = decode_faces_chunk
+            else:
+                continue
+
+            for start, end in block.chunks(data):
+                tasks.append((i, decode, start, end, locator.surface_names[i]))
+
+        poller = ProgressPoller(progress, len(data), interval=1)
+        decoded: typing.List[typing.List[typing.Tuple[np.ndarray, ...]]] = [[] for _ in blocks]
+        results: typing.List[typing.Optional[typing.Tuple[np.ndarray, ...]]] = [None] * len(tasks)
+
+        try:
+            if workers > 1 and len(tasks) > 1 and sum(x[3] - x[2] for x in tasks) > landxml_chunks.CHUNK_SIZE:
+                try:
+                    with process_pool(min(workers, len(tasks))) as executor:
+                        futures = {executor.submit(x[1], path, *x[2:]): j for j, x in enumerate(tasks)}
+                        try:
+                            for future in concurrent.futures.as_completed(futures):
+                                j = futures[future]
+                                results[j] = future.result()
+                                poller.step(tasks[j][3] - tasks[j][2])
+
+                            # futures keep their results, which are released chunk by chunk from `results` later
+                            futures.clear()
+                        except BaseException:
+                            for future in futures:
+                                future.cancel()
+                            raise
+                except ValueError:
+                    # workers number faces within their chunks and fail in any order, the chunks are decoded again
+                    # in order to report the first invalid element of the document
+                    _decode_chunks_in_order(path, tasks, results)
+                    raise
+            else:
+                _decode_chunks_in_order(path, tasks, results, poller)
+        except expat.ExpatError:
+            expat_backend(path, handler, progress)
+            return
+
+        for (i, *_), arrays in zip(tasks, results):
+            decoded[i].append(arrays)
+        del results
+
+        _SkeletonHandler(blocks, handler, decoded).parse(data)
+
+    poller.finish()
+
+
+# streaming parser backends, `etree` parser of `LandXMLReader` builds the element tree instead
+PARSER_BACKENDS: typing.Dict[str, typing.Callable[[str, SurfacesHandler, typing.Optional[ProgressCallback]], None]] = {
+    "iterparse": iterparse_backend,
+    "expat": expat_backend,
+    "lxml": lxml_backend,
+    "mmap": mmap_backend,
+}
+
+PARSERS = ("etree",) + tuple(PARSER_BACKENDS.keys())
+
+
+def lxml_available() -> bool:
+    return importlib.util.find_spec("lxml") is not None
+
+
+def select_parser(path: str) -> str:
+    """Parser used for the file by `auto` selection, by size of the document after decompression.
+
+    `lxml` is the fastest one, but holds the whole surface in memory, so it is used for files up to `LXML_MAX_SIZE`.
+    Without `lxml`, small files up to `ETREE_MAX_SIZE` are parsed into element tree. Other files are decoded by `mmap`
+    on all CPUs if there are more of them and the file is not compressed, otherwise streamed by `expat`, which is
+    faster than `iterparse` and uses the same memory.
+    """
+    size = document_size(path)
+
+    if lxml_available():
+        if size <= LXML_MAX_SIZE:
+            return "lxml"
+    elif size <= ETREE_MAX_SIZE:
+        return "etree"
+
+    if (os.cpu_count() or 1) > 1 and detect_compression(path) is None:
+        return "mmap"
+
+    return "expat"
 
 
 # http://www.landxml.org/schema/LandXML-1.2/LandXML-1.2.xsd
 class LandXMLReader:
-    """Class for reading the LandXML file, store individual surfaces."""
+    """Class for reading the LandXML file, store individual surfaces.
 
-    # different surfaces may use same vertex ids, we need to differentiate so surfaces are offset from each other by this value
-    SURFACE_VERTEX_ID_OFFSET = 10_000
+    By default the whole XML document is parsed into element tree. With `streaming` the file is walked
+    incrementally, every `<P>` and `<F>` element is decoded as soon as it is read and then discarded,
+    so the memory used scales with the decoded mesh rather than with the XML document.
 
-    def __init__(self, path: str):
-        self.path = path
+    `parser` selects how the document is parsed, one of `PARSERS`: `etree` builds the element tree, other parsers
+    stream the file with `iterparse`, `expat`, `lxml` or `mmap` backend. `auto` selects parser by the size of the file
+    (see `select_parser`). All parsers produce the same surfaces. If `parser` is not given, `streaming` decides
+    between `iterparse` and `etree`. `workers` is the number of processes decoding the file with `mmap` parser.
+
+    The file may be gzip compressed or zip archive with the document, it is decompressed while parsed
+    (see `LandXMLInputFile`).
+
+    `progress` is called with the parsed part of the file, `ConversionCanceledError` is raised if it returns `False`.
+
+    With `clip_area` only faces intersecting it and their vertices are kept. When streaming, faces are clipped
+    in chunks as they are read, so only the points of the current surface are held in addition to the clipped mesh.
+
+    With `sidecar` the decoded surfaces are loaded from binary sidecar of the file (see `LandXMLSidecar`) if it is
+    up to date, otherwise the file is parsed and the sidecar is written. Sidecar always holds the whole surfaces,
+    with `clip_area` they are clipped after loading and sidecar is not written from clipped surfaces.
+    """
 
-        self.xml_tree = ET.parse(self.path)
+    def __init__(
+        self,
+        path: str,
+        streaming: bool = False,
+        progress: typing.Optional[ProgressCallback] = None,
+        clip_area: typing.Optional[ClipArea] = None,
+        sidecar: bool = False,
+        parser: typing.Optional[str] = None,
+        workers: typing.Optional[int] = None,
+    ):
+        if parser is None:
+            parser = "iterparse" if streaming else "etree"
+        elif parser == "auto":
+            parser = select_parser(path)
+        elif parser not in PARSERS:
+            raise ValueError(f"Unknown parser `{parser}`, supported parsers are: {', '.join(PARSERS)}.")
 
-        if not "LandXML".lower() in self.xml_root.tag.lower():
-            raise ValueError("Not a valid LandXML file.")
+        self.path = path
+        self.parser = parser
+        self.streaming = parser != "etree"
+        self.progress = progress
+        self.clip_area = clip_area
+        self.sidecar = sidecar
+        self.workers = workers
+
+        self.xml_tree: typing.Optional[ET.ElementTree] = None
+        self._xml_root: typing.Optional[ET.Element] = None
+        self._crs_attributes: typing.Optional[typing.Dict[str, str]] = None
 
-        namespace_name, self.namespace = get_namespace(self.xml_root)
+        self.namespace: typing.Dict[str, str] = {"": ""}
         self.namespace_prefix = ""
-        if namespace_name:
-            self.namespace_prefix = f"{namespace_name}:"
 
         self.surfaces: typing.List[LandXMLSurface] = []
-        self._get_surfaces()
 
-    def crs(self) -> QgsCoordinateReferenceSystem:
-        crs_element = self.xml_root.find(f"{self.namespace_prefix}CoordinateSystem", namespaces=self.namespace)
+        # renumbered and joined arrays of all surfaces, created on first access
+        self._merged_surfaces: typing.Optional[typing.List[MeshArrays]] = None
+        self._all_arrays: typing.Optional[MeshArrays] = None
+
+        # surfaces are loaded from sidecar if possible
+        self.from_sidecar = False
+
+        if self.sidecar:
+            self.from_sidecar = self._load_sidecar()
 
-        crs = QgsCoordinateReferenceSystem()
+        if not self.from_sidecar:
+            self._parse()
 
+            if self.sidecar and self.clip_area is None:
+                LandXMLSidecar([(x.name, x.arrays()) for x in self.surfaces], self._crs_attributes).save(self.path)
+
+    def _parse(self) -> None:
+        if self.parser in PARSER_BACKENDS:
+            handler = SurfacesHandler(self.clip_area)
+            options = {"workers": self.workers} if self.parser == "mmap" else {}
+            PARSER_BACKENDS[self.parser](self.path, handler, self.progress, **options)
+
+            self._xml_root = handler.root
+            self.namespace_prefix, self.namespace = handler.namespace_prefix, handler.namespace
+            self._crs_attributes = handler.crs_attributes
+            self.surfaces = handler.surfaces
+            return
+
+        parser = ET.XMLParser()
+        parse_blocks(self.path, parser.feed, self.progress)
+
+        self.xml_tree = ET.ElementTree(parser.close())
+        self._xml_root = self.xml_tree.getroot()
+
+        self._set_namespace(self.xml_root)
+
+        crs_element = self.xml_root.find(f"{self.namespace_prefix}CoordinateSystem", namespaces=self.namespace)
         if isinstance(crs_element, ET.Element):
-            attrs = crs_element.attrib
-            if "epsgCode" in attrs.keys():
-                crs = QgsCoordinateReferenceSystem(f"EPSG:{attrs['epsgCode']}")
-            if "ogcWktCode" in attrs.keys():
-                crs.fromWkt(attrs["ogcWktCode"])
+            self._crs_attributes = dict(crs_element.attrib)
 
-        return crs
+        self._get_surfaces()
+
+    def _set_namespace(self, root_element: ET.Element) -> None:
+        self.namespace_prefix, self.namespace = landxml_namespace(root_element)
+
+    def crs(self) -> QgsCoordinateReferenceSystem:
+        return crs_from_attributes(self._crs_attributes)
+
+    @property
+    def crs_attributes(self) -> typing.Optional[typing.Dict[str, str]]:
+        """Attributes of `CoordinateSystem` element, `None` if the file has none."""
+        return self._crs_attributes
 
     @property
     def xml_root(self) -> ET.Element:
-        return self.xml_tree.getroot()
+        """Root element of the document. In streaming mode all its children are already discarded,
+        `None` if the surfaces are loaded from sidecar."""
+        return self._xml_root
 
     @property
     def surface_count(self) -> int:
         return len(self.surfaces)
 
-    def get_surface_points(self, surface_number: int) -> typing.List[MeshVertex]:
+    @property
+    def nbytes(self) -> int:
+        """Memory used by decoded vertices and faces of all surfaces, including their merged arrays if created."""
+        nbytes = sum(surface.arrays().nbytes for surface in self.surfaces)
+
+        # merged surfaces share coordinates with the surfaces
+        if self._merged_surfaces is not None:
+            nbytes += sum(x.vertex_ids.nbytes + x.face_ids.nbytes + x.faces.nbytes for x in self._merged_surfaces)
+
+        if self._all_arrays is not None:
+            nbytes += self._all_arrays.nbytes
+
+        return nbytes
+
+    def get_surface_points(self, surface_number: int) -> typing.Sequence[MeshVertex]:
         return self.surfaces[surface_number].points()
 
-    def get_surface_faces(self, surface_number: int) -> typing.List[MeshFace]:
+    def get_surface_faces(self, surface_number: int) -> typing.Sequence[MeshFace]:
         return self.surfaces[surface_number].faces()
 
+    def get_surface_arrays(self, surface_number: int) -> MeshArrays:
+        return self.surfaces[surface_number].arrays()
+
+    def _load_sidecar(self) -> bool:
+        """Creates surfaces from sidecar of the file, returns `False` if there is no valid sidecar."""
+        sidecar = LandXMLSidecar.load(self.path)
+
+        if sidecar is None:
+            return False
+
+        self._crs_attributes = sidecar.crs_attributes
+
+        for i, (name, mesh_arrays) in enumerate(sidecar.surfaces):
+            if self.clip_area is not None:
+                mesh_arrays = self.clip_area.clip(mesh_arrays)
+
+            self.surfaces.append(LandXMLSurface.from_mesh_arrays(name, i, mesh_arrays))
+
+        return True
+
     def _get_surfaces(self) -> None:
         surfaces = self.xml_root.find(f"{self.namespace_prefix}Surfaces", namespaces=self.namespace)
         if surfaces:
             for i, surface in enumerate(surfaces):
                 self.surfaces.append(
-                    LandXMLSurface(surface, i, i * self.SURFACE_VERTEX_ID_OFFSET, self.namespace_prefix, self.namespace)
+                    LandXMLSurface(
+                        surface,
+                        i,
+                        namespace_prefix=self.namespace_prefix,
+                        namespace=self.namespace,
+                        clip_area=self.clip_area,
+                    )
                 )
 
+    @classmethod
+    def scan(cls, path: str, progress: typing.Optional[ProgressCallback] = None) -> "LandXMLScan":
+        """Quickly scan the file for namespace, CRS and surfaces summary, without decoding the surfaces."""
+        return LandXMLScan(path, progress)
+
+    def merged_surfaces(self) -> typing.List[MeshArrays]:
+        """Returns arrays of all surfaces renumbered, so that ids of vertices and faces are 1..N across surfaces.
+
+        Different surfaces may use the same vertex ids, renumbering keeps them apart in the merged mesh.
+        The arrays are created on first call and kept with the reader, later calls return the same arrays.
+        """
+        if self._merged_surfaces is None:
+            self._merged_surfaces = MeshArrays.renumber_consecutively([surface.arrays() for surface in self.surfaces])
+
+        return self._merged_surfaces
+
+    @property
+    def all_points(self) -> MeshVerticesView:
+        """Returns read-only view of points from all surfaces in the file, numbered 1..N across surfaces."""
+        return MeshVerticesView(self.merged_surfaces())
+
     @property
-    def all_points(self) -> typing.List[MeshVertex]:
-        """Returns points from all surfaces in the file."""
-        points = []
+    def all_faces(self) -> MeshFacesView:
+        """Returns read-only view of faces from all surfaces in the file, numbered 1..N across surfaces."""
+        return MeshFacesView(self.merged_surfaces())
+
+    @property
+    def all_arrays(self) -> MeshArrays:
+        """Returns vertices and faces from all surfaces in the file joined into columnar arrays with dense ids.
+
+        The arrays are created on first access and kept with the reader.
+        """
+        if self._all_arrays is None:
+            self._all_arrays = MeshArrays.concatenate(self.merged_surfaces())
+
+        return self._all_arrays
 
-        for surface in self.surfaces:
-            points.extend(surface.points(True))
 
-        return points
+class LandXMLScan:
+    """Summary of the LandXML file: namespace, CRS and names, sizes and extents of surfaces.
+
+    The file is walked with `expat` parser without creating any elements, only coordinates of points are decoded
+    (in blocks) to get extents, so scanning is much faster than reading and uses negligible memory.
+    It provides the same `surface_count`, `surfaces[i].empty()` and `crs()` as `LandXMLReader`.
+    """
+
+    def __init__(self, path: str, progress: typing.Optional[ProgressCallback] = None) -> None:
+        self.path = path
+        self.progress = progress
+
+        self._crs_attributes: typing.Optional[typing.Dict[str, str]] = None
+
+        self.namespace: typing.Dict[str, str] = {"": ""}
+        self.namespace_prefix = ""
+
+        self.surfaces: typing.List[LandXMLSurfaceSummary] = []
+
+        self._scan()
+
+    def _scan(self) -> None:
+        """Walk the document with `expat` parser directly, no elements are created."""
+        tag_prefix = ""
+        # paths of currently open elements below root
+        paths: typing.List[typing.Tuple[str, ...]] = []
+
+        surface: typing.Optional[LandXMLSurfaceSummary] = None
+        points_text: typing.List[str] = []
+        # text of currently open point element, `None` outside of point elements
+        point_text: typing.Optional[typing.List[str]] = None
+
+        def start_element(name: str, attributes: typing.Dict[str, str]) -> None:
+            nonlocal tag_prefix, surface, points_text, point_text
+
+            if not paths:
+                # `expat` reports namespaced tags as `namespace}tag`
+                tag_prefix = name[: name.index("}") + 1] if "}" in name else ""
+                self.namespace_prefix, self.namespace = landxml_namespace(
+                    ET.Element(f"{{{name}" if tag_prefix else name)
+                )
+                paths.append(())
+                return
+
+            path = paths[-1] + (name[len(tag_prefix) :] if name.startswith(tag_prefix) else name,)
+            paths.append(path)
+
+            if path == SURFACE_POINT_PATH:
+                point_text = []
+            elif path == SURFACE_FACE_PATH:
+                if not LandXMLSurface.is_hidden_face_attributes(attributes):
+                    surface.face_count += 1
+            elif path == ("Surfaces", "Surface"):
+                surface = LandXMLSurfaceSummary(attributes.get("name", ""), len(self.surfaces))
+                points_text = []
+            elif path == ("CoordinateSystem",):
+                self._crs_attributes = dict(attributes)
+
+        def end_element(name: str) -> None:
+            nonlocal points_text, point_text
+
+            path = paths.pop()
+
+            if path == SURFACE_POINT_PATH:
+                surface.point_count += 1
+                points_text.append("".join(point_text))
+                point_text = None
+
+                if len(points_text) == SCAN_CHUNK_SIZE:
+                    surface.add_points_text(points_text)
+                    points_text = []
+            elif path == ("Surfaces", "Surface"):
+                surface.add_points_text(points_text)
+                self.surfaces.append(surface)
+
+        def character_data(data: str) -> None:
+            if point_text is not None:
+                point_text.append(data)
+
+        parser = expat.ParserCreate(namespace_separator="}")
+        parser.buffer_text = True
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        parser.CharacterDataHandler = character_data
+
+        try:
+            parse_blocks(self.path, parser.Parse, self.progress)
+            parser.Parse(b"", True)
+        except expat.ExpatError as e:
+            raise ET.ParseError(str(e)) from e
 
     @property
-    def all_faces(self) -> typing.List[MeshFace]:
-        """Returns faces from all surfaces in the file."""
-        faces = []
+    def surface_count(self) -> int:
+        return len(self.surfaces)
 
-        for surface in self.surfaces:
-            faces.extend(surface.faces(True))
+    @property
+    def point_count(self) -> int:
+        return sum(x.point_count for x in self.surfaces)
 
-        return faces
+    @property
+    def face_count(self) -> int:
+        return sum(x.face_count for x in self.surfaces)
+
+    def crs(self) -> QgsCoordinateReferenceSystem:
+        return crs_from_attributes(self._crs_attributes)
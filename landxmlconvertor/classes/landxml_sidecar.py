@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import typing
+
+import numpy as np
+
+from .mesh_arrays import MeshArrays
+
+# sidecar of `surfaces.xml` is folder `surfaces.xml.landxmlcache` next to it
+SIDECAR_SUFFIX = ".landxmlcache"
+
+SIDECAR_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+
+# the hash is computed from evenly spaced samples of the file, so validation does not read the whole file
+HASH_SAMPLES = 16
+HASH_SAMPLE_SIZE = 64 * 1024
+
+_ARRAY_NAMES = ("vertex_ids", "x", "y", "z", "face_ids", "faces")
+
+
+def sidecar_path(path: str) -> str:
+    return f"{os.path.abspath(path)}{SIDECAR_SUFFIX}"
+
+
+def file_fingerprint(path: str) -> typing.Dict[str, typing.Any]:
+    """Size, modification time and blake2b hash of sampled blocks of the file."""
+    stat = os.stat(path)
+
+    digest = hashlib.blake2b(str(stat.st_size).encode(), digest_size=16)
+
+    with open(path, "rb") as file:
+        if stat.st_size <= HASH_SAMPLES * HASH_SAMPLE_SIZE:
+            digest.update(file.read())
+        else:
+            for offset in np.linspace(0, stat.st_size - HASH_SAMPLE_SIZE, HASH_SAMPLES).astype(np.int64).tolist():
+                file.seek(offset)
+                digest.update(file.read(HASH_SAMPLE_SIZE))
+
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": digest.hexdigest()}
+
+
+class LandXMLSidecar:
+    """Decoded surfaces and CRS of the LandXML file stored as `.npy` files in a folder next to it.
+
+    Arrays are loaded memory-mapped, so loading does not copy them and only the accessed parts are read from disk.
+    The manifest keeps fingerprint of the LandXML file, the sidecar is ignored once the file changes.
+    """
+
+    def __init__(
+        self,
+        surfaces: typing.List[typing.Tuple[str, MeshArrays]],
+        crs_attributes: typing.Optional[typing.Dict[str, str]] = None,
+    ) -> None:
+        self.surfaces = surfaces
+        self.crs_attributes = crs_attributes
+
+    @classmethod
+    def load(cls, path: str) -> typing.Optional["LandXMLSidecar"]:
+        """Loads sidecar of the LandXML file, `None` if it does not exist, is outdated or cannot be read."""
+        folder = sidecar_path(path)
+
+        try:
+            with open(os.path.join(folder, MANIFEST_FILE), encoding="utf-8") as file:
+                manifest = json.load(file)
+
+            if manifest.get("version") != SIDECAR_VERSION or manifest.get("source") != file_fingerprint(path):
+                return None
+
+            surfaces = []
+            for i, surface in enumerate(manifest["surfaces"]):
+                arrays = [np.load(os.path.join(folder, f"{i}_{x}.npy"), mmap_mode="r") for x in _ARRAY_NAMES]
+                surfaces.append((surface["name"], MeshArrays(*arrays)))
+
+            return cls(surfaces, manifest["crs"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: str) -> bool:
+        """Writes sidecar of the LandXML file, returns `False` if it cannot be written (e.g. read-only folder).
+
+        Files are written into temporary folder that replaces the previous sidecar, so readers never see
+        partially written sidecar.
+        """
+        folder = sidecar_path(path)
+
+        try:
+            manifest = {
+                "version": SIDECAR_VERSION,
+                "source": file_fingerprint(path),
+                "crs": self.crs_attributes,
+                "surfaces": [],
+            }
+
+            temp_folder = tempfile.mkdtemp(prefix=f"{os.path.basename(folder)}.", dir=os.path.dirname(folder))
+        except OSError:
+            return False
+
+        try:
+            for i, (name, mesh_arrays) in enumerate(self.surfaces):
+                for array_name in _ARRAY_NAMES:
+                    np.save(os.path.join(temp_folder, f"{i}_{array_name}.npy"), getattr(mesh_arrays, array_name))
+
+                manifest["surfaces"].append(
+                    {"name": name, "vertices": mesh_arrays.vertex_count, "faces": mesh_arrays.face_count}
+                )
+
+            # manifest is written last, sidecar without it is never loaded
+            with open(os.path.join(temp_folder, MANIFEST_FILE), "w", encoding="utf-8") as file:
+                json.dump(manifest, file, indent=2)
+
+            if os.path.isdir(folder):
+                shutil.rmtree(folder)
+            os.replace(temp_folder, folder)
+        except OSError:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+            return False
+
+        return True
+
+    @staticmethod
+    def remove(path: str) -> None:
+        """Removes sidecar of the LandXML file if it exists."""
+        shutil.rmtree(sidecar_path(path), ignore_errors=True)
@@ -7,20 +7,26 @@ from qgis.core import (
     QgsCoordinateReferenceSystem,
     QgsMesh,
     QgsMeshLayer,
-    QgsProcessingUtils,
-    QgsProviderRegistry,
     QgsUnitTypes,
 )
 
 from ..text_constants import TextConstants
 from ..utils import plugin_author, plugin_repository_url, plugin_version
-from .mesh2dm_reader import Mesh2DMReader
-from .mesh_elements import MeshFace, MeshVertex
+from .landxml_io import open_landxml_output
+from .mesh_arrays import NO_VERTEX, MeshArrays
+from .progress import ProgressCallback, ProgressPoller
+from .qgs_mesh import mesh_arrays_from_qgs_mesh
 from .xml_formatter import XmlFormatter
 
+# number of points or faces formatted and written to file at once
+WRITE_CHUNK_SIZE = 65_536
+
 
 class LandXMLWriter:
-    """Class for writing the LandXML format from mesh vericies and faces."""
+    """Class for writing the LandXML format from mesh vericies and faces.
+
+    Surfaces are kept as arrays and written to the file incrementally, in chunks of formatted points and faces.
+    """
 
     def __init__(
         self,
@@ -52,8 +58,16 @@ class LandXMLWriter:
         self.surfaces_elem = ET.Element("Surfaces")
         self.root_element.append(self.surfaces_elem)
 
+        self.surfaces: typing.List[typing.Tuple[str, MeshArrays]] = []
+
     @property
     def LandXML(self) -> ET.Element:
+        """Whole document as element tree, elements of surfaces are created on every call."""
+        self.surfaces_elem.clear()
+
+        for name, mesh_arrays in self.surfaces:
+            self.surfaces_elem.append(self._create_surface_from_arrays(name, mesh_arrays))
+
         return self.root_element
 
     def create_crs(self) -> ET.Element:
@@ -109,45 +123,121 @@ class LandXMLWriter:
 
         return ET.Element("Application", attrib=attr)
 
-    def _create_surface(self, name: str, points: typing.List[MeshVertex], faces: typing.List[MeshFace]) -> ET.Element:
+    def _create_surface_from_arrays(self, name: str, mesh_arrays: MeshArrays) -> ET.Element:
         elem_surface = ET.Element("Surface", attrib={"name": name})
 
-        elem_definition = ET.Element("Definition", attrib={"surfType": "TIN"})
-        elem_surface.append(elem_definition)
+        elem_definition = ET.SubElement(elem_surface, "Definition", attrib={"surfType": "TIN"})
 
-        elem_pnts = ET.Element("Pnts")
-        elem_definition.append(elem_pnts)
+        elem_pnts = ET.SubElement(elem_definition, "Pnts")
 
-        for point in points:
-            elem_pnts.append(point.as_landxml_element())
+        for vertex_id, x, y, z in zip(
+            mesh_arrays.vertex_ids.tolist(), mesh_arrays.x.tolist(), mesh_arrays.y.tolist(), mesh_arrays.z.tolist()
+        ):
+            elem_point = ET.SubElement(elem_pnts, "P", attrib={"id": str(vertex_id)})
+            elem_point.text = f"{y} {x} {z}"
 
-        elem_faces = ET.Element("Faces")
-        elem_definition.append(elem_faces)
+        elem_faces = ET.SubElement(elem_definition, "Faces")
 
-        for face in faces:
-            elem_faces.append(face.as_landxml_element())
+        for vertex_ids in mesh_arrays.faces.tolist():
+            elem_face = ET.SubElement(elem_faces, "F")
+            elem_face.text = " ".join([str(x) for x in vertex_ids if x != NO_VERTEX])
 
         return elem_surface
 
-    def write(self, file_name: str) -> None:
-        text = XmlFormatter.elementToPrettyXml(self.LandXML)
-        with open(file_name, "w", encoding="utf-8") as file:
-            file.write(text.decode("utf-8"))
+    def add_surface_arrays(self, name: str, mesh_arrays: MeshArrays) -> None:
+        """Adds surface with given name from vertices and faces stored in columnar arrays."""
+        self.surfaces.append((name, mesh_arrays))
 
-    def add_surface(self, mesh_layer: QgsMeshLayer) -> None:
-        mdal_provider_meta = QgsProviderRegistry.instance().providerMetadata("mdal")
+    def write(self, file_name: str, progress: typing.Optional[ProgressCallback] = None) -> None:
+        """Writes the document, surfaces are formatted and written in chunks so no XML tree of them is created.
 
-        tmp_2dm_file = QgsProcessingUtils.generateTempFilename(f"{mesh_layer.id()}.2dm")
+        `progress` is polled between chunks, canceled writing raises `ConversionCanceledError` and leaves partial file.
+        File name with `.gz` suffix is written gzip compressed.
+        """
+        indent = "    "
 
-        # create temp 2D file
-        mesh = QgsMesh()
-        mesh_layer.dataProvider().populateMesh(mesh)
+        poller = ProgressPoller(
+            progress, sum([x.vertex_count + x.face_count for _, x in self.surfaces]), interval=WRITE_CHUNK_SIZE
+        )
 
-        mdal_provider_meta.createMeshData(mesh=mesh, fileName=tmp_2dm_file, driverName="2DM", crs=mesh_layer.crs())
+        with open_landxml_output(file_name) as file:
+            file.write(XmlFormatter.XML_DECLARATION)
+            file.write(XmlFormatter.startTag(self.root_element.tag, self.root_element.attrib, 0, indent))
 
-        # read the file to format, that holds points and faces
-        mesh_2dm_reader = Mesh2DMReader(tmp_2dm_file)
+            for element in self.root_element:
+                if element is self.surfaces_elem:
+                    continue
+                file.writelines(XmlFormatter.elementToPrettyLines(element, 1, indent, poller))
 
-        elem_surface = self._create_surface(mesh_layer.name(), mesh_2dm_reader.points, mesh_2dm_reader.faces)
+            if self.surfaces:
+                file.write(XmlFormatter.startTag("Surfaces", {}, 1, indent))
+                for name, mesh_arrays in self.surfaces:
+                    self._write_surface(file, name, mesh_arrays, indent, poller)
+                file.write(XmlFormatter.endTag("Surfaces", 1, indent))
+            else:
+                file.write(XmlFormatter.emptyTag("Surfaces", {}, 1, indent))
+
+            file.write(XmlFormatter.endTag(self.root_element.tag, 0, indent))
+
+        poller.finish()
+
+    @staticmethod
+    def _write_surface(
+        file: typing.TextIO, name: str, mesh_arrays: MeshArrays, indent: str, poller: ProgressPoller
+    ) -> None:
+        file.write(XmlFormatter.startTag("Surface", {"name": name}, 2, indent))
+        file.write(XmlFormatter.startTag("Definition", {"surfType": "TIN"}, 3, indent))
+
+        if mesh_arrays.vertex_count:
+            file.write(XmlFormatter.startTag("Pnts", {}, 4, indent))
+
+            point_format = f'{indent * 5}<P id="{{}}">{{}} {{}} {{}}</P>\n'
+
+            for start in range(0, mesh_arrays.vertex_count, WRITE_CHUNK_SIZE):
+                end = start + WRITE_CHUNK_SIZE
+                poller.step(min(end, mesh_arrays.vertex_count) - start)
+                file.write(
+                    "".join(
+                        map(
+                            point_format.format,
+                            mesh_arrays.vertex_ids[start:end].tolist(),
+                            mesh_arrays.y[start:end].tolist(),
+                            mesh_arrays.x[start:end].tolist(),
+                            mesh_arrays.z[start:end].tolist(),
+                        )
+                    )
+                )
+
+            file.write(XmlFormatter.endTag("Pnts", 4, indent))
+        else:
+            file.write(XmlFormatter.emptyTag("Pnts", {}, 4, indent))
+
+        if mesh_arrays.face_count:
+            file.write(XmlFormatter.startTag("Faces", {}, 4, indent))
+
+            face_indent = indent * 5
+
+            for start in range(0, mesh_arrays.face_count, WRITE_CHUNK_SIZE):
+                faces = mesh_arrays.faces[start : start + WRITE_CHUNK_SIZE].tolist()
+                poller.step(len(faces))
+                file.write(
+                    "".join(
+                        [
+                            f"{face_indent}<F>{' '.join([str(x) for x in vertex_ids if x != NO_VERTEX])}</F>\n"
+                            for vertex_ids in faces
+                        ]
+                    )
+                )
+
+            file.write(XmlFormatter.endTag("Faces", 4, indent))
+        else:
+            file.write(XmlFormatter.emptyTag("Faces", {}, 4, indent))
+
+        file.write(XmlFormatter.endTag("Definition", 3, indent))
+        file.write(XmlFormatter.endTag("Surface", 2, indent))
+
+    def add_surface(self, mesh_layer: QgsMeshLayer) -> None:
+        mesh = QgsMesh()
+        mesh_layer.dataProvider().populateMesh(mesh)
 
-        self.surfaces_elem.append(elem_surface)
+        self.add_surface_arrays(mesh_layer.name(), mesh_arrays_from_qgs_mesh(mesh))
@@ -1,19 +1,148 @@
-from .mesh_elements import MeshFace, MeshVertex
+import os
+import typing
+
+import numpy as np
+
+from .mesh_arrays import NO_VERTEX, MeshArrays
+from .mesh_views import MeshFacesView, MeshVerticesView
+from .progress import ProgressCallback, ProgressPoller
+
+# whitespace characters separating values in 2DM records
+_WHITESPACE = np.frombuffer(b" \t\r\v\f", dtype=np.uint8)
+
+
+def _invalid_record_error(line: bytes) -> ValueError:
+    return ValueError(f"Invalid 2DM record: `{line.decode('utf-8', errors='replace').strip()}`.")
+
+
+def _decode_records(lines: typing.List[bytes], card_length: int, columns: int, dtype: type) -> np.ndarray:
+    """Decodes first `columns` values after the card of each record in one vectorized pass.
+
+    Records may be separated by any whitespace and contain additional values (e.g. material ids), these are skipped.
+    """
+    if not lines:
+        return np.empty((0, columns), dtype=dtype)
+
+    # drop the card and join records into single text, records are separated by new line
+    text = b"\n".join([line[card_length:] for line in lines])
+
+    try:
+        values = np.fromstring(text, dtype=dtype, sep=" ")
+    except ValueError:
+        values = None
+
+    # number of values in each record, from starts of the tokens in the text
+    characters = np.frombuffer(text, dtype=np.uint8)
+    is_newline = characters == ord("\n")
+    is_separator = np.isin(characters, _WHITESPACE) | is_newline
+    token_starts = ~is_separator & np.concatenate(([True], is_separator[:-1]))
+    counts = np.bincount(np.cumsum(is_newline)[token_starts], minlength=len(lines))
+
+    if values is None or values.size != counts.sum():
+        # some value is not a number, find the record with it
+        for line in lines:
+            try:
+                np.fromstring(line[card_length:], dtype=dtype, sep=" ")
+            except ValueError:
+                raise _invalid_record_error(line)
+        raise _invalid_record_error(lines[0])
+
+    if np.any(counts < columns):
+        raise _invalid_record_error(lines[int(np.argmax(counts < columns))])
+
+    record_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    return values[record_starts[:, np.newaxis] + np.arange(columns)]
 
 
 # https://www.xmswiki.com/wiki/SMS:2D_Mesh_Files_*.2dm
 class Mesh2DMReader:
-    """Class for reading points and faces from 2DM format."""
+    """Class for reading points and faces from 2DM format.
+
+    The file is read in large blocks, the records are classified by their card and `ND`, `E3T` and `E4Q` records
+    are decoded into arrays in a few vectorized passes. Other cards are ignored.
+    `progress` is polled after each block, `ConversionCanceledError` is raised if it returns `False`.
+    """
+
+    BLOCK_SIZE = 16 * 1024 * 1024
+
+    def __init__(self, file_name: str, progress: typing.Optional[ProgressCallback] = None) -> None:
+        self._nodes: typing.List[np.ndarray] = []
+        self._triangles: typing.List[np.ndarray] = []
+        self._quads: typing.List[np.ndarray] = []
+        # positions of the element records in file, to keep the order of faces if triangles and quads are mixed
+        self._triangles_positions: typing.List[np.ndarray] = []
+        self._quads_positions: typing.List[np.ndarray] = []
+
+        with open(file_name, "rb") as file:
+            poller = ProgressPoller(progress, os.fstat(file.fileno()).st_size, file.tell, interval=1)
+
+            rest = b""
+            line_number = 0
+
+            while True:
+                block = file.read(self.BLOCK_SIZE)
+
+                if not block:
+                    break
+
+                block = rest + block
+
+                end = block.rfind(b"\n")
+                if end == -1:
+                    rest = block
+                    continue
+
+                rest = block[end + 1 :]
+                line_number = self._decode_block(block[:end], line_number)
+
+                poller.step()
+
+            if rest:
+                self._decode_block(rest, line_number)
+
+        self.mesh_arrays = self._build_arrays()
+
+        self.points = MeshVerticesView([self.mesh_arrays])
+        self.faces = MeshFacesView([self.mesh_arrays])
+
+    def _decode_block(self, block: bytes, line_number: int) -> int:
+        lines = block.split(b"\n")
+
+        nodes = [line for line in lines if line.startswith((b"ND ", b"ND\t"))]
+
+        triangles_positions = [i for i, line in enumerate(lines) if line.startswith((b"E3T ", b"E3T\t"))]
+        quads_positions = [i for i, line in enumerate(lines) if line.startswith((b"E4Q ", b"E4Q\t"))]
+
+        self._nodes.append(_decode_records(nodes, 2, 4, np.float64))
+
+        self._triangles.append(_decode_records([lines[i] for i in triangles_positions], 3, 4, np.int64))
+        self._triangles_positions.append(np.array(triangles_positions, dtype=np.int64) + line_number)
+
+        self._quads.append(_decode_records([lines[i] for i in quads_positions], 3, 5, np.int64))
+        self._quads_positions.append(np.array(quads_positions, dtype=np.int64) + line_number)
+
+        return line_number + len(lines)
+
+    def _build_arrays(self) -> MeshArrays:
+        nodes = np.concatenate(self._nodes) if self._nodes else np.empty((0, 4))
+
+        triangles = np.concatenate(self._triangles) if self._triangles else np.empty((0, 4), dtype=np.int64)
+        quads = np.concatenate(self._quads) if self._quads else np.empty((0, 5), dtype=np.int64)
 
-    def __init__(self, file_name: str) -> None:
-        with open(file_name, "r", encoding="utf-8") as file:
-            self.lines = file.readlines()
+        if quads.shape[0] == 0:
+            faces = triangles
+        else:
+            triangles = np.hstack([triangles, np.full((triangles.shape[0], 1), NO_VERTEX, dtype=np.int64)])
 
-        self.points = []
-        self.faces = []
+            positions = np.concatenate(self._triangles_positions + self._quads_positions)
+            faces = np.concatenate([triangles, quads])[np.argsort(positions, kind="stable")]
 
-        for line in self.lines:
-            if line.startswith("ND"):
-                self.points.append(MeshVertex.from_2dm_line(line))
-            elif line.startswith("E3T") or line.startswith("E4Q"):
-                self.faces.append(MeshFace.from_2dm_line(line))
+        return MeshArrays(
+            nodes[:, 0].astype(np.int64),
+            nodes[:, 1],
+            nodes[:, 2],
+            nodes[:, 3],
+            faces[:, 0],
+            faces[:, 1:],
+        )
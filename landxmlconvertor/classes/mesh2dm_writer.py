@@ -1,21 +1,112 @@
+import itertools
 import typing
 
+from .mesh_arrays import NO_VERTEX, MeshArrays
 from .mesh_elements import MeshFace, MeshVertex
+from .mesh_views import MeshFacesView, MeshVerticesView
+from .progress import ProgressCallback, ProgressPoller
+
+# number of records formatted and written to file at once
+WRITE_CHUNK_SIZE = 65_536
 
 
 class Mesh2DMWriter:
-    """Writes 2DM format from list of mesh verticies and list of mesh faces"""
+    """Writes 2DM format from list of mesh verticies and list of mesh faces.
+
+    Records are formatted and written in chunks of fixed size, so writing takes constant additional memory.
+    If vertices and faces are given as views of `MeshArrays`, records are formatted directly from the arrays.
+    """
 
-    def __init__(self, points: typing.List[MeshVertex], faces: typing.List[MeshFace]) -> None:
+    def __init__(self, points: typing.Sequence[MeshVertex], faces: typing.Sequence[MeshFace]) -> None:
         self.points = points
         self.faces = faces
 
+    @classmethod
+    def from_mesh_arrays(cls, mesh_arrays: MeshArrays) -> "Mesh2DMWriter":
+        """Writer of the mesh stored in columnar arrays."""
+        return cls(MeshVerticesView([mesh_arrays]), MeshFacesView([mesh_arrays]))
+
     def _as_2dm_string(self) -> str:
-        str_points = "\n".join([x.as_2dm_element() for x in self.points])
-        str_faces = "\n".join([x.as_2dm_element() for x in self.faces])
+        str_points = "\n".join(self._points_chunks())
+        str_faces = "\n".join(self._faces_chunks())
 
         return f"MESH2D\n{str_points}\n{str_faces}"
 
-    def write(self, file_name: str) -> None:
-        with open(file_name, "w+", encoding="utf-8") as file:
-            file.write(self._as_2dm_string())
+    def _points_chunks(self, poller: typing.Optional[ProgressPoller] = None) -> typing.Iterator[str]:
+        """Yields chunks of vertex records separated by new line, written records are counted by poller."""
+        if poller is None:
+            poller = ProgressPoller(None)
+
+        if isinstance(self.points, MeshVerticesView):
+            for mesh in self.points.parts:
+                for start in range(0, mesh.vertex_count, WRITE_CHUNK_SIZE):
+                    end = start + WRITE_CHUNK_SIZE
+                    poller.step(min(end, mesh.vertex_count) - start)
+                    yield "\n".join(
+                        map(
+                            "ND {} {} {} {}".format,
+                            mesh.vertex_ids[start:end].tolist(),
+                            mesh.x[start:end].tolist(),
+                            mesh.y[start:end].tolist(),
+                            mesh.z[start:end].tolist(),
+                        )
+                    )
+        else:
+            iterator = iter(self.points)
+            while chunk := list(itertools.islice(iterator, WRITE_CHUNK_SIZE)):
+                poller.step(len(chunk))
+                yield "\n".join([x.as_2dm_element() for x in chunk])
+
+    def _faces_chunks(self, poller: typing.Optional[ProgressPoller] = None) -> typing.Iterator[str]:
+        """Yields chunks of element records separated by new line, written records are counted by poller."""
+        if poller is None:
+            poller = ProgressPoller(None)
+
+        if isinstance(self.faces, MeshFacesView):
+            for mesh in self.faces.parts:
+                for start in range(0, mesh.face_count, WRITE_CHUNK_SIZE):
+                    end = start + WRITE_CHUNK_SIZE
+                    poller.step(min(end, mesh.face_count) - start)
+                    face_ids = mesh.face_ids[start:end].tolist()
+                    faces = mesh.faces[start:end]
+
+                    if faces.shape[1] == 3:
+                        yield "\n".join(map("E3T {} {} {} {} 1".format, face_ids, *faces.T.tolist()))
+                    else:
+                        yield "\n".join(
+                            [
+                                (
+                                    f"E3T {face_id} {v[0]} {v[1]} {v[2]} 1"
+                                    if v[3] == NO_VERTEX
+                                    else f"E4Q {face_id} {v[0]} {v[1]} {v[2]} {v[3]} 1"
+                                )
+                                for face_id, v in zip(face_ids, faces.tolist())
+                            ]
+                        )
+        else:
+            iterator = iter(self.faces)
+            while chunk := list(itertools.islice(iterator, WRITE_CHUNK_SIZE)):
+                poller.step(len(chunk))
+                yield "\n".join([x.as_2dm_element() for x in chunk])
+
+    @staticmethod
+    def _write_chunks(file: typing.TextIO, chunks: typing.Iterable[str]) -> None:
+        for i, chunk in enumerate(chunks):
+            if i > 0:
+                file.write("\n")
+            file.write(chunk)
+
+    def write(self, file_name: str, progress: typing.Optional[ProgressCallback] = None) -> None:
+        """Writes the file, `progress` is polled between chunks and the writing stops if it returns `False`.
+
+        Canceled writing raises `ConversionCanceledError` and leaves incomplete file.
+        """
+        poller = ProgressPoller(progress, len(self.points) + len(self.faces))
+
+        with open(file_name, "w+", encoding="utf-8", buffering=1024 * 1024) as file:
+            file.write("MESH2D\n")
+            self._write_chunks(file, self._points_chunks(poller))
+            file.write("\n")
+            self._write_chunks(file, self._faces_chunks(poller))
+
+        poller.finish()
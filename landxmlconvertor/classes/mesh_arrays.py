@@ -0,0 +1,261 @@
+import array
+import typing
+
+import numpy as np
+
+from .mesh_elements import MeshFace, MeshVertex
+
+# value used in connectivity array to pad triangles in mesh that also contains quads
+NO_VERTEX = -1
+
+
+def offset_connectivity(faces: np.ndarray, id_offset: int) -> np.ndarray:
+    """Offsets vertex ids in connectivity array, padding values are kept."""
+    return np.where(faces != NO_VERTEX, faces + id_offset, NO_VERTEX)
+
+
+class MeshArrays:
+    """Columnar storage of mesh vertices and faces.
+
+    Vertices are stored as contiguous `int64` array of ids and `float64` arrays of x, y and z coordinates.
+    Faces are stored as `int64` array of ids and connectivity array of vertex ids with shape (N, 3) for
+    triangular meshes or (N, 4) if the mesh contains quads, in which case triangles are padded with `NO_VERTEX`.
+    """
+
+    def __init__(
+        self,
+        vertex_ids: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        z: np.ndarray,
+        face_ids: np.ndarray,
+        faces: np.ndarray,
+    ) -> None:
+        self.vertex_ids = np.ascontiguousarray(vertex_ids, dtype=np.int64)
+        self.x = np.ascontiguousarray(x, dtype=np.float64)
+        self.y = np.ascontiguousarray(y, dtype=np.float64)
+        self.z = np.ascontiguousarray(z, dtype=np.float64)
+
+        self.face_ids = np.ascontiguousarray(face_ids, dtype=np.int64)
+        self.faces = np.ascontiguousarray(faces, dtype=np.int64)
+
+    @classmethod
+    def empty(cls) -> "MeshArrays":
+        return cls(
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=np.int64),
+            np.empty((0, 3), dtype=np.int64),
+        )
+
+    @classmethod
+    def from_mesh_elements(cls, points: typing.Iterable[MeshVertex], faces: typing.Iterable[MeshFace]) -> "MeshArrays":
+        builder = MeshArraysBuilder()
+
+        for point in points:
+            builder.add_vertex(point)
+
+        for face in faces:
+            builder.add_face(face)
+
+        return builder.build()
+
+    @classmethod
+    def concatenate(cls, meshes: typing.Sequence["MeshArrays"]) -> "MeshArrays":
+        """Joins meshes into single one, ids are kept as they are."""
+        if len(meshes) == 0:
+            return cls.empty()
+
+        face_width = max(mesh.faces.shape[1] for mesh in meshes)
+
+        return cls(
+            np.concatenate([mesh.vertex_ids for mesh in meshes]),
+            np.concatenate([mesh.x for mesh in meshes]),
+            np.concatenate([mesh.y for mesh in meshes]),
+            np.concatenate([mesh.z for mesh in meshes]),
+            np.concatenate([mesh.face_ids for mesh in meshes]),
+            np.concatenate([mesh.padded_faces(face_width) for mesh in meshes]),
+        )
+
+    @property
+    def vertex_count(self) -> int:
+        return self.vertex_ids.shape[0]
+
+    @property
+    def face_count(self) -> int:
+        return self.face_ids.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the arrays."""
+        return sum(x.nbytes for x in (self.vertex_ids, self.x, self.y, self.z, self.face_ids, self.faces))
+
+    def face_sizes(self) -> np.ndarray:
+        """Number of vertices of each face."""
+        return np.count_nonzero(self.faces != NO_VERTEX, axis=1)
+
+    def padded_faces(self, width: int) -> np.ndarray:
+        """Connectivity array with at least `width` columns, missing columns are filled with `NO_VERTEX`."""
+        if self.faces.shape[1] >= width:
+            return self.faces
+
+        padding = np.full((self.faces.shape[0], width - self.faces.shape[1]), NO_VERTEX, dtype=np.int64)
+        return np.hstack([self.faces, padding])
+
+    def face_vertex_indices(self) -> np.ndarray:
+        """Connectivity as 0-based indices into vertex arrays, padding is kept as `NO_VERTEX`.
+
+        Raises `ValueError` if some face references vertex id that does not exist.
+        """
+        indices = np.full(self.faces.shape, NO_VERTEX, dtype=np.int64)
+
+        used = self.faces != NO_VERTEX
+        face_vertex_ids = self.faces[used]
+
+        if face_vertex_ids.size == 0:
+            return indices
+
+        if self.vertex_count == 0:
+            raise ValueError("Faces reference vertices that do not exist.")
+
+        if self.has_dense_ids():
+            # ids are consecutive, index is just difference from the first id
+            positions = face_vertex_ids - self.vertex_ids[0]
+
+            if positions.min() < 0 or positions.max() >= self.vertex_count:
+                raise ValueError("Faces reference vertices that do not exist.")
+
+            indices[used] = positions
+
+            return indices
+
+        order = np.argsort(self.vertex_ids, kind="stable")
+        sorted_ids = self.vertex_ids[order]
+
+        positions = np.searchsorted(sorted_ids, face_vertex_ids)
+        positions[positions == sorted_ids.size] = 0
+
+        if not np.array_equal(sorted_ids[positions], face_vertex_ids):
+            raise ValueError("Faces reference vertices that do not exist.")
+
+        indices[used] = order[positions]
+
+        return indices
+
+    def has_dense_ids(self) -> bool:
+        """Checks if vertex ids are consecutive numbers in the order of vertices, so ids map directly to indices."""
+        if self.vertex_count == 0:
+            return True
+
+        return self.vertex_ids[-1] - self.vertex_ids[0] == self.vertex_count - 1 and bool(
+            np.all(np.diff(self.vertex_ids) == 1)
+        )
+
+    def renumbered(self, first_vertex_id: int = 1, first_face_id: int = 1) -> "MeshArrays":
+        """Returns new arrays with vertices and faces numbered consecutively from given ids, in their order.
+
+        Connectivity is rewritten through vertex indices, so the original ids may be arbitrary.
+        Coordinate arrays are shared with the original arrays.
+        """
+        return MeshArrays(
+            np.arange(first_vertex_id, first_vertex_id + self.vertex_count, dtype=np.int64),
+            self.x,
+            self.y,
+            self.z,
+            np.arange(first_face_id, first_face_id + self.face_count, dtype=np.int64),
+            offset_connectivity(self.face_vertex_indices(), first_vertex_id),
+        )
+
+    @staticmethod
+    def renumber_consecutively(meshes: typing.Sequence["MeshArrays"]) -> typing.List["MeshArrays"]:
+        """Renumbers meshes so that ids of vertices and faces are dense and continue from one mesh to the next.
+
+        The first mesh is numbered from 1, so ids of joined meshes are unique regardless of the original ids.
+        """
+        vertex_starts = np.cumsum([0] + [mesh.vertex_count for mesh in meshes]) + 1
+        face_starts = np.cumsum([0] + [mesh.face_count for mesh in meshes]) + 1
+
+        return [
+            mesh.renumbered(int(vertex_start), int(face_start))
+            for mesh, vertex_start, face_start in zip(meshes, vertex_starts, face_starts)
+        ]
+
+
+class MeshArraysBuilder:
+    """Collects vertices and faces one by one into compact buffers, that are converted into `MeshArrays`."""
+
+    def __init__(self) -> None:
+        self._vertex_ids = array.array("q")
+        self._coordinates = array.array("d")
+
+        self._face_ids = array.array("q")
+        # every face occupies 4 items, triangles are padded with NO_VERTEX
+        self._faces = array.array("q")
+        self._has_quads = False
+
+    def add_vertex(self, vertex: MeshVertex) -> None:
+        self._vertex_ids.append(vertex.id)
+        self._coordinates.extend((vertex.x, vertex.y, vertex.z))
+
+    def add_face(self, face: MeshFace) -> None:
+        if len(face.points_ids) == 4:
+            self._has_quads = True
+        elif len(face.points_ids) != 3:
+            raise ValueError(
+                f"Face `{face.id}` has {len(face.points_ids)} vertices, only triangles and quads are supported."
+            )
+
+        self._face_ids.append(face.id)
+        self._faces.extend(face.points_ids)
+        if len(face.points_ids) == 3:
+            self._faces.append(NO_VERTEX)
+
+    def add_vertices(self, vertex_ids: np.ndarray, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> None:
+        """Adds already decoded vertices at once."""
+        self._vertex_ids.frombytes(np.ascontiguousarray(vertex_ids, dtype=np.int64).tobytes())
+        self._coordinates.frombytes(np.column_stack([x, y, z]).astype(np.float64).tobytes())
+
+    def add_faces(self, face_ids: np.ndarray, faces: np.ndarray) -> None:
+        """Adds already decoded faces at once, `faces` has 3 columns or 4 with triangles padded by `NO_VERTEX`."""
+        faces = np.asarray(faces, dtype=np.int64)
+
+        if faces.shape[1] == 3:
+            faces = np.hstack([faces, np.full((faces.shape[0], 1), NO_VERTEX, dtype=np.int64)])
+        elif np.any(faces[:, 3] != NO_VERTEX):
+            self._has_quads = True
+
+        self._face_ids.frombytes(np.ascontiguousarray(face_ids, dtype=np.int64).tobytes())
+        self._faces.frombytes(np.ascontiguousarray(faces).tobytes())
+
+    @property
+    def face_count(self) -> int:
+        return len(self._face_ids)
+
+    def retain_faces(self, keep: np.ndarray) -> None:
+        """Keeps only the faces marked in the mask, in their order."""
+        face_ids = np.frombuffer(self._face_ids, dtype=np.int64)[keep]
+        faces = np.frombuffer(self._faces, dtype=np.int64).reshape(-1, 4)[keep]
+
+        self._face_ids = array.array("q", face_ids.tobytes())
+        self._faces = array.array("q", faces.tobytes())
+        self._has_quads = bool(np.any(faces[:, 3] != NO_VERTEX))
+
+    def build(self) -> MeshArrays:
+        coordinates = np.frombuffer(self._coordinates, dtype=np.float64).reshape(-1, 3)
+
+        faces = np.frombuffer(self._faces, dtype=np.int64).reshape(-1, 4)
+        if self._has_quads:
+            faces = faces.copy()
+        else:
+            faces = faces[:, :3]
+
+        return MeshArrays(
+            np.array(self._vertex_ids, dtype=np.int64),
+            coordinates[:, 0],
+            coordinates[:, 1],
+            coordinates[:, 2],
+            np.array(self._face_ids, dtype=np.int64),
+            faces,
+        )
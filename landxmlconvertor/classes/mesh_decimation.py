@@ -0,0 +1,359 @@
+import math
+import typing
+
+import numpy as np
+
+from .mesh_arrays import NO_VERTEX, MeshArrays, offset_connectivity
+
+# coefficients of symmetric 4x4 quadric stored per vertex, as pairs of indices into (x, y, z, 1)
+_QUADRIC_TERMS = [(0, 0), (0, 1), (0, 2), (0, 3), (1, 1), (1, 2), (1, 3), (2, 2), (2, 3), (3, 3)]
+
+# relative planar area below which the triangle is considered degenerate
+_AREA_TOLERANCE = 1e-12
+
+
+def _triangles(indices: np.ndarray) -> np.ndarray:
+    """Triangles of the faces given as vertex indices, faces of any width are fanned from their first vertex.
+
+    Only columns up to the first `NO_VERTEX` of each face are used, so quads are split along their first diagonal.
+    """
+    valid = np.logical_and.accumulate(indices != NO_VERTEX, axis=1)
+
+    triangles = [indices[valid[:, 2]][:, :3]]
+    for i in range(3, indices.shape[1]):
+        triangles.append(indices[valid[:, i]][:, [0, i - 1, i]])
+
+    return np.concatenate(triangles)
+
+
+def _sorted_unique(values: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Sorted unique values and their counts."""
+    values = np.sort(values)
+    starts = np.flatnonzero(np.concatenate([[True], values[1:] != values[:-1]]))
+
+    return values[starts], np.diff(np.append(starts, values.size))
+
+
+def _signed_areas(x: np.ndarray, y: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """Twice the signed planar area of the triangles, positive for counter-clockwise order."""
+    x0, x1, x2 = x[triangles[:, 0]], x[triangles[:, 1]], x[triangles[:, 2]]
+    y0, y1, y2 = y[triangles[:, 0]], y[triangles[:, 1]], y[triangles[:, 2]]
+
+    return (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+
+
+def _vertex_quadrics(x: np.ndarray, y: np.ndarray, z: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """Quadrics of squared vertical distance to planes of adjacent triangles, weighted by planar area of triangles.
+
+    Plane `z = a x + b y + c` of each triangle gives vector `(a, b, -1, c)`, so that `v^T Q v` for `v = (x, y, z, 1)`
+    is the squared vertical distance of the point from the plane. Vertical triangles do not contribute.
+    """
+    x0, y0, z0 = x[triangles[:, 0]], y[triangles[:, 0]], z[triangles[:, 0]]
+
+    ux, uy, uz = x[triangles[:, 1]] - x0, y[triangles[:, 1]] - y0, z[triangles[:, 1]] - z0
+    vx, vy, vz = x[triangles[:, 2]] - x0, y[triangles[:, 2]] - y0, z[triangles[:, 2]] - z0
+
+    normal_x = uy * vz - uz * vy
+    normal_y = uz * vx - ux * vz
+    normal_z = ux * vy - uy * vx
+
+    valid = np.abs(normal_z) > 0
+    normal_z = np.where(valid, normal_z, 1.0)
+
+    a = -normal_x / normal_z
+    b = -normal_y / normal_z
+    plane = np.stack([a, b, -np.ones_like(a), z0 - a * x0 - b * y0], axis=1)
+
+    weights = np.where(valid, np.abs(normal_z) / 2, 0.0)
+
+    quadrics = np.empty((x.size, len(_QUADRIC_TERMS)))
+    for k, (i, j) in enumerate(_QUADRIC_TERMS):
+        face_terms = np.repeat(weights * plane[:, i] * plane[:, j], 3)
+        quadrics[:, k] = np.bincount(triangles.ravel(), weights=face_terms, minlength=x.size)
+
+    return quadrics
+
+
+def _quadric_errors(quadrics: np.ndarray, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """Evaluates `v^T Q v` for points `v = (x, y, z, 1)`."""
+    point = [x, y, z, np.ones_like(x)]
+
+    errors = np.zeros(x.size)
+    for k, (i, j) in enumerate(_QUADRIC_TERMS):
+        errors += (1 if i == j else 2) * quadrics[:, k] * point[i] * point[j]
+
+    return errors
+
+
+class _Stars:
+    """Triangles adjacent to each vertex, stored as triangle indices grouped by vertex."""
+
+    def __init__(self, triangles: np.ndarray, vertex_count: int) -> None:
+        self.triangles = triangles
+
+        vertices = triangles.ravel()
+        self.counts = np.bincount(vertices, minlength=vertex_count)
+        self.starts = np.cumsum(self.counts) - self.counts
+        self.triangle_indices = np.argsort(vertices, kind="stable") // 3
+
+    def of(self, vertices: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """Triangles adjacent to given vertices and positions of the vertices they belong to."""
+        counts = self.counts[vertices]
+        positions = np.repeat(self.starts[vertices] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+        return np.repeat(np.arange(vertices.size), counts), self.triangles[self.triangle_indices[positions]]
+
+
+class _Decimation:
+    """State of the decimation: coordinates, remaining triangles and per-vertex quadrics and error bounds."""
+
+    def __init__(self, mesh: MeshArrays) -> None:
+        # centered coordinates keep the quadrics numerically stable for projected coordinates
+        self.x = mesh.x - mesh.x.mean() if mesh.vertex_count else mesh.x
+        self.y = mesh.y - mesh.y.mean() if mesh.vertex_count else mesh.y
+        self.z = mesh.z - mesh.z.mean() if mesh.vertex_count else mesh.z
+
+        self.triangles = _triangles(mesh.face_vertex_indices())
+
+        self.quadrics = _vertex_quadrics(self.x, self.y, self.z, self.triangles)
+
+        # bound of vertical error of removed vertices lying in triangles adjacent to each vertex
+        self.error_bounds = np.zeros(mesh.vertex_count)
+
+        self.removed = np.zeros(mesh.vertex_count, dtype=bool)
+
+        # vertices without valid collapse, they are checked again only once triangles near them change
+        self.stuck = np.zeros(mesh.vertex_count, dtype=bool)
+
+    def collapse_round(self, max_error: typing.Optional[float], max_collapses: typing.Optional[int]) -> int:
+        """Collapses an independent set of the cheapest valid edges, returns number of collapsed edges."""
+        vertex_count = self.x.size
+        triangles = self.triangles
+
+        edge_starts = triangles.ravel()
+        edge_ends = np.roll(triangles, -1, axis=1).ravel()
+        keys, counts = _sorted_unique(
+            np.minimum(edge_starts, edge_ends) * vertex_count + np.maximum(edge_starts, edge_ends)
+        )
+        edges_u, edges_v = keys // vertex_count, keys % vertex_count
+
+        # vertices on boundary or on non-manifold edges are kept, so the outline of the mesh does not change
+        locked = np.zeros(vertex_count, dtype=bool)
+        locked[edges_u[counts != 2]] = True
+        locked[edges_v[counts != 2]] = True
+
+        # half-edge collapses `a -> b`, vertex `a` is removed and its triangles are attached to `b`
+        a = np.concatenate([edges_u, edges_v])
+        b = np.concatenate([edges_v, edges_u])
+        movable = ~locked[a] & ~self.stuck[a]
+        a, b = a[movable], b[movable]
+
+        if a.size == 0:
+            return 0
+
+        costs = _quadric_errors(self.quadrics[a] + self.quadrics[b], self.x[b], self.y[b], self.z[b])
+
+        order = np.argsort(costs, kind="stable")
+        order = order[np.argsort(a[order], kind="stable")]
+        a, b, costs = a[order], b[order], costs[order]
+
+        group_starts = np.flatnonzero(np.concatenate([[True], a[1:] != a[:-1]]))
+        group_ends = np.append(group_starts[1:], a.size)
+
+        stars = _Stars(triangles, vertex_count)
+
+        # the cheapest valid collapse of each vertex, candidates are checked in the order of their cost
+        chosen = np.full(group_starts.size, -1)
+        chosen_bounds = np.zeros(group_starts.size)
+        candidates = group_starts.copy()
+        pending = np.arange(group_starts.size)
+
+        while pending.size:
+            valid, bounds = self._check_collapses(a[candidates[pending]], b[candidates[pending]], keys, stars)
+
+            if max_error is not None:
+                valid &= bounds <= max_error
+
+            chosen[pending[valid]] = candidates[pending[valid]]
+            chosen_bounds[pending[valid]] = bounds[valid]
+
+            pending = pending[~valid]
+            candidates[pending] += 1
+            pending = pending[candidates[pending] < group_ends[pending]]
+
+        has_collapse = chosen >= 0
+        self.stuck[a[group_starts[~has_collapse]]] = True
+
+        chosen, chosen_bounds = chosen[has_collapse], chosen_bounds[has_collapse]
+        a, b, costs = a[chosen], b[chosen], costs[chosen]
+
+        # collapsed vertices are not adjacent, so that every triangle is changed by at most one collapse
+        ranks = np.full(vertex_count, np.inf)
+        ranks[a] = np.argsort(np.argsort(costs, kind="stable"), kind="stable")
+
+        neighbour_ranks = np.full(vertex_count, np.inf)
+        np.minimum.at(neighbour_ranks, edges_u, ranks[edges_v])
+        np.minimum.at(neighbour_ranks, edges_v, ranks[edges_u])
+
+        selected = ranks[a] < neighbour_ranks[a]
+        a, b, costs, bounds = a[selected], b[selected], costs[selected], chosen_bounds[selected]
+
+        if max_collapses is not None and a.size > max_collapses:
+            cheapest = np.argsort(costs, kind="stable")[:max_collapses]
+            a, b, bounds = a[cheapest], b[cheapest], bounds[cheapest]
+
+        if a.size == 0:
+            return 0
+
+        self._apply_collapses(a, b, bounds)
+
+        return a.size
+
+    def _check_collapses(
+        self, a: np.ndarray, b: np.ndarray, edge_keys: np.ndarray, stars: "_Stars"
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """Checks that each collapse alone keeps the triangulation valid, returns validity and bound of vertical error.
+
+        Edges are given as sorted keys `min(u, v) * vertex_count + max(u, v)`.
+        """
+        vertex_count = self.x.size
+
+        star_collapse, star_triangles = stars.of(a)
+
+        star_a = a[star_collapse]
+        star_b = b[star_collapse]
+        has_b = np.any(star_triangles == star_b[:, np.newaxis], axis=1)
+
+        invalid = np.zeros(a.size, dtype=bool)
+
+        # link condition, vertices adjacent to both `a` and `b` must be opposite to the edge `a b`
+        neighbours = star_triangles[star_triangles != star_a[:, np.newaxis]]
+        neighbour_collapse = np.repeat(star_collapse, 2)
+        other = neighbours != b[neighbour_collapse]
+
+        neighbour_keys, _ = _sorted_unique(neighbour_collapse[other] * vertex_count + neighbours[other])
+        pair_collapse, pair_vertex = neighbour_keys // vertex_count, neighbour_keys % vertex_count
+        pair_b = b[pair_collapse]
+
+        pair_keys = np.minimum(pair_b, pair_vertex) * vertex_count + np.maximum(pair_b, pair_vertex)
+        positions = np.minimum(np.searchsorted(edge_keys, pair_keys), edge_keys.size - 1)
+
+        common = np.bincount(pair_collapse[edge_keys[positions] == pair_keys], minlength=a.size)
+        invalid |= common > np.bincount(star_collapse[has_b], minlength=a.size)
+
+        # moved triangles must keep their orientation and not become degenerate
+        moved = ~has_b
+        moved_collapse = star_collapse[moved]
+        new_triangles = np.where(
+            star_triangles[moved] == star_a[moved][:, np.newaxis], star_b[moved][:, np.newaxis], star_triangles[moved]
+        )
+
+        old_areas = _signed_areas(self.x, self.y, star_triangles[moved])
+        new_areas = _signed_areas(self.x, self.y, new_triangles)
+
+        flipped = new_areas * np.sign(old_areas) <= _AREA_TOLERANCE * np.abs(old_areas)
+        invalid[moved_collapse[flipped]] = True
+
+        # vertical distance of the removed vertex from the new triangle below it
+        px, py, pz = self.x[a[moved_collapse]], self.y[a[moved_collapse]], self.z[a[moved_collapse]]
+        x0, x1, x2 = (self.x[new_triangles[:, i]] for i in range(3))
+        y0, y1, y2 = (self.y[new_triangles[:, i]] for i in range(3))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            w1 = ((px - x0) * (y2 - y0) - (x2 - x0) * (py - y0)) / new_areas
+            w2 = ((x1 - x0) * (py - y0) - (px - x0) * (y1 - y0)) / new_areas
+        w0 = 1 - w1 - w2
+
+        tolerance = 1e-9
+        inside = (w0 >= -tolerance) & (w1 >= -tolerance) & (w2 >= -tolerance) & ~flipped
+
+        heights = w0 * self.z[new_triangles[:, 0]] + w1 * self.z[new_triangles[:, 1]] + w2 * self.z[new_triangles[:, 2]]
+
+        vertex_errors = np.full(a.size, np.inf)
+        np.minimum.at(vertex_errors, moved_collapse[inside], np.abs(pz[inside] - heights[inside]))
+
+        # removed vertices below the star move at most as much as the surface at the collapsed vertex
+        star_bounds = np.zeros(a.size)
+        np.maximum.at(star_bounds, np.repeat(star_collapse, 3), self.error_bounds[star_triangles].ravel())
+
+        bounds = vertex_errors + star_bounds
+
+        return ~invalid & np.isfinite(bounds), bounds
+
+    def _apply_collapses(self, a: np.ndarray, b: np.ndarray, bounds: np.ndarray) -> None:
+        targets = np.arange(self.x.size)
+        targets[a] = b
+
+        bound_of = np.zeros(self.x.size)
+        bound_of[a] = bounds
+
+        # vertices of the changed triangles bound the error of the vertices removed below them
+        star = np.any(targets[self.triangles] != self.triangles, axis=1)
+        star_bounds = np.repeat(np.max(bound_of[self.triangles[star]], axis=1), 3)
+        np.maximum.at(self.error_bounds, self.triangles[star].ravel(), star_bounds)
+
+        np.add.at(self.quadrics, b, self.quadrics[a])
+
+        triangles = targets[self.triangles]
+        degenerate = (
+            (triangles[:, 0] == triangles[:, 1])
+            | (triangles[:, 1] == triangles[:, 2])
+            | (triangles[:, 0] == triangles[:, 2])
+        )
+
+        self.triangles = triangles[~degenerate]
+        self.removed[a] = True
+
+        # collapses near the changed triangles may have become valid
+        changed = np.zeros(self.x.size, dtype=bool)
+        changed[self.triangles[star[~degenerate]]] = True
+        self.stuck[self.triangles[np.any(changed[self.triangles], axis=1)]] = False
+
+
+def decimate(
+    mesh: MeshArrays, target_faces: typing.Optional[int] = None, max_error: typing.Optional[float] = None
+) -> MeshArrays:
+    """Simplifies the TIN by collapsing edges until it has at most `target_faces` faces, without exceeding
+    vertical error `max_error`. At least one of the limits has to be given.
+
+    Edges are collapsed into one of their vertices, so remaining vertices keep their original coordinates.
+    Collapses are ordered by quadric of vertical distances to the original triangles and done in rounds
+    of independent collapses over the arrays. Collapses that would fold triangles over in plan are rejected and
+    vertices on the boundary of the mesh are kept. Vertical error of removed vertices is bounded conservatively.
+
+    Quads are split into triangles. Vertices and faces of the result are numbered 1..N.
+    """
+    if target_faces is None and max_error is None:
+        raise ValueError("Target number of faces or maximal error of decimation is required.")
+
+    decimation = _Decimation(mesh)
+
+    while True:
+        max_collapses = None
+
+        if target_faces is not None:
+            # every collapse of inner vertex removes two triangles
+            max_collapses = math.ceil((decimation.triangles.shape[0] - target_faces) / 2)
+
+            if max_collapses <= 0:
+                break
+
+        if decimation.collapse_round(max_error, max_collapses) == 0:
+            break
+
+    kept = ~decimation.removed
+
+    # vertices not used by any triangle are dropped, same as removed ones
+    kept &= np.bincount(decimation.triangles.ravel(), minlength=kept.size) > 0
+
+    new_indices = np.cumsum(kept) - 1
+    triangles = new_indices[decimation.triangles]
+
+    return MeshArrays(
+        np.arange(1, np.count_nonzero(kept) + 1, dtype=np.int64),
+        mesh.x[kept],
+        mesh.y[kept],
+        mesh.z[kept],
+        np.arange(1, triangles.shape[0] + 1, dtype=np.int64),
+        offset_connectivity(triangles, 1),
+    )
@@ -1,4 +1,3 @@
-import re
 import typing
 import xml.etree.ElementTree as ET
 
@@ -31,7 +30,8 @@ class MeshVertex:
 
         vertex_id = int(element.attrib["id"])
 
-        y, x, z = element.text.split(" ")
+        # exporters may separate values by several spaces or new lines
+        y, x, z = element.text.split()
 
         x = float(x)
         y = float(y)
@@ -42,7 +42,7 @@ class MeshVertex:
     @classmethod
     def from_2dm_line(cls, line: str):
         """Read from 2DM line."""
-        elements = re.split(r"\s", line)
+        elements = line.split()
         return cls(int(elements[1]), float(elements[2]), float(elements[3]), float(elements[4]))
 
 
@@ -82,7 +82,7 @@ class MeshFace:
         """Read from LandXML element."""
 
         face_id = face_id
-        points_ids_text = face_element.text.split(" ")
+        points_ids_text = face_element.text.split()
 
         point_ids: typing.List[int] = []
 
@@ -94,7 +94,7 @@ class MeshFace:
     @classmethod
     def from_2dm_line(cls, line: str):
         """Read from 2DM line."""
-        elements = re.split(r"\s", line)
+        elements = line.split()
 
         if line.startswith("E3T"):
             return cls(int(elements[1]), [int(elements[2]), int(elements[3]), int(elements[4])])
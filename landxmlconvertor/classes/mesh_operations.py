@@ -0,0 +1,405 @@
+import typing
+
+import numpy as np
+
+from .mesh_arrays import NO_VERTEX, MeshArrays, offset_connectivity
+
+# cells of the spatial hash searched for close vertices, the other half of the neighbourhood is covered by symmetry
+_NEIGHBOUR_CELLS = [(0, 0), (1, -1), (1, 0), (1, 1), (0, 1)]
+
+
+def close_vertex_pairs(
+    x: np.ndarray, y: np.ndarray, tolerance: float, z: typing.Optional[np.ndarray] = None
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Finds pairs of vertex indices `(i, j)` with distance at most `tolerance`, each pair is listed once.
+    Distance is planar, or spatial if `z` is given.
+
+    Vertices are hashed into square cells of size `tolerance`, so only vertices in the same and neighbouring cells
+    are compared. Cells are sorted once and all lookups are done in sorted order, which keeps it near-linear.
+    """
+    cells_x = np.floor(x / tolerance).astype(np.int64)
+    cells_y = np.floor(y / tolerance).astype(np.int64)
+
+    # ranks of cell coordinates keep cell keys small regardless of extent of the mesh
+    unique_x, ranks_x = np.unique(cells_x, return_inverse=True)
+    unique_y, ranks_y = np.unique(cells_y, return_inverse=True)
+
+    keys = ranks_x * unique_y.size + ranks_y
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    cells_x, cells_y = cells_x[order], cells_y[order]
+    ranks_x, ranks_y = ranks_x[order], ranks_y[order]
+    x, y = x[order], y[order]
+    z = z[order] if z is not None else np.zeros_like(x)
+
+    indices = np.arange(order.size)
+
+    pairs_i: typing.List[np.ndarray] = []
+    pairs_j: typing.List[np.ndarray] = []
+
+    for dx, dy in _NEIGHBOUR_CELLS:
+        neighbour_ranks_x = np.minimum(ranks_x + dx, unique_x.size - 1)
+        neighbour_ranks_y = np.clip(ranks_y + dy, 0, unique_y.size - 1)
+        exists = (unique_x[neighbour_ranks_x] == cells_x + dx) & (unique_y[neighbour_ranks_y] == cells_y + dy)
+
+        neighbour_keys = neighbour_ranks_x * unique_y.size + neighbour_ranks_y
+        starts = np.searchsorted(sorted_keys, neighbour_keys, side="left")
+        counts = np.where(exists, np.searchsorted(sorted_keys, neighbour_keys, side="right") - starts, 0)
+
+        # every vertex paired with all vertices of the neighbouring cell
+        i = np.repeat(indices, counts)
+        j = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+
+        if (dx, dy) == (0, 0):
+            same_cell = i < j
+            i, j = i[same_cell], j[same_cell]
+
+        close = (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 + (z[i] - z[j]) ** 2 <= tolerance * tolerance
+
+        pairs_i.append(i[close])
+        pairs_j.append(j[close])
+
+    return order[np.concatenate(pairs_i)], order[np.concatenate(pairs_j)]
+
+
+def _cluster_labels(size: int, pairs_i: np.ndarray, pairs_j: np.ndarray) -> np.ndarray:
+    """Labels connected groups of paired items by the lowest index in the group."""
+    labels = np.arange(size)
+
+    while True:
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, pairs_i, labels[pairs_j])
+        np.minimum.at(new_labels, pairs_j, labels[pairs_i])
+
+        # pointer jumping, labels point directly to the lowest index found so far
+        new_labels = new_labels[new_labels]
+
+        if np.array_equal(new_labels, labels):
+            return labels
+
+        labels = new_labels
+
+
+def _collapse_faces(faces: np.ndarray) -> np.ndarray:
+    """Removes repeated vertices from faces. Quads with one repeated corner become triangles,
+    faces with less than 3 distinct vertices are marked by `NO_VERTEX` in the first column."""
+    faces = faces.copy()
+
+    if faces.shape[1] == 4:
+        quads = faces[:, 3] != NO_VERTEX
+        repeated = (faces == np.roll(faces, -1, axis=1)) & quads[:, np.newaxis]
+
+        # quad with a single pair of adjacent repeated corners, drop the repeated corner
+        to_triangle = np.count_nonzero(repeated, axis=1) == 1
+        kept = ~repeated[to_triangle]
+        faces[to_triangle, :3] = faces[to_triangle][kept].reshape(-1, 3)
+        faces[to_triangle, 3] = NO_VERTEX
+
+    triangles = faces[:, :3]
+    degenerate = (
+        (triangles[:, 0] == triangles[:, 1])
+        | (triangles[:, 1] == triangles[:, 2])
+        | (triangles[:, 0] == triangles[:, 2])
+    )
+
+    if faces.shape[1] == 4:
+        quads = faces[:, 3] != NO_VERTEX
+        degenerate |= quads & (
+            (faces[:, 3] == faces[:, 0]) | (faces[:, 3] == faces[:, 1]) | (faces[:, 3] == faces[:, 2])
+        )
+
+    faces[degenerate, 0] = NO_VERTEX
+
+    return faces
+
+
+def weld_vertices(mesh: MeshArrays, tolerance: float) -> MeshArrays:
+    """Merges vertices closer than `tolerance` in space, faces are rewritten to the surviving vertices.
+    Vertices at the same position in plan but with different elevations are kept apart.
+
+    Of each group of close vertices the first one survives with its coordinates. Groups are transitive, so chains
+    of close vertices are merged into one. Faces that collapse to less than 3 distinct vertices are removed.
+    Vertices and faces of the result are numbered 1..N.
+    """
+    if tolerance <= 0 or mesh.vertex_count == 0:
+        return mesh
+
+    pairs_i, pairs_j = close_vertex_pairs(mesh.x, mesh.y, tolerance, mesh.z)
+
+    if pairs_i.size == 0:
+        return mesh
+
+    labels = _cluster_labels(mesh.vertex_count, pairs_i, pairs_j)
+
+    survivors = labels == np.arange(mesh.vertex_count)
+    new_indices = np.cumsum(survivors) - 1
+
+    indices = mesh.face_vertex_indices()
+    used = indices != NO_VERTEX
+    indices[used] = new_indices[labels[indices[used]]]
+
+    indices = _collapse_faces(indices)
+    indices = indices[indices[:, 0] != NO_VERTEX]
+
+    return MeshArrays(
+        np.arange(1, np.count_nonzero(survivors) + 1, dtype=np.int64),
+        mesh.x[survivors],
+        mesh.y[survivors],
+        mesh.z[survivors],
+        np.arange(1, indices.shape[0] + 1, dtype=np.int64),
+        offset_connectivity(indices, 1),
+    )
+
+
+# number of elements of the intermediate arrays when faces are tested against polygon edges
+_POLYGON_TEST_SIZE = 4_000_000
+
+Extent = typing.Tuple[float, float, float, float]
+
+
+def _face_corners(mesh: MeshArrays) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Coordinates of face corners with shape (faces, corners), triangles in quad mesh repeat their first corner."""
+    indices = mesh.face_vertex_indices()
+    indices = np.where(indices == NO_VERTEX, indices[:, :1], indices)
+
+    return mesh.x[indices], mesh.y[indices]
+
+
+def _cross(ax: np.ndarray, ay: np.ndarray, bx: np.ndarray, by: np.ndarray) -> np.ndarray:
+    return ax * by - ay * bx
+
+
+def _points_in_faces(px: float, py: float, fx: np.ndarray, fy: np.ndarray) -> np.ndarray:
+    """Checks if the point is inside or on the boundary of each convex face."""
+    orientation = np.sign(np.sum(_cross(fx, fy, np.roll(fx, -1, axis=1), np.roll(fy, -1, axis=1)), axis=1))
+
+    sides = orientation[:, np.newaxis] * _cross(
+        np.roll(fx, -1, axis=1) - fx, np.roll(fy, -1, axis=1) - fy, px - fx, py - fy
+    )
+
+    return np.all(sides >= 0, axis=1) & (orientation != 0)
+
+
+class ClipArea:
+    """Area to which meshes are clipped, rectangular extent optionally combined with polygons.
+
+    Each polygon is a list of rings given as arrays of (x, y) coordinates, the first ring is the exterior and the
+    others are holes. A face is kept if it intersects the extent and, if polygons are given, any of the polygons.
+    Faces are expected to be convex, as triangles and quads of TIN surfaces are.
+    """
+
+    def __init__(
+        self,
+        extent: typing.Optional[Extent] = None,
+        polygons: typing.Optional[typing.Sequence[typing.Sequence[np.ndarray]]] = None,
+    ) -> None:
+        self.polygons = [
+            [np.asarray(ring, dtype=np.float64).reshape(-1, 2) for ring in polygon] for polygon in polygons or []
+        ]
+        self.polygons = [polygon for polygon in self.polygons if polygon and polygon[0].shape[0] >= 3]
+
+        if extent is None:
+            if not self.polygons:
+                raise ValueError("Clip area needs extent or polygons.")
+
+            exteriors = np.concatenate([polygon[0] for polygon in self.polygons])
+            extent = (*exteriors.min(axis=0).tolist(), *exteriors.max(axis=0).tolist())
+
+        self.extent: Extent = tuple(float(x) for x in extent)
+
+    def _key(self) -> typing.Tuple[typing.Any, ...]:
+        return self.extent, tuple(tuple(ring.tobytes() for ring in polygon) for polygon in self.polygons)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ClipArea) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return f"ClipArea({self.extent}, {len(self.polygons)} polygons)"
+
+    def face_mask(self, mesh: MeshArrays) -> np.ndarray:
+        """Marks faces of the mesh that intersect the area."""
+        fx, fy = _face_corners(mesh)
+
+        mask = self._intersects_extent(fx, fy)
+
+        if self.polygons:
+            candidates = np.flatnonzero(mask)
+            mask[candidates] = self._intersects_polygons(fx[candidates], fy[candidates])
+
+        return mask
+
+    def _intersects_extent(self, fx: np.ndarray, fy: np.ndarray) -> np.ndarray:
+        """Exact test of convex faces against the rectangle, by separating axes of the rectangle and the faces."""
+        xmin, ymin, xmax, ymax = self.extent
+
+        mask = (fx.min(axis=1) <= xmax) & (fx.max(axis=1) >= xmin) & (fy.min(axis=1) <= ymax) & (fy.max(axis=1) >= ymin)
+
+        edges_x = np.roll(fx, -1, axis=1) - fx
+        edges_y = np.roll(fy, -1, axis=1) - fy
+        orientation = np.sign(np.sum(_cross(fx, fy, np.roll(fx, -1, axis=1), np.roll(fy, -1, axis=1)), axis=1))
+
+        # edge of the face separates it from the rectangle if all corners of the rectangle lie outside of it
+        outside = np.ones(fx.shape, dtype=bool)
+        for corner_x, corner_y in [(xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax)]:
+            outside &= orientation[:, np.newaxis] * _cross(edges_x, edges_y, corner_x - fx, corner_y - fy) < 0
+
+        return mask & ~np.any(outside, axis=1)
+
+    def _intersects_polygons(self, fx: np.ndarray, fy: np.ndarray) -> np.ndarray:
+        mask = np.zeros(fx.shape[0], dtype=bool)
+
+        for polygon in self.polygons:
+            rest = np.flatnonzero(~mask)
+
+            # corner of the face inside the polygon
+            corners_inside = _points_in_rings(fx[rest].ravel(), fy[rest].ravel(), polygon).reshape(-1, fx.shape[1])
+            mask[rest] = np.any(corners_inside, axis=1)
+
+            # polygon inside the face
+            rest = np.flatnonzero(~mask)
+            mask[rest] = _points_in_faces(polygon[0][0, 0], polygon[0][0, 1], fx[rest], fy[rest])
+
+            # edges crossing
+            rest = np.flatnonzero(~mask)
+            mask[rest] = _edges_cross_rings(fx[rest], fy[rest], polygon)
+
+        return mask
+
+    def clip(self, mesh: MeshArrays) -> MeshArrays:
+        """Keeps faces intersecting the area and the vertices they reference, ids are kept."""
+        mask = self.face_mask(mesh)
+
+        return drop_unreferenced_vertices(
+            MeshArrays(mesh.vertex_ids, mesh.x, mesh.y, mesh.z, mesh.face_ids[mask], mesh.faces[mask])
+        )
+
+
+def _ring_edges(rings: typing.Sequence[np.ndarray]) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Start and end coordinates of edges of all rings, rings are closed if they are not already."""
+    starts = np.concatenate(rings)
+    ends = np.concatenate([np.roll(ring, -1, axis=0) for ring in rings])
+
+    return starts[:, 0], starts[:, 1], ends[:, 0], ends[:, 1]
+
+
+def _points_in_rings(px: np.ndarray, py: np.ndarray, rings: typing.Sequence[np.ndarray]) -> np.ndarray:
+    """Even-odd test of points against rings of the polygon, points in holes are outside."""
+    x0, y0, x1, y1 = _ring_edges(rings)
+
+    inside = np.zeros(px.size, dtype=bool)
+    step = max(1, _POLYGON_TEST_SIZE // x0.size)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, px.size, step):
+            x = px[start : start + step, np.newaxis]
+            y = py[start : start + step, np.newaxis]
+
+            crosses = ((y0 > y) != (y1 > y)) & (x < (x1 - x0) * (y - y0) / (y1 - y0) + x0)
+            inside[start : start + step] = np.count_nonzero(crosses, axis=1) % 2 == 1
+
+    return inside
+
+
+def _edges_cross_rings(fx: np.ndarray, fy: np.ndarray, rings: typing.Sequence[np.ndarray]) -> np.ndarray:
+    """Checks if any edge of each face intersects any edge of the rings."""
+    x0, y0, x1, y1 = _ring_edges(rings)
+
+    corners = fx.shape[1]
+    ax, ay = fx.ravel(), fy.ravel()
+    bx, by = np.roll(fx, -1, axis=1).ravel(), np.roll(fy, -1, axis=1).ravel()
+
+    crossing = np.zeros(ax.size, dtype=bool)
+    step = max(corners, _POLYGON_TEST_SIZE // x0.size // corners * corners)
+
+    for start in range(0, ax.size, step):
+        part = slice(start, start + step)
+        a_x, a_y = ax[part, np.newaxis], ay[part, np.newaxis]
+        b_x, b_y = bx[part, np.newaxis], by[part, np.newaxis]
+
+        overlap = (
+            (np.minimum(a_x, b_x) <= np.maximum(x0, x1))
+            & (np.maximum(a_x, b_x) >= np.minimum(x0, x1))
+            & (np.minimum(a_y, b_y) <= np.maximum(y0, y1))
+            & (np.maximum(a_y, b_y) >= np.minimum(y0, y1))
+        )
+
+        # endpoints of each segment on different sides of the other one
+        sides_ring = _cross(b_x - a_x, b_y - a_y, x0 - a_x, y0 - a_y) * _cross(b_x - a_x, b_y - a_y, x1 - a_x, y1 - a_y)
+        sides_face = _cross(x1 - x0, y1 - y0, a_x - x0, a_y - y0) * _cross(x1 - x0, y1 - y0, b_x - x0, b_y - y0)
+
+        crossing[part] = np.any(overlap & (sides_ring <= 0) & (sides_face <= 0), axis=1)
+
+    return np.any(crossing.reshape(-1, corners), axis=1)
+
+
+def drop_unreferenced_vertices(mesh: MeshArrays) -> MeshArrays:
+    """Removes vertices not referenced by any face, ids of vertices and faces are kept."""
+    indices = mesh.face_vertex_indices()
+
+    referenced = np.zeros(mesh.vertex_count, dtype=bool)
+    referenced[indices[indices != NO_VERTEX]] = True
+
+    if np.all(referenced):
+        return mesh
+
+    return MeshArrays(
+        mesh.vertex_ids[referenced],
+        mesh.x[referenced],
+        mesh.y[referenced],
+        mesh.z[referenced],
+        mesh.face_ids,
+        mesh.faces,
+    )
+
+
+def _face_areas(x: np.ndarray, y: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Planar areas of faces given by vertex indices, computed by shoelace formula over their corners."""
+    indices = np.where(indices == NO_VERTEX, indices[:, :1], indices)
+    fx, fy = x[indices], y[indices]
+
+    return np.abs(np.sum(_cross(fx, fy, np.roll(fx, -1, axis=1), np.roll(fy, -1, axis=1)), axis=1)) / 2
+
+
+def compact_mesh(mesh: MeshArrays, min_area: float = 0) -> MeshArrays:
+    """Removes faces with repeated vertices, faces with planar area at most `min_area`, duplicate faces
+    and vertices not referenced by any face.
+
+    Faces are duplicate if they use the same vertices, regardless of their order, the first of them is kept.
+    Quads with one repeated corner become triangles. Vertices and faces of the result are numbered 1..N
+    in their original order.
+    """
+    indices = _collapse_faces(mesh.face_vertex_indices())
+    keep = indices[:, 0] != NO_VERTEX
+
+    keep[keep] = _face_areas(mesh.x, mesh.y, indices[keep]) > min_area
+
+    # padding sorts first, so triangles and quads never match
+    _, first = np.unique(np.sort(indices[keep], axis=1), axis=0, return_index=True)
+    unique = np.zeros(np.count_nonzero(keep), dtype=bool)
+    unique[first] = True
+    keep[keep] = unique
+
+    indices = indices[keep]
+
+    if indices.shape[1] == 4 and np.all(indices[:, 3] == NO_VERTEX):
+        indices = indices[:, :3]
+
+    referenced = np.zeros(mesh.vertex_count, dtype=bool)
+    referenced[indices[indices != NO_VERTEX]] = True
+
+    new_indices = np.cumsum(referenced) - 1
+    used = indices != NO_VERTEX
+    indices[used] = new_indices[indices[used]]
+
+    return MeshArrays(
+        np.arange(1, np.count_nonzero(referenced) + 1, dtype=np.int64),
+        mesh.x[referenced],
+        mesh.y[referenced],
+        mesh.z[referenced],
+        np.arange(1, indices.shape[0] + 1, dtype=np.int64),
+        offset_connectivity(indices, 1),
+    )
@@ -0,0 +1,104 @@
+import abc
+import bisect
+import typing
+
+from .mesh_arrays import NO_VERTEX, MeshArrays
+from .mesh_elements import MeshFace, MeshVertex
+
+# number of elements converted from arrays to Python objects at once while iterating
+ITERATION_CHUNK_SIZE = 65_536
+
+
+class _MeshArraysView(typing.Sequence, abc.ABC):
+    """Read-only sequence over one or more `MeshArrays`, elements keep the ids stored in the arrays.
+
+    Creating the view is cheap, no element is copied, elements are created only when accessed.
+    """
+
+    def __init__(self, parts: typing.Sequence[MeshArrays]) -> None:
+        self.parts = list(parts)
+
+        self._starts = [0]
+        for mesh_arrays in self.parts:
+            self._starts.append(self._starts[-1] + self._part_length(mesh_arrays))
+
+    @staticmethod
+    @abc.abstractmethod
+    def _part_length(mesh_arrays: MeshArrays) -> int:
+        """Number of elements in one part."""
+
+    @abc.abstractmethod
+    def _element(self, mesh_arrays: MeshArrays, index: int):
+        """Element at `index` of one part."""
+
+    @abc.abstractmethod
+    def _iterate_part(self, mesh_arrays: MeshArrays, start: int, end: int) -> typing.Iterator:
+        """Iterate elements `start` to `end` of one part."""
+
+    def __len__(self) -> int:
+        return self._starts[-1]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+
+        if index < 0 or index >= len(self):
+            raise IndexError(f"{type(self).__name__} index out of range")
+
+        part_number = bisect.bisect_right(self._starts, index) - 1
+        return self._element(self.parts[part_number], index - self._starts[part_number])
+
+    def __iter__(self) -> typing.Iterator:
+        for mesh_arrays in self.parts:
+            length = self._part_length(mesh_arrays)
+            for start in range(0, length, ITERATION_CHUNK_SIZE):
+                yield from self._iterate_part(mesh_arrays, start, min(start + ITERATION_CHUNK_SIZE, length))
+
+
+class MeshVerticesView(_MeshArraysView):
+    """Read-only view of vertices as `MeshVertex` objects."""
+
+    @staticmethod
+    def _part_length(mesh_arrays: MeshArrays) -> int:
+        return mesh_arrays.vertex_count
+
+    def _element(self, mesh_arrays: MeshArrays, index: int) -> MeshVertex:
+        return MeshVertex(
+            int(mesh_arrays.vertex_ids[index]),
+            float(mesh_arrays.x[index]),
+            float(mesh_arrays.y[index]),
+            float(mesh_arrays.z[index]),
+        )
+
+    def _iterate_part(self, mesh_arrays: MeshArrays, start: int, end: int) -> typing.Iterator[MeshVertex]:
+        return map(
+            MeshVertex,
+            mesh_arrays.vertex_ids[start:end].tolist(),
+            mesh_arrays.x[start:end].tolist(),
+            mesh_arrays.y[start:end].tolist(),
+            mesh_arrays.z[start:end].tolist(),
+        )
+
+
+class MeshFacesView(_MeshArraysView):
+    """Read-only view of faces as `MeshFace` objects."""
+
+    @staticmethod
+    def _part_length(mesh_arrays: MeshArrays) -> int:
+        return mesh_arrays.face_count
+
+    def _element(self, mesh_arrays: MeshArrays, index: int) -> MeshFace:
+        return MeshFace(
+            int(mesh_arrays.face_ids[index]),
+            [x for x in mesh_arrays.faces[index].tolist() if x != NO_VERTEX],
+        )
+
+    def _iterate_part(self, mesh_arrays: MeshArrays, start: int, end: int) -> typing.Iterator[MeshFace]:
+        return map(
+            MeshFace,
+            mesh_arrays.face_ids[start:end].tolist(),
+            ([x for x in vertex_ids if x != NO_VERTEX] for vertex_ids in mesh_arrays.faces[start:end].tolist()),
+        )
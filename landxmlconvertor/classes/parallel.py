@@ -0,0 +1,215 @@
+import csv
+import os
+import time
+import typing
+
+from .landxml_io import landxml_base_name
+from .landxml_reader import LandXMLReader
+from .mesh2dm_writer import Mesh2DMWriter
+from .mesh_arrays import MeshArrays
+from .mesh_operations import weld_vertices
+
+SUMMARY_COLUMNS = (
+    "file",
+    "status",
+    "surfaces",
+    "vertices",
+    "faces",
+    "parse_s",
+    "write_s",
+    "total_s",
+    "mesh_files",
+    "error",
+)
+
+
+class ConversionTask:
+    """Conversion of single LandXML file into meshes in `output_folder`, sent to worker process.
+
+    Merged surfaces are written into `<output name>.<suffix>`, otherwise each surface is written into
+    `<output name>/<surface name>.<suffix>`, so that surfaces of the same name in different files do not collide.
+    Output name defaults to the file name without extension, see `output_names` for names unique within a batch.
+    """
+
+    def __init__(
+        self,
+        landxml_file: str,
+        output_folder: str,
+        mesh_driver: str = "2DM",
+        mesh_suffix: str = "2dm",
+        merge_surfaces: bool = False,
+        weld_tolerance: float = 0,
+        output_name: typing.Optional[str] = None,
+    ) -> None:
+        self.landxml_file = landxml_file
+        self.output_folder = output_folder
+        self.mesh_driver = mesh_driver
+        self.mesh_suffix = mesh_suffix
+        self.merge_surfaces = merge_surfaces
+        self.weld_tolerance = weld_tolerance
+        self.output_name = output_name
+
+    def mesh_file(self, name: str) -> str:
+        file_name = name if name.lower().endswith(f".{self.mesh_suffix.lower()}") else f"{name}.{self.mesh_suffix}"
+
+        if self.merge_surfaces:
+            return os.path.join(self.output_folder, file_name)
+
+        return os.path.join(self.output_folder, self.base_name, file_name)
+
+    @property
+    def base_name(self) -> str:
+        return self.output_name or landxml_base_name(os.path.basename(self.landxml_file))
+
+
+def output_names(landxml_files: typing.Sequence[str], input_folder: typing.Optional[str] = None) -> typing.List[str]:
+    """Output names of the files that do not collide in the output folder.
+
+    Files inside `input_folder` keep their subfolders relative to it, other files use their file name. Names that
+    still repeat, e.g. `a.xml` and `a.xml.gz`, get suffix `_2`, `_3`, ... Names are compared case-insensitively.
+    """
+    folder = os.path.abspath(input_folder) if input_folder else None
+
+    names = []
+    used: typing.Set[str] = set()
+
+    for landxml_file in landxml_files:
+        path = os.path.abspath(landxml_file)
+
+        if folder and os.path.commonpath([folder, path]) == folder:
+            relative_path = os.path.relpath(path, folder)
+            name = os.path.join(os.path.dirname(relative_path), landxml_base_name(os.path.basename(relative_path)))
+        else:
+            name = landxml_base_name(os.path.basename(path))
+
+        unique_name = name
+        number = 1
+        while os.path.normcase(unique_name).lower() in used:
+            number += 1
+            unique_name = f"{name}_{number}"
+
+        used.add(os.path.normcase(unique_name).lower())
+        names.append(unique_name)
+
+    return names
+
+
+class ConversionResult:
+    """Counts, timings and written files of single conversion, `error` is set if the conversion failed.
+    `canceled` is set if the conversion was not started because the batch was canceled.
+
+    Meshes of formats other than 2DM are not written by the worker, they are returned in `meshes` as
+    `(mesh file, name, arrays)` to be written with MDAL drivers by the calling process.
+    """
+
+    def __init__(self, landxml_file: str) -> None:
+        self.landxml_file = landxml_file
+
+        self.surfaces = 0
+        self.vertices = 0
+        self.faces = 0
+
+        self.parse_time = 0.0
+        self.write_time = 0.0
+        self.total_time = 0.0
+
+        self.crs_attributes: typing.Optional[typing.Dict[str, str]] = None
+
+        self.mesh_files: typing.List[str] = []
+        self.meshes: typing.List[typing.Tuple[str, str, MeshArrays]] = []
+
+        self.error: typing.Optional[str] = None
+        self.canceled = False
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None and not self.canceled
+
+    @property
+    def status(self) -> str:
+        if self.canceled:
+            return "canceled"
+        return "ok" if self.succeeded else "failed"
+
+    def summary_row(self) -> typing.Dict[str, typing.Any]:
+        return {
+            "file": self.landxml_file,
+            "status": self.status,
+            "surfaces": self.surfaces,
+            "vertices": self.vertices,
+            "faces": self.faces,
+            "parse_s": round(self.parse_time, 3),
+            "write_s": round(self.write_time, 3),
+            "total_s": round(self.total_time, 3),
+            "mesh_files": ";".join(self.mesh_files),
+            "error": self.error or "",
+        }
+
+
+def convert_landxml_file(task: ConversionTask) -> ConversionResult:
+    """Parses the LandXML file and writes its meshes if they are 2DM, runs in worker process.
+
+    Errors are not raised but stored in the result, so that failure of one file does not stop the others.
+    """
+    result = ConversionResult(task.landxml_file)
+
+    start = time.perf_counter()
+
+    try:
+        land_xml = LandXMLReader(task.landxml_file, streaming=True)
+
+        result.parse_time = time.perf_counter() - start
+        result.crs_attributes = land_xml.crs_attributes
+
+        surfaces = [x for x in land_xml.surfaces if not x.empty()]
+        result.surfaces = len(surfaces)
+
+        if not surfaces:
+            raise ValueError("No surfaces with vertices and faces in the LandXML file.")
+
+        if task.merge_surfaces:
+            mesh_arrays = MeshArrays.concatenate(MeshArrays.renumber_consecutively([x.arrays() for x in surfaces]))
+
+            if task.weld_tolerance > 0:
+                mesh_arrays = weld_vertices(mesh_arrays, task.weld_tolerance)
+
+            meshes = [(task.mesh_file(task.base_name), os.path.basename(task.base_name), mesh_arrays)]
+        else:
+            meshes = [(task.mesh_file(x.name), x.name, x.arrays()) for x in surfaces]
+
+        result.vertices = sum([x.vertex_count for _, _, x in meshes])
+        result.faces = sum([x.face_count for _, _, x in meshes])
+
+        if task.mesh_driver == "2DM":
+            write_start = time.perf_counter()
+
+            for mesh_file, _, mesh_arrays in meshes:
+                os.makedirs(os.path.dirname(mesh_file), exist_ok=True)
+                Mesh2DMWriter.from_mesh_arrays(mesh_arrays).write(mesh_file)
+                result.mesh_files.append(mesh_file)
+
+            result.write_time = time.perf_counter() - write_start
+        else:
+            result.meshes = meshes
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+
+    result.total_time = time.perf_counter() - start
+
+    return result
+
+
+def write_2dm_file(mesh_file: str, mesh_arrays: MeshArrays) -> str:
+    """Writes the mesh into 2DM file, runs in worker process. Returns the written file."""
+    Mesh2DMWriter.from_mesh_arrays(mesh_arrays).write(mesh_file)
+    return mesh_file
+
+
+def write_summary(file_name: str, results: typing.Iterable[ConversionResult]) -> None:
+    """Writes CSV table with one row of counts and timings per converted file."""
+    with open(file_name, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+
+        for result in results:
+            writer.writerow(result.summary_row())
@@ -0,0 +1,29 @@
+import concurrent.futures
+import multiprocessing
+import os
+import sys
+
+
+def python_executable() -> str:
+    """Python interpreter for worker processes.
+
+    Embedded Python (e.g. QGIS on Windows) has the application as `sys.executable`, in that case interpreter
+    from `sys.exec_prefix` is used.
+    """
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return sys.executable
+
+    for name in ("python.exe", "python3.exe", os.path.join("bin", "python3")):
+        candidate = os.path.join(sys.exec_prefix, name)
+        if os.path.isfile(candidate):
+            return candidate
+
+    return sys.executable
+
+
+def process_pool(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    """Pool of `workers` processes started by `spawn`, forking the process of the application is not safe."""
+    context = multiprocessing.get_context("spawn")
+    context.set_executable(python_executable())
+
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context)
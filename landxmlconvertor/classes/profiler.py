@@ -0,0 +1,107 @@
+import contextlib
+import json
+import time
+import tracemalloc
+import typing
+
+from qgis.core import QgsProcessingFeedback
+
+
+class StageProfile:
+    """Wall time, peak memory and numbers of processed elements of one stage of the processing."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.time = 0.0
+        # memory allocated above the memory at the start of the stage, `None` if memory is not traced
+        self.peak_memory: typing.Optional[int] = None
+        self.counts: typing.Dict[str, int] = {}
+
+    def as_dict(self) -> typing.Dict[str, typing.Any]:
+        return {"name": self.name, "time": self.time, "peak_memory": self.peak_memory, "counts": dict(self.counts)}
+
+    def __str__(self) -> str:
+        text = f"{self.name}: {self.time:.3f} s"
+
+        if self.peak_memory is not None:
+            text += f", peak memory {self.peak_memory / 1024 / 1024:.1f} MiB"
+
+        if self.counts:
+            text += ", " + ", ".join([f"{key} {value}" for key, value in self.counts.items()])
+
+        return text
+
+
+class Profiler:
+    """Measures stages of the processing and reports them to feedback as soon as each stage finishes.
+
+    Memory is traced by `tracemalloc` only if `trace_memory` is set, as tracing slows down parsing considerably.
+    Memory allocated by QGIS and MDAL outside of Python is not traced. Stages can be nested, peak memory of a stage
+    includes peaks of its inner stages.
+    """
+
+    def __init__(self, feedback: typing.Optional[QgsProcessingFeedback] = None, trace_memory: bool = False) -> None:
+        self.feedback = feedback
+        self.trace_memory = trace_memory
+
+        self.stages: typing.List[StageProfile] = []
+
+        # highest traced memory of open stages seen before the peak was last reset, innermost stage last
+        self._peaks: typing.List[int] = []
+
+        self._start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> typing.Iterator[StageProfile]:
+        """Measures the code in `with` block as a stage, counts of processed elements can be set on yielded profile."""
+        profile = StageProfile(name)
+
+        started_tracing = False
+        start_memory = 0
+
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                # peak is reset for this stage, it is kept for the enclosing stages first
+                _, peak_memory = tracemalloc.get_traced_memory()
+                self._peaks = [max(x, peak_memory) for x in self._peaks]
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started_tracing = True
+
+            start_memory, _ = tracemalloc.get_traced_memory()
+            self._peaks.append(start_memory)
+
+        start = time.perf_counter()
+
+        try:
+            yield profile
+        finally:
+            profile.time = time.perf_counter() - start
+
+            if self.trace_memory:
+                _, peak_memory = tracemalloc.get_traced_memory()
+                peak_memory = max(peak_memory, self._peaks.pop())
+                profile.peak_memory = peak_memory - start_memory
+
+                self._peaks = [max(x, peak_memory) for x in self._peaks]
+
+                if started_tracing:
+                    tracemalloc.stop()
+
+            self.stages.append(profile)
+
+        if self.feedback is not None:
+            self.feedback.pushInfo(str(profile))
+
+    @property
+    def total_time(self) -> float:
+        return time.perf_counter() - self._start
+
+    def as_dict(self) -> typing.Dict[str, typing.Any]:
+        return {"total_time": self.total_time, "stages": [x.as_dict() for x in self.stages]}
+
+    def write(self, file_name: str, **information: typing.Any) -> None:
+        """Writes the profile as JSON, with additional information about the processing."""
+        with open(file_name, "w", encoding="utf-8") as file:
+            json.dump({**information, **self.as_dict()}, file, indent=4)
@@ -0,0 +1,74 @@
+import typing
+
+from qgis.core import QgsProcessingFeedback
+
+# called with progress in percent, returns `False` if the conversion should stop
+ProgressCallback = typing.Callable[[float], bool]
+
+# number of elements processed between two calls of the progress callback
+POLL_INTERVAL = 10_000
+
+
+class ConversionCanceledError(Exception):
+    """Raised when the conversion is canceled through the progress callback."""
+
+
+class ProgressPoller:
+    """Counts processed elements and calls the progress callback every `interval` elements.
+
+    Progress is the fraction of `total`, which may be number of elements or number of bytes of the file if
+    `position` is given. If the callback returns `False`, `ConversionCanceledError` is raised.
+    """
+
+    def __init__(
+        self,
+        callback: typing.Optional[ProgressCallback],
+        total: float = 0,
+        position: typing.Optional[typing.Callable[[], float]] = None,
+        interval: int = POLL_INTERVAL,
+    ) -> None:
+        self.callback = callback
+        self.total = total
+        self.position = position
+        self.interval = interval
+
+        self.count = 0
+        self._next_poll = interval
+
+    def step(self, count: int = 1) -> None:
+        """Marks `count` elements as processed, polls the callback if the interval is reached."""
+        self.count += count
+
+        if self.count >= self._next_poll:
+            self._next_poll = self.count + self.interval
+            self.poll()
+
+    def poll(self) -> None:
+        if self.callback is None:
+            return
+
+        done = self.position() if self.position is not None else self.count
+        progress = min(100.0, 100.0 * done / self.total) if self.total > 0 else 0.0
+
+        if self.callback(progress) is False:
+            raise ConversionCanceledError("Conversion canceled.")
+
+    def finish(self) -> None:
+        """Reports finished work."""
+        if self.callback is not None and self.callback(100.0) is False:
+            raise ConversionCanceledError("Conversion canceled.")
+
+
+def feedback_progress(feedback: QgsProcessingFeedback, report_progress: bool = True) -> ProgressCallback:
+    """Progress callback that reports progress to feedback and stops the conversion when feedback is canceled.
+
+    Feedback should only receive progress from the thread of the algorithm, other threads check only cancellation.
+    """
+
+    def callback(progress: float) -> bool:
+        if report_progress:
+            feedback.setProgress(progress)
+
+        return not feedback.isCanceled()
+
+    return callback
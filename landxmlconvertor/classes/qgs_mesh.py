@@ -0,0 +1,150 @@
+import itertools
+import os
+import typing
+import uuid
+
+import numpy as np
+from qgis.core import QgsMesh, QgsMeshLayer, QgsProcessingUtils
+
+from .mesh2dm_writer import Mesh2DMWriter
+from .mesh_arrays import NO_VERTEX, MeshArrays
+from .mesh_views import MeshFacesView, MeshVerticesView
+from .profiler import Profiler
+
+
+def mesh_memory_definition(points: MeshVerticesView, faces: MeshFacesView) -> str:
+    """Definition of the mesh for `mesh_memory` provider, vertices as `x, y, z` and faces as 0-based vertex indices."""
+    vertices_lines: typing.List[str] = []
+    faces_lines: typing.List[str] = []
+
+    # faces of each part reference only vertices of the same part
+    index_offset = 0
+
+    for vertices_arrays, faces_arrays in zip(points.parts, faces.parts):
+        vertices_lines.extend(
+            map("{}, {}, {}".format, vertices_arrays.x.tolist(), vertices_arrays.y.tolist(), vertices_arrays.z.tolist())
+        )
+
+        indices = faces_arrays.face_vertex_indices()
+        indices = np.where(indices != NO_VERTEX, indices + index_offset, NO_VERTEX)
+
+        faces_lines.extend(", ".join([str(x) for x in face if x != NO_VERTEX]) for face in indices.tolist())
+
+        index_offset += vertices_arrays.vertex_count
+
+    return "\n".join(vertices_lines) + "\n---\n" + "\n".join(faces_lines)
+
+
+def _mesh_has_elevations(mesh: QgsMesh, points: MeshVerticesView) -> bool:
+    """Checks that the vertices of created mesh carry z values of the source vertices."""
+    if mesh.vertexCount() != len(points):
+        return False
+
+    start = 0
+    for mesh_arrays in points.parts:
+        if mesh_arrays.vertex_count > 0:
+            index = int(np.argmax(np.abs(mesh_arrays.z)))
+            if mesh.vertex(start + index).z() != mesh_arrays.z[index]:
+                return False
+        start += mesh_arrays.vertex_count
+
+    return True
+
+
+def create_qgs_mesh(
+    points: MeshVerticesView,
+    faces: MeshFacesView,
+    profiler: typing.Optional[Profiler] = None,
+    definition: typing.Optional[str] = None,
+) -> QgsMesh:
+    """Creates `QgsMesh` from vertices and faces stored in arrays.
+
+    The vertex and face vectors of `QgsMesh` are not accessible from Python, so the mesh is populated in memory by
+    `mesh_memory` provider. If the provider is not able to keep z values, temporary 2DM file is used instead.
+    `definition` from `mesh_memory_definition` can be given if it was already formatted, e.g. by worker process.
+    """
+    if profiler is None:
+        profiler = Profiler()
+
+    mesh = QgsMesh()
+
+    with profiler.stage("Memory mesh load") as stage:
+        if definition is None:
+            definition = mesh_memory_definition(points, faces)
+
+        memory_layer = QgsMeshLayer(definition, "temp mesh layer", "mesh_memory")
+
+        if memory_layer.isValid():
+            memory_layer.dataProvider().populateMesh(mesh)
+
+        stage.counts = {"vertices": mesh.vertexCount(), "faces": mesh.faceCount()}
+
+    if memory_layer.isValid() and _mesh_has_elevations(mesh, points):
+        return mesh
+
+    mesh = QgsMesh()
+
+    tmp_2dm_file = QgsProcessingUtils.generateTempFilename(f"{uuid.uuid4()}.2dm")
+
+    with profiler.stage("Temporary 2DM write") as stage:
+        Mesh2DMWriter(points, faces).write(tmp_2dm_file)
+        stage.counts = {"vertices": len(points), "faces": len(faces)}
+
+    with profiler.stage("MDAL load") as stage:
+        mesh_layer = QgsMeshLayer(tmp_2dm_file, "temp mesh layer", "mdal")
+        mesh_layer.dataProvider().populateMesh(mesh)
+        stage.counts = {"vertices": mesh.vertexCount(), "faces": mesh.faceCount()}
+
+    del mesh_layer
+
+    try:
+        os.remove(tmp_2dm_file)
+    except OSError:
+        pass
+
+    return mesh
+
+
+def mesh_arrays_from_qgs_mesh(mesh: QgsMesh) -> MeshArrays:
+    """Reads vertices and faces of `QgsMesh` into arrays. Vertices and faces get sequential ids starting at 1.
+
+    Faces with more than 4 vertices (e.g. from UGRID) are not supported by LandXML, they are split into triangles
+    fanned from their first vertex.
+    """
+    vertex_count = mesh.vertexCount()
+    face_count = mesh.faceCount()
+
+    coordinates = np.fromiter(
+        itertools.chain.from_iterable((v.x(), v.y(), v.z()) for v in map(mesh.vertex, range(vertex_count))),
+        dtype=np.float64,
+        count=3 * vertex_count,
+    ).reshape(-1, 3)
+
+    # vertices without z value
+    coordinates[:, 2] = np.nan_to_num(coordinates[:, 2], nan=0.0)
+
+    mesh_faces = []
+    for face in map(mesh.face, range(face_count)):
+        if len(face) <= 4:
+            mesh_faces.append(face)
+        else:
+            mesh_faces.extend([face[0], face[i], face[i + 1]] for i in range(1, len(face) - 1))
+
+    face_count = len(mesh_faces)
+    face_width = max([len(x) for x in mesh_faces], default=3)
+
+    faces = np.full((face_count, face_width), NO_VERTEX, dtype=np.int64)
+    for i, face in enumerate(mesh_faces):
+        faces[i, : len(face)] = face
+
+    # vertex ids start at 1
+    faces[faces != NO_VERTEX] += 1
+
+    return MeshArrays(
+        np.arange(1, vertex_count + 1, dtype=np.int64),
+        coordinates[:, 0],
+        coordinates[:, 1],
+        coordinates[:, 2],
+        np.arange(1, face_count + 1, dtype=np.int64),
+        faces,
+    )
@@ -1,9 +1,18 @@
+import typing
 import xml.etree.ElementTree as ET
 from xml.dom import minidom
 
+from .progress import ProgressPoller
+
 
 class XmlFormatter:
-    """Class for formatting XML."""
+    """Class for formatting XML.
+
+    Besides formatting whole documents through `minidom`, it provides helpers to write indented XML incrementally.
+    The incremental output is identical to `minidom.Document.toprettyxml()`.
+    """
+
+    XML_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>\n'
 
     @staticmethod
     def elementToDocument(element: ET.Element) -> minidom.Document:
@@ -18,3 +27,58 @@ class XmlFormatter:
         text_pretiffied = document.toprettyxml(indent=indent, encoding="utf-8")
 
         return text_pretiffied
+
+    @staticmethod
+    def escape(text: str) -> str:
+        """Escapes text of attribute value or text node, the same way as `minidom` does."""
+        if "&" in text:
+            text = text.replace("&", "&amp;")
+        if "<" in text:
+            text = text.replace("<", "&lt;")
+        if '"' in text:
+            text = text.replace('"', "&quot;")
+        if ">" in text:
+            text = text.replace(">", "&gt;")
+        return text
+
+    @staticmethod
+    def _attributes(attrib: typing.Dict[str, str]) -> str:
+        return "".join([f' {name}="{XmlFormatter.escape(value)}"' for name, value in attrib.items()])
+
+    @staticmethod
+    def startTag(tag: str, attrib: typing.Dict[str, str], level: int, indent: str = "    ") -> str:
+        return f"{indent * level}<{tag}{XmlFormatter._attributes(attrib)}>\n"
+
+    @staticmethod
+    def endTag(tag: str, level: int, indent: str = "    ") -> str:
+        return f"{indent * level}</{tag}>\n"
+
+    @staticmethod
+    def emptyTag(tag: str, attrib: typing.Dict[str, str], level: int, indent: str = "    ") -> str:
+        return f"{indent * level}<{tag}{XmlFormatter._attributes(attrib)}/>\n"
+
+    @staticmethod
+    def elementToPrettyLines(
+        element: ET.Element, level: int = 0, indent: str = "    ", poller: typing.Optional[ProgressPoller] = None
+    ) -> typing.Iterator[str]:
+        """Yields pretty printed lines of the element and its children, without building `minidom` document.
+
+        Every formatted element is counted by `poller`, so long formatting can report progress and be canceled.
+        """
+        if poller is not None:
+            poller.step()
+
+        if len(element) == 0:
+            if element.text:
+                yield (
+                    f"{indent * level}<{element.tag}{XmlFormatter._attributes(element.attrib)}>"
+                    f"{XmlFormatter.escape(element.text)}</{element.tag}>\n"
+                )
+            else:
+                yield XmlFormatter.emptyTag(element.tag, element.attrib, level, indent)
+            return
+
+        yield XmlFormatter.startTag(element.tag, element.attrib, level, indent)
+        for child in element:
+            yield from XmlFormatter.elementToPrettyLines(child, level + 1, indent, poller)
+        yield XmlFormatter.endTag(element.tag, level, indent)
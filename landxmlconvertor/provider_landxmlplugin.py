@@ -1,8 +1,10 @@
 from qgis.core import QgsProcessingProvider
 
 from .text_constants import TextConstants
+from .tool_batch_convert_landxml import BatchConvertLandXML2Mesh
 from .tool_convert_landxml_2_mesh import ConvertLandXML2Mesh
 from .tool_convert_mesh_to_landxml import ConvertMesh2LandXML
+from .tool_inspect_landxml import InspectLandXML
 
 
 class LandXMLConvertorProvider(QgsProcessingProvider):
@@ -13,7 +15,9 @@ class LandXMLConvertorProvider(QgsProcessingProvider):
 
     def loadAlgorithms(self):
         self.addAlgorithm(ConvertLandXML2Mesh())
+        self.addAlgorithm(BatchConvertLandXML2Mesh())
         self.addAlgorithm(ConvertMesh2LandXML())
+        self.addAlgorithm(InspectLandXML())
 
     def id(self):
         return TextConstants.PLUGIN_PROVIDER_ID
@@ -0,0 +1,272 @@
+import concurrent.futures
+import glob
+import os
+import time
+import typing
+
+from qgis.core import (
+    QgsProcessing,
+    QgsProcessingAlgorithm,
+    QgsProcessingContext,
+    QgsProcessingException,
+    QgsProcessingFeedback,
+    QgsProcessingOutputFile,
+    QgsProcessingOutputNumber,
+    QgsProcessingParameterBoolean,
+    QgsProcessingParameterEnum,
+    QgsProcessingParameterFile,
+    QgsProcessingParameterFolderDestination,
+    QgsProcessingParameterMultipleLayers,
+    QgsProcessingParameterNumber,
+    QgsProcessingParameterString,
+)
+
+from .classes.landxml_reader import crs_from_attributes
+from .classes.mesh_views import MeshFacesView, MeshVerticesView
+from .classes.parallel import ConversionResult, ConversionTask, convert_landxml_file, output_names, write_summary
+from .classes.processes import process_pool
+from .classes.qgs_mesh import create_qgs_mesh
+from .tool_convert_landxml_2_mesh import ConvertLandXML2Mesh
+
+
+class BatchConvertLandXML2Mesh(QgsProcessingAlgorithm):
+    INPUT = "INPUT"
+    INPUT_FOLDER = "INPUT_FOLDER"
+    FILE_PATTERN = "FILE_PATTERN"
+    OUTPUT = "OUTPUT"
+    MESH_FORMAT = "MESH_FORMAT"
+    UNION_SURFACES = "UNION_SURFACES"
+    WELD_TOLERANCE = "WELD_TOLERANCE"
+    WORKERS = "WORKERS"
+    SUMMARY_FILE = "SUMMARY_FILE"
+    CONVERTED_COUNT = "CONVERTED_COUNT"
+    FAILED_COUNT = "FAILED_COUNT"
+
+    # drivers are discovered once by the single file algorithm
+    driver_names = ConvertLandXML2Mesh.driver_names
+    driver_suffixes = ConvertLandXML2Mesh.driver_suffixes
+    mdal_provider_meta = ConvertLandXML2Mesh.mdal_provider_meta
+
+    def name(self):
+        return "batchconvertlandxmlsurfacestomeshes"
+
+    def displayName(self):
+        return "Batch Convert LandXML Files to Meshes"
+
+    def createInstance(self):
+        return BatchConvertLandXML2Mesh()
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(
+            QgsProcessingParameterMultipleLayers(
+                self.INPUT, "Input LandXML Files", QgsProcessing.SourceType.TypeFile, optional=True
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFile(
+                self.INPUT_FOLDER,
+                "Input Folder with LandXML Files",
+                behavior=QgsProcessingParameterFile.Behavior.Folder,
+                optional=True,
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterString(
+                self.FILE_PATTERN,
+                "Pattern of files in Input Folder (`**/*.xml` includes subfolders, `*.zip` matches compressed files)",
+                "*.xml",
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.UNION_SURFACES,
+                "Merge Surfaces of each file into single Mesh (this should not be done if the surfaces overlap)",
+                False,
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.WELD_TOLERANCE,
+                "Weld vertices of merged Surfaces closer than this distance (0 - no welding)",
+                QgsProcessingParameterNumber.Type.Double,
+                0,
+                minValue=0,
+            )
+        )
+
+        self.addParameter(QgsProcessingParameterEnum(self.MESH_FORMAT, "Output Format", self.driver_names, False, 0))
+
+        self.addParameter(QgsProcessingParameterFolderDestination(self.OUTPUT, "Output Folder for Mesh files"))
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.WORKERS,
+                "Number of files converted in parallel processes",
+                QgsProcessingParameterNumber.Type.Integer,
+                os.cpu_count() or 1,
+                minValue=1,
+            )
+        )
+
+        self.addOutput(QgsProcessingOutputFile(self.SUMMARY_FILE, "Summary of the conversions"))
+        self.addOutput(QgsProcessingOutputNumber(self.CONVERTED_COUNT, "Number of converted files"))
+        self.addOutput(QgsProcessingOutputNumber(self.FAILED_COUNT, "Number of failed files"))
+
+    def checkParameterValues(
+        self, parameters: typing.Dict[str, typing.Any], context: QgsProcessingContext
+    ) -> typing.Tuple[bool, str]:
+        if not self._landxml_files(parameters, context):
+            return False, "No input LandXML files, select files or folder with files matching the pattern."
+
+        return super().checkParameterValues(parameters, context)
+
+    def _landxml_files(
+        self, parameters: typing.Dict[str, typing.Any], context: QgsProcessingContext
+    ) -> typing.List[str]:
+        """Selected files followed by files in the folder matching the pattern, each file only once."""
+        files = self.parameterAsFileList(parameters, self.INPUT, context)
+
+        folder = self.parameterAsFile(parameters, self.INPUT_FOLDER, context)
+        pattern = self.parameterAsString(parameters, self.FILE_PATTERN, context)
+
+        if folder and pattern:
+            files.extend(sorted(glob.glob(os.path.join(folder, pattern), recursive=True)))
+
+        unique_files = {}
+        for file in files:
+            if os.path.isfile(file):
+                unique_files.setdefault(os.path.abspath(file), file)
+
+        return list(unique_files.values())
+
+    def processAlgorithm(
+        self, parameters: typing.Dict[str, typing.Any], context: QgsProcessingContext, feedback: QgsProcessingFeedback
+    ):
+        landxml_files = self._landxml_files(parameters, context)
+
+        if not landxml_files:
+            raise QgsProcessingException("No input LandXML files.")
+
+        mesh_folder = self.parameterAsString(parameters, self.OUTPUT, context)
+
+        driver_index = self.parameterAsEnum(parameters, self.MESH_FORMAT, context)
+
+        workers = min(self.parameterAsInt(parameters, self.WORKERS, context), len(landxml_files))
+
+        # files of the same name in different subfolders must not write into the same mesh files
+        names = output_names(landxml_files, self.parameterAsFile(parameters, self.INPUT_FOLDER, context))
+
+        tasks = [
+            ConversionTask(
+                landxml_file,
+                mesh_folder,
+                self.driver_names[driver_index],
+                self.driver_suffixes[driver_index],
+                self.parameterAsBoolean(parameters, self.UNION_SURFACES, context),
+                self.parameterAsDouble(parameters, self.WELD_TOLERANCE, context),
+                name,
+            )
+            for landxml_file, name in zip(landxml_files, names)
+        ]
+
+        os.makedirs(mesh_folder, exist_ok=True)
+
+        feedback.pushInfo(f"Converting {len(tasks)} files on {workers} processes.")
+
+        results: typing.List[ConversionResult] = []
+        canceled = False
+
+        # files are parsed and 2DM written by worker processes, other formats are written here by MDAL
+        with process_pool(workers) as executor:
+            futures = {executor.submit(convert_landxml_file, task): task for task in tasks}
+
+            pending = set(futures.keys())
+
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=0.5, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # worker process crashed, e.g. ran out of memory
+                        result = ConversionResult(futures[future].landxml_file)
+                        result.error = f"{type(e).__name__}: {e}"
+
+                    if result.meshes:
+                        self._write_meshes(result, futures[future].mesh_driver)
+
+                    results.append(result)
+
+                    if result.succeeded:
+                        feedback.pushInfo(
+                            f"Converted `{result.landxml_file}`: {result.surfaces} surfaces, "
+                            f"{result.vertices} vertices, {result.faces} faces in {result.total_time:.2f} s."
+                        )
+                    else:
+                        feedback.reportError(f"Conversion of `{result.landxml_file}` failed: {result.error}")
+
+                feedback.setProgress(100 * len(results) / len(tasks))
+
+                if feedback.isCanceled() and not canceled:
+                    canceled = True
+
+                    # pending conversions are not started, running ones still write their files, so they are
+                    # waited for and reported in the summary
+                    for future in pending:
+                        if future.cancel():
+                            result = ConversionResult(futures[future].landxml_file)
+                            result.canceled = True
+                            results.append(result)
+
+                    pending = {x for x in pending if not x.cancelled()}
+
+                    feedback.pushInfo("Conversion canceled, waiting for running conversions to finish.")
+
+        # rows in the order of input files
+        order = {x: i for i, x in enumerate(landxml_files)}
+        results.sort(key=lambda x: order[x.landxml_file])
+
+        summary_file = os.path.join(mesh_folder, "conversion_summary.csv")
+        write_summary(summary_file, results)
+
+        feedback.pushInfo(f"Summary saved: {summary_file}")
+
+        converted = len([x for x in results if x.succeeded])
+
+        return {
+            self.OUTPUT: mesh_folder,
+            self.SUMMARY_FILE: summary_file,
+            self.CONVERTED_COUNT: converted,
+            self.FAILED_COUNT: len([x for x in results if x.error is not None]),
+        }
+
+    def _write_meshes(self, result: ConversionResult, mesh_driver: str) -> None:
+        """Writes meshes returned by the worker with MDAL driver, failure is stored in the result."""
+        crs = crs_from_attributes(result.crs_attributes)
+
+        start = time.perf_counter()
+
+        try:
+            for mesh_file, _, mesh_arrays in result.meshes:
+                os.makedirs(os.path.dirname(mesh_file), exist_ok=True)
+
+                mesh = create_qgs_mesh(MeshVerticesView([mesh_arrays]), MeshFacesView([mesh_arrays]))
+
+                self.mdal_provider_meta.createMeshData(mesh=mesh, fileName=mesh_file, driverName=mesh_driver, crs=crs)
+
+                result.mesh_files.append(mesh_file)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+
+        result.write_time = time.perf_counter() - start
+        result.total_time += result.write_time
+
+        # arrays are not needed anymore, results of all files are kept until the summary is written
+        result.meshes = []
@@ -1,28 +1,49 @@
+import concurrent.futures
+import contextlib
+import functools
 import os
-import shutil
 import typing
-import uuid
 
+import numpy as np
 from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
     QgsFileUtils,
-    QgsMesh,
     QgsMeshDriverMetadata,
-    QgsMeshLayer,
+    QgsProcessing,
     QgsProcessingAlgorithm,
     QgsProcessingContext,
     QgsProcessingException,
     QgsProcessingFeedback,
+    QgsProcessingMultiStepFeedback,
+    QgsProcessingOutputFile,
     QgsProcessingParameterBoolean,
     QgsProcessingParameterCrs,
+    QgsProcessingParameterDefinition,
     QgsProcessingParameterEnum,
+    QgsProcessingParameterExtent,
+    QgsProcessingParameterFeatureSource,
     QgsProcessingParameterFile,
     QgsProcessingParameterFolderDestination,
+    QgsProcessingParameterNumber,
     QgsProcessingUtils,
     QgsProviderRegistry,
 )
 
-from .classes.landxml_reader import LandXMLReader
+from .classes.landxml_cache import LANDXML_READER_CACHE
+from .classes.landxml_elements import LandXMLSurface
+from .classes.landxml_io import LANDXML_FILE_FILTER, landxml_base_name
+from .classes.landxml_reader import PARSERS, LandXMLReader, read_crs
 from .classes.mesh2dm_writer import Mesh2DMWriter
+from .classes.mesh_arrays import MeshArrays
+from .classes.mesh_decimation import decimate
+from .classes.mesh_operations import ClipArea, compact_mesh, weld_vertices
+from .classes.mesh_views import MeshFacesView, MeshVerticesView
+from .classes.parallel import write_2dm_file
+from .classes.processes import process_pool
+from .classes.profiler import Profiler
+from .classes.progress import ConversionCanceledError, ProgressCallback, feedback_progress
+from .classes.qgs_mesh import create_qgs_mesh, mesh_memory_definition
 
 
 class ConvertLandXML2Mesh(QgsProcessingAlgorithm):
@@ -31,6 +52,20 @@ class ConvertLandXML2Mesh(QgsProcessingAlgorithm):
     MESH_FORMAT = "MESH_FORMAT"
     CRS = "CRS"
     UNION_SURFACES = "UNION_SURFACES"
+    WORKERS = "WORKERS"
+    WELD_TOLERANCE = "WELD_TOLERANCE"
+    PROFILE = "PROFILE"
+    PROFILE_FILE = "PROFILE_FILE"
+    CLIP_EXTENT = "CLIP_EXTENT"
+    CLIP_POLYGONS = "CLIP_POLYGONS"
+    DECIMATE_FACES = "DECIMATE_FACES"
+    DECIMATE_ERROR = "DECIMATE_ERROR"
+    COMPACT = "COMPACT"
+    SIDECAR = "SIDECAR"
+    PARSER = "PARSER"
+
+    # parser options of `LandXMLReader`, `auto` selects the parser by size of the file
+    parsers = ["auto"] + list(PARSERS)
 
     mdal_provider_meta = QgsProviderRegistry.instance().providerMetadata("mdal")
 
@@ -54,7 +89,7 @@ class ConvertLandXML2Mesh(QgsProcessingAlgorithm):
         return ConvertLandXML2Mesh()
 
     def initAlgorithm(self, config=None):
-        self.addParameter(QgsProcessingParameterFile(self.INPUT, "Input LandXML File", extension="xml"))
+        self.addParameter(QgsProcessingParameterFile(self.INPUT, "Input LandXML File", fileFilter=LANDXML_FILE_FILTER))
 
         self.addParameter(
             QgsProcessingParameterBoolean(
@@ -64,12 +99,99 @@ class ConvertLandXML2Mesh(QgsProcessingAlgorithm):
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.WELD_TOLERANCE,
+                "Weld vertices of merged Surfaces closer than this distance (0 - no welding)",
+                QgsProcessingParameterNumber.Type.Double,
+                0,
+                minValue=0,
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterExtent(
+                self.CLIP_EXTENT, "Clip Surfaces to Extent (keep faces intersecting it)", optional=True
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.CLIP_POLYGONS,
+                "Clip Surfaces to Polygons (keep faces intersecting them)",
+                [QgsProcessing.SourceType.TypeVectorPolygon],
+                optional=True,
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.COMPACT,
+                "Remove unreferenced vertices, degenerate and duplicate faces (vertices and faces are renumbered)",
+                False,
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.DECIMATE_FACES,
+                "Decimate each Mesh to at most this number of faces (0 - no decimation to number of faces)",
+                QgsProcessingParameterNumber.Type.Integer,
+                0,
+                minValue=0,
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.DECIMATE_ERROR,
+                "Decimate each Mesh up to this vertical error (0 - no decimation by error)",
+                QgsProcessingParameterNumber.Type.Double,
+                0,
+                minValue=0,
+            )
+        )
+
         self.addParameter(QgsProcessingParameterEnum(self.MESH_FORMAT, "Output Format", self.driver_names, False, 0))
 
         self.addParameter(QgsProcessingParameterCrs(self.CRS, "Mesh CRS", optional=True))
 
         self.addParameter(QgsProcessingParameterFolderDestination(self.OUTPUT, "Output Folder for Mesh files"))
 
+        workers_param = QgsProcessingParameterNumber(
+            "Number of processes preparing and writing Surfaces in parallel (not used if Surfaces are merged)",
+            "Number of processes compacting, decimating and writing Surfaces in parallel (not used if Surfaces are merged)",
+            QgsProcessingParameterNumber.Type.Integer,
+            1,
+            minValue=1,
+        )
+        workers_param.setFlags(workers_param.flags() | QgsProcessingParameterDefinition.Flag.FlagAdvanced)
+        self.addParameter(workers_param)
+
+        sidecar_param = QgsProcessingParameterBoolean(
+            self.SIDECAR,
+            "Keep binary cache of decoded Surfaces next to Input File (faster repeated conversions of the same file)",
+            False,
+        )
+        sidecar_param.setFlags(sidecar_param.flags() | QgsProcessingParameterDefinition.Flag.FlagAdvanced)
+        self.addParameter(sidecar_param)
+
+        parser_param = QgsProcessingParameterEnum(
+            self.PARSER, "LandXML parser (auto - selected by size of the file)", self.parsers, False, 0
+        )
+        parser_param.setFlags(parser_param.flags() | QgsProcessingParameterDefinition.Flag.FlagAdvanced)
+        self.addParameter(parser_param)
+
+        profile_param = QgsProcessingParameterBoolean(
+            self.PROFILE,
+            "Write JSON profile of the processing stages into Output Folder (memory is traced, processing is slower)",
+            False,
+        )
+        profile_param.setFlags(profile_param.flags() | QgsProcessingParameterDefinition.Flag.FlagAdvanced)
+        self.addParameter(profile_param)
+
+        self.addOutput(QgsProcessingOutputFile(self.PROFILE_FILE, "Profile of the processing"))
+
     def checkParameterValues(
         self, parameters: typing.Dict[str, typing.Any], context: QgsProcessingContext
     ) -> typing.Tuple[bool, str]:
@@ -77,8 +199,11 @@ class ConvertLandXML2Mesh(QgsProcessingAlgorithm):
 
         landxml_file = self.parameterAsString(parameters, self.INPUT, context)
 
+        # validation only needs surfaces summary, scan the file unless it is already parsed
         try:
-            land_xml = LandXMLReader(landxml_file)
+            land_xml = LANDXML_READER_CACHE.peek(landxml_file, parser=self._parser(parameters, context))
+            if land_xml is None:
+                land_xml = LandXMLReader.scan(landxml_file)
         except ValueError as e:
             return False, f"Input file error.\n{str(e)}"
 
@@ -113,7 +238,76 @@ class ConvertLandXML2Mesh(QgsProcessingAlgorithm):
         driverIndex = self.parameterAsEnum(parameters, self.MESH_FORMAT, context)
         mesh_driver = self.driver_names[driverIndex]
 
-        land_xml = LandXMLReader(landxml_file)
+        workers = self.parameterAsInt(parameters, self.WORKERS, context)
+
+        weld_tolerance = self.parameterAsDouble(parameters, self.WELD_TOLERANCE, context)
+
+        compact_meshes = self.parameterAsBoolean(parameters, self.COMPACT, context)
+
+        decimate_faces = self.parameterAsInt(parameters, self.DECIMATE_FACES, context)
+        decimate_error = self.parameterAsDouble(parameters, self.DECIMATE_ERROR, context)
+
+        # zero means the limit is not used, decimation is done if any limit is set
+        decimation_limits = {
+            "target_faces": decimate_faces if decimate_faces > 0 else None,
+            "max_error": decimate_error if decimate_error > 0 else None,
+        }
+        decimate_meshes = decimate_faces > 0 or decimate_error > 0
+
+        write_profile = self.parameterAsBoolean(parameters, self.PROFILE, context)
+
+        use_sidecar = self.parameterAsBoolean(parameters, self.SIDECAR, context)
+
+        profiler = Profiler(feedback, trace_memory=write_profile)
+
+        # parsing and writing of meshes
+        steps_feedback = QgsProcessingMultiStepFeedback(2, feedback)
+
+        # clipping is done while parsing, so the area is needed in CRS of the mesh before the file is parsed
+        reader_options = {"parser": self._parser(parameters, context)}
+
+        clip_area = self._clip_area(parameters, context, landxml_file, mesh_crs)
+        if clip_area is not None:
+            reader_options["clip_area"] = clip_area
+            feedback.pushInfo(f"Clipping surfaces to extent: {clip_area.extent}.")
+
+        if use_sidecar:
+            reader_options["sidecar"] = True
+
+        # parsing and writing report progress and stop within a fraction of second once the algorithm is canceled
+        progress = feedback_progress(steps_feedback)
+
+        try:
+            with profiler.stage("LandXML parse") as stage:
+                land_xml = LANDXML_READER_CACHE.get(landxml_file, progress=progress, **reader_options)
+
+                if land_xml.from_sidecar:
+                    feedback.pushInfo("Surfaces loaded from binary cache of the file.")
+                else:
+                    feedback.pushInfo(f"LandXML file parsed by `{land_xml.parser}` parser.")
+
+                stage.counts = {
+                    "surfaces": land_xml.surface_count,
+                    "vertices": sum([x.arrays().vertex_count for x in land_xml.surfaces]),
+                    "faces": sum([x.arrays().face_count for x in land_xml.surfaces]),
+                }
+        except ConversionCanceledError:
+            feedback.pushInfo("Conversion canceled.")
+            return {}
+
+        steps_feedback.setCurrentStep(1)
+
+        surfaces = land_xml.surfaces
+
+        if clip_area is not None:
+            surfaces = [x for x in land_xml.surfaces if x.arrays().face_count > 0]
+
+            for surface in land_xml.surfaces:
+                if surface.arrays().face_count == 0:
+                    feedback.pushInfo(f"Surface `{surface.name}` is outside of clip area, it is skipped.")
+
+            if not surfaces:
+                raise QgsProcessingException("No faces of the surfaces intersect the clip area.")
 
         land_xml_crs = land_xml.crs()
 
@@ -124,37 +318,71 @@ class ConvertLandXML2Mesh(QgsProcessingAlgorithm):
         feedback.pushInfo(f"Using CRS: `{mesh_crs.authid()}`.")
 
         if merge_surfaces:
-            name, _ = os.path.splitext(landxml_file)
+            name = landxml_base_name(landxml_file)
             mesh_file = QgsFileUtils.ensureFileNameHasExtension(name, [self.driver_suffixes[driverIndex]])
 
             mesh_file = os.path.join(mesh_folder, mesh_file)
 
-            tmp_2dm_file = QgsProcessingUtils.generateTempFilename(f"{uuid.uuid4()}.2dm")
+            with profiler.stage("Surfaces merge") as stage:
+                # surfaces are renumbered once and shared by vertices and faces
+                parts = MeshArrays.renumber_consecutively([x.arrays() for x in surfaces])
+                stage.counts = {"surfaces": len(parts)}
 
-            # create temp 2DM file and load it as layer
+            steps_feedback.setProgress(20)
 
-            mesh_2dm_writer = Mesh2DMWriter(land_xml.all_points, land_xml.all_faces)
+            if weld_tolerance > 0:
+                with profiler.stage("Vertices weld") as stage:
+                    merged_arrays = MeshArrays.concatenate(parts)
+                    welded_arrays = weld_vertices(merged_arrays, weld_tolerance)
 
-            mesh_2dm_writer.write(tmp_2dm_file)
+                    stage.counts = {
+                        "welded vertices": merged_arrays.vertex_count - welded_arrays.vertex_count,
+                        "removed faces": merged_arrays.face_count - welded_arrays.face_count,
+                    }
 
-            feedback.pushInfo(f"Temp 2dm file saved: {tmp_2dm_file}")
+                    parts = [welded_arrays]
 
-            mesh_layer = QgsMeshLayer(tmp_2dm_file, "temp mesh layer", "mdal")
+            if compact_meshes:
+                with profiler.stage("Mesh compaction") as stage:
+                    merged_arrays = MeshArrays.concatenate(parts)
+                    compacted_arrays = compact_mesh(merged_arrays)
 
-            # if output is 2DM format, just copy
-            if mesh_driver == "2DM":
-                dir_name = os.path.dirname(mesh_file)
-                if not os.path.exists(dir_name):
-                    os.mkdir(os.path.dirname(mesh_file))
-                shutil.copy(tmp_2dm_file, mesh_file)
-            # else extract mesh and create new using proper driver
-            else:
-                mesh = QgsMesh()
-                mesh_layer.dataProvider().populateMesh(mesh)
+                    stage.counts = {
+                        "removed vertices": merged_arrays.vertex_count - compacted_arrays.vertex_count,
+                        "removed faces": merged_arrays.face_count - compacted_arrays.face_count,
+                    }
 
-                self.mdal_provider_meta.createMeshData(
-                    mesh=mesh, fileName=mesh_file, driverName=mesh_driver, crs=mesh_crs
+                    parts = [compacted_arrays]
+
+            if decimate_meshes:
+                with profiler.stage("Mesh decimation") as stage:
+                    merged_arrays = MeshArrays.concatenate(parts)
+                    decimated_arrays = decimate(merged_arrays, **decimation_limits)
+
+                    stage.counts = {
+                        "removed vertices": merged_arrays.vertex_count - decimated_arrays.vertex_count,
+                        "faces": decimated_arrays.face_count,
+                    }
+
+                    parts = [decimated_arrays]
+
+            steps_feedback.setProgress(40)
+
+            try:
+                self._write_mesh(
+                    MeshVerticesView(parts),
+                    MeshFacesView(parts),
+                    mesh_file,
+                    mesh_driver,
+                    mesh_crs,
+                    profiler,
+                    lambda x: progress(40 + 0.6 * x),
                 )
+            except ConversionCanceledError:
+                feedback.pushInfo("Conversion canceled.")
+                return {}
+
+            steps_feedback.setProgress(100)
 
             feedback.pushInfo(f"Output file saved: {mesh_file}")
 
@@ -164,45 +392,329 @@ class ConvertLandXML2Mesh(QgsProcessingAlgorithm):
             )
 
         else:
-            for surface in land_xml.surfaces:
-                mesh_file = QgsFileUtils.ensureFileNameHasExtension(surface.name, [self.driver_suffixes[driverIndex]])
+            try:
+                # surfaces are compacted, decimated and prepared for writing by `workers` processes
+                with contextlib.ExitStack() as stack:
+                    executor = None
+                    if workers > 1 and len(surfaces) > 1:
+                        executor = stack.enter_context(process_pool(min(workers, len(surfaces))))
+
+                    if compact_meshes:
+                        with profiler.stage("Surfaces compaction") as stage:
+                            compacted_surfaces = self._map_surfaces(
+                                compact_mesh, surfaces, executor, steps_feedback, (0, 10 if decimate_meshes else 40)
+                            )
+
+                            stage.counts = {
+                                "removed vertices": sum([x.arrays().vertex_count for x in surfaces])
+                                - sum([x.arrays().vertex_count for x in compacted_surfaces]),
+                                "removed faces": sum([x.arrays().face_count for x in surfaces])
+                                - sum([x.arrays().face_count for x in compacted_surfaces]),
+                            }
+
+                            surfaces = compacted_surfaces
+
+                    if decimate_meshes:
+                        with profiler.stage("Surfaces decimation") as stage:
+                            decimated_surfaces = self._map_surfaces(
+                                functools.partial(decimate, **decimation_limits),
+                                surfaces,
+                                executor,
+                                steps_feedback,
+                                (10 if compact_meshes else 0, 40),
+                            )
+
+                            stage.counts = {
+                                "removed vertices": sum([x.arrays().vertex_count for x in surfaces])
+                                - sum([x.arrays().vertex_count for x in decimated_surfaces]),
+                                "faces": sum([x.arrays().face_count for x in decimated_surfaces]),
+                            }
+
+                            surfaces = decimated_surfaces
+
+                    mesh_files = []
+                    for surface in surfaces:
+                        mesh_file = QgsFileUtils.ensureFileNameHasExtension(
+                            surface.name, [self.driver_suffixes[driverIndex]]
+                        )
+
+                        mesh_files.append(os.path.join(mesh_folder, mesh_file))
+
+                    # surfaces are written concurrently, so they are measured as single stage
+                    with profiler.stage("Surfaces write") as stage:
+                        written = self._write_surfaces(
+                            surfaces, mesh_files, mesh_driver, mesh_crs, executor, steps_feedback
+                        )
+                        stage.counts = {"files": len(written)}
+            except ConversionCanceledError:
+                feedback.pushInfo("Conversion canceled.")
+                return {}
+
+            # layers are added in the order of surfaces, regardless of the order in which they were written
+            for surface, mesh_file in zip(surfaces, mesh_files):
+                if mesh_file not in written:
+                    continue
+
+                context.addLayerToLoadOnCompletion(
+                    mesh_file,
+                    QgsProcessingContext.LayerDetails(
+                        surface.name, context.project(), surface.name, QgsProcessingUtils.LayerHint.Mesh
+                    ),
+                )
 
-                mesh_file = os.path.join(mesh_folder, mesh_file)
+        results = {self.OUTPUT: mesh_folder}
 
-                tmp_2dm_file = QgsProcessingUtils.generateTempFilename(f"{uuid.uuid4()}.2dm")
+        if write_profile:
+            name = landxml_base_name(os.path.basename(landxml_file))
+            profile_file = os.path.join(mesh_folder, f"{name}.profile.json")
 
-                # create temp 2DM file and load it as layer
+            profiler.write(profile_file, algorithm=self.name(), input=landxml_file, output=mesh_folder)
 
-                mesh_2dm_writer = Mesh2DMWriter(surface.points(), surface.faces())
+            feedback.pushInfo(f"Profile saved: {profile_file}")
 
-                mesh_2dm_writer.write(tmp_2dm_file)
+            results[self.PROFILE_FILE] = profile_file
 
-                feedback.pushInfo(f"Temp 2dm file saved: {tmp_2dm_file}")
+        return results
 
-                mesh_layer = QgsMeshLayer(tmp_2dm_file, "temp mesh layer", "mdal")
+    def _parser(self, parameters: typing.Dict[str, typing.Any], context: QgsProcessingContext) -> str:
+        return self.parsers[self.parameterAsEnum(parameters, self.PARSER, context)]
 
-                # if output is 2DM format, just copy
-                if mesh_driver == "2DM":
-                    dir_name = os.path.dirname(mesh_file)
-                    if not os.path.exists(dir_name):
-                        os.mkdir(os.path.dirname(mesh_file))
-                    shutil.copy(tmp_2dm_file, mesh_file)
-                # else extract mesh and create new using proper driver
-                else:
-                    mesh = QgsMesh()
-                    mesh_layer.dataProvider().populateMesh(mesh)
+    def _clip_area(
+        self,
+        parameters: typing.Dict[str, typing.Any],
+        context: QgsProcessingContext,
+        landxml_file: str,
+        mesh_crs: QgsCoordinateReferenceSystem,
+    ) -> typing.Optional[ClipArea]:
+        """Clip area from extent and polygons parameters in CRS of the mesh, `None` if neither is set."""
+        polygons_source = self.parameterAsSource(parameters, self.CLIP_POLYGONS, context)
 
-                    self.mdal_provider_meta.createMeshData(
-                        mesh=mesh, fileName=mesh_file, driverName=mesh_driver, crs=mesh_crs
-                    )
+        if parameters.get(self.CLIP_EXTENT) is None and polygons_source is None:
+            return None
 
-                feedback.pushInfo(f"Output file saved: {mesh_file}")
+        # if user did not provide CRS, the surfaces are in CRS of the LandXML file
+        if not mesh_crs.isValid():
+            mesh_crs = read_crs(landxml_file)
 
-                context.addLayerToLoadOnCompletion(
+        extent = None
+
+        rectangle = self.parameterAsExtent(parameters, self.CLIP_EXTENT, context, mesh_crs)
+        if not rectangle.isNull():
+            extent = (rectangle.xMinimum(), rectangle.yMinimum(), rectangle.xMaximum(), rectangle.yMaximum())
+
+        polygons = []
+
+        if polygons_source is not None:
+            transform = QgsCoordinateTransform(polygons_source.sourceCrs(), mesh_crs, context.transformContext())
+
+            for feature in polygons_source.getFeatures():
+                geometry = feature.geometry()
+
+                if geometry.isEmpty():
+                    continue
+
+                if mesh_crs.isValid() and polygons_source.sourceCrs().isValid():
+                    geometry.transform(transform)
+
+                for polygon in geometry.asMultiPolygon() if geometry.isMultipart() else [geometry.asPolygon()]:
+                    polygons.append([np.array([(point.x(), point.y()) for point in ring]) for ring in polygon])
+
+        if extent is None and not polygons:
+            return None
+
+        return ClipArea(extent, polygons)
+
+    def _write_mesh(
+        self,
+        points: MeshVerticesView,
+        faces: MeshFacesView,
+        mesh_file: str,
+        mesh_driver: str,
+        mesh_crs: QgsCoordinateReferenceSystem,
+        profiler: typing.Optional[Profiler] = None,
+        progress: typing.Optional[ProgressCallback] = None,
+        definition: typing.Optional[str] = None,
+    ) -> None:
+        """Writes the mesh using given driver. 2DM is written directly, other formats from in-memory `QgsMesh`,
+        created from `definition` if it is already formatted.
+
+        Only writing of 2DM reports `progress` and can be canceled, partially written file is removed.
+        """
+        if profiler is None:
+            profiler = Profiler()
+
+        dir_name = os.path.dirname(mesh_file)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+
+        if mesh_driver == "2DM":
+            with profiler.stage("2DM write") as stage:
+                try:
+                    Mesh2DMWriter(points, faces).write(mesh_file, progress)
+                except ConversionCanceledError:
+                    os.remove(mesh_file)
+                    raise
+                stage.counts = {"vertices": len(points), "faces": len(faces)}
+        else:
+            mesh = create_qgs_mesh(points, faces, profiler, definition)
+
+            with profiler.stage(f"{mesh_driver} driver write") as stage:
+                self.mdal_provider_meta.createMeshData(
+                    mesh=mesh, fileName=mesh_file, driverName=mesh_driver, crs=mesh_crs
+                )
+                stage.counts = {"vertices": mesh.vertexCount(), "faces": mesh.faceCount()}
+
+    @staticmethod
+    def _map_surfaces(
+        function: typing.Callable[[MeshArrays], MeshArrays],
+        surfaces: typing.Sequence[LandXMLSurface],
+        executor: typing.Optional[concurrent.futures.Executor],
+        feedback: QgsProcessingFeedback,
+        progress_range: typing.Tuple[float, float],
+    ) -> typing.List[LandXMLSurface]:
+        """Applies `function` to arrays of each surface by processes of `executor`, or in this thread if it is `None`.
+        Returns new surfaces in the same order, progress goes through `progress_range`.
+
+        If the algorithm is canceled, pending surfaces are not processed and `ConversionCanceledError` is raised.
+        """
+        start, end = progress_range
+        results: typing.List[typing.Optional[MeshArrays]] = [None] * len(surfaces)
+
+        if executor is None:
+            for i, surface in enumerate(surfaces):
+                if feedback.isCanceled():
+                    raise ConversionCanceledError("Conversion canceled.")
+
+                results[i] = function(surface.arrays())
+                feedback.setProgress(start + (end - start) * (i + 1) / len(surfaces))
+        else:
+            futures = {executor.submit(function, x.arrays()): i for i, x in enumerate(surfaces)}
+            pending = set(futures.keys())
+
+            try:
+                while pending:
+                    done, pending = concurrent.futures.wait(
+                        pending, timeout=0.5, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+
+                    for future in done:
+                        results[futures[future]] = future.result()
+
+                    feedback.setProgress(start + (end - start) * (len(futures) - len(pending)) / len(futures))
+
+                    if pending and feedback.isCanceled():
+                        raise ConversionCanceledError("Conversion canceled.")
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        return [
+            LandXMLSurface.from_mesh_arrays(surface.name, i + 1, mesh_arrays)
+            for i, (surface, mesh_arrays) in enumerate(zip(surfaces, results))
+        ]
+
+    def _write_surfaces(
+        self,
+        surfaces: typing.List[LandXMLSurface],
+        mesh_files: typing.List[str],
+        mesh_driver: str,
+        mesh_crs: QgsCoordinateReferenceSystem,
+        executor: typing.Optional[concurrent.futures.Executor],
+        feedback: QgsProcessingFeedback,
+    ) -> typing.List[str]:
+        """Writes each surface into its own file, returns list of written files. Progress goes from 40 to 100.
+
+        With `executor` 2DM files are written by its processes. For other formats the processes format definitions
+        of in-memory meshes, `QgsMesh` is created and written by MDAL driver in this thread, one surface at a time,
+        as MDAL drivers are not known to be thread safe. If the algorithm is canceled, pending surfaces are not
+        written, 2DM files being written are removed and `ConversionCanceledError` is raised.
+        """
+        written: typing.List[str] = []
+
+        # surfaces with the same name are written into the same file, which cannot be done concurrently
+        if executor is None or len(set(mesh_files)) != len(mesh_files):
+            progress = feedback_progress(feedback)
+
+            for i, (surface, mesh_file) in enumerate(zip(surfaces, mesh_files)):
+                if feedback.isCanceled():
+                    raise ConversionCanceledError("Conversion canceled.")
+
+                self._write_mesh(
+                    surface.points(),
+                    surface.faces(),
                     mesh_file,
-                    QgsProcessingContext.LayerDetails(
-                        surface.name, context.project(), surface.name, QgsProcessingUtils.LayerHint.Mesh
-                    ),
+                    mesh_driver,
+                    mesh_crs,
+                    progress=lambda x: progress(40 + 0.6 * (100 * i + x) / len(surfaces)),
                 )
 
-        return {self.OUTPUT: mesh_folder}
+                written.append(mesh_file)
+                feedback.pushInfo(f"Output file saved: {mesh_file}")
+                feedback.setProgress(40 + 60 * len(written) / len(surfaces))
+
+            return written
+
+        if mesh_driver != "2DM":
+            futures = [executor.submit(mesh_memory_definition, x.points(), x.faces()) for x in surfaces]
+
+            try:
+                for surface, mesh_file, future in zip(surfaces, mesh_files, futures):
+                    done = False
+                    while not done:
+                        if feedback.isCanceled():
+                            raise ConversionCanceledError("Conversion canceled.")
+
+                        done = bool(concurrent.futures.wait([future], timeout=0.5).done)
+
+                    self._write_mesh(
+                        surface.points(), surface.faces(), mesh_file, mesh_driver, mesh_crs, definition=future.result()
+                    )
+
+                    written.append(mesh_file)
+                    feedback.pushInfo(f"Output file saved: {mesh_file}")
+                    feedback.setProgress(40 + 60 * len(written) / len(surfaces))
+            finally:
+                for future in futures:
+                    future.cancel()
+
+            return written
+
+        for mesh_file in mesh_files:
+            os.makedirs(os.path.dirname(mesh_file) or ".", exist_ok=True)
+
+        futures = {
+            executor.submit(write_2dm_file, mesh_file, surface.arrays()): mesh_file
+            for surface, mesh_file in zip(surfaces, mesh_files)
+        }
+
+        pending = set(futures.keys())
+
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, timeout=0.5, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+
+            for future in done:
+                # re-raise the error from the worker
+                future.result()
+
+                written.append(futures[future])
+                feedback.pushInfo(f"Output file saved: {futures[future]}")
+
+            feedback.setProgress(40 + 60 * len(written) / len(futures))
+
+            if pending and feedback.isCanceled():
+                for future in pending:
+                    future.cancel()
+
+                # files of the surfaces that were being written are not complete outputs of the conversion
+                running = [x for x in pending if not x.cancelled()]
+                concurrent.futures.wait(running)
+
+                for future in running:
+                    if os.path.exists(futures[future]):
+                        os.remove(futures[future])
+
+                raise ConversionCanceledError("Conversion canceled.")
+
+        return written
@@ -1,3 +1,4 @@
+import os
 import typing
 
 from qgis.core import (
@@ -6,18 +7,33 @@ from qgis.core import (
     QgsProcessingContext,
     QgsProcessingException,
     QgsProcessingFeedback,
+    QgsProcessingMultiStepFeedback,
+    QgsProcessingOutputFile,
+    QgsProcessingParameterBoolean,
+    QgsProcessingParameterDefinition,
     QgsProcessingParameterFileDestination,
     QgsProcessingParameterMultipleLayers,
+    QgsProcessingParameterNumber,
     QgsProviderRegistry,
 )
 
+from .classes.landxml_io import landxml_base_name
 from .classes.landxml_writer import LandXMLWriter
 from .classes.mesh2dm_reader import Mesh2DMReader
+from .classes.mesh_decimation import decimate
+from .classes.mesh_operations import compact_mesh
+from .classes.profiler import Profiler
+from .classes.progress import ConversionCanceledError, feedback_progress
 
 
 class ConvertMesh2LandXML(QgsProcessingAlgorithm):
     INPUT = "INPUT"
     OUTPUT = "OUTPUT"
+    PROFILE = "PROFILE"
+    PROFILE_FILE = "PROFILE_FILE"
+    DECIMATE_FACES = "DECIMATE_FACES"
+    DECIMATE_ERROR = "DECIMATE_ERROR"
+    COMPACT = "COMPACT"
 
     mdal_provider_meta = QgsProviderRegistry.instance().providerMetadata("mdal")
 
@@ -36,9 +52,51 @@ class ConvertMesh2LandXML(QgsProcessingAlgorithm):
         )
 
         self.addParameter(
-            QgsProcessingParameterFileDestination(self.OUTPUT, "Output LandXML File", fileFilter="XML File (*.xml)")
+            QgsProcessingParameterFileDestination(
+                self.OUTPUT,
+                "Output LandXML File (`.xml.gz` is written compressed)",
+                fileFilter="XML File (*.xml);;Compressed XML File (*.xml.gz)",
+            )
         )
 
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.COMPACT,
+                "Remove unreferenced vertices, degenerate and duplicate faces (vertices and faces are renumbered)",
+                False,
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.DECIMATE_FACES,
+                "Decimate each Surface to at most this number of faces (0 - no decimation to number of faces)",
+                QgsProcessingParameterNumber.Type.Integer,
+                0,
+                minValue=0,
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.DECIMATE_ERROR,
+                "Decimate each Surface up to this vertical error (0 - no decimation by error)",
+                QgsProcessingParameterNumber.Type.Double,
+                0,
+                minValue=0,
+            )
+        )
+
+        profile_param = QgsProcessingParameterBoolean(
+            self.PROFILE,
+            "Write JSON profile of the processing stages next to Output File (memory is traced, processing is slower)",
+            False,
+        )
+        profile_param.setFlags(profile_param.flags() | QgsProcessingParameterDefinition.Flag.FlagAdvanced)
+        self.addParameter(profile_param)
+
+        self.addOutput(QgsProcessingOutputFile(self.PROFILE_FILE, "Profile of the processing"))
+
     def checkParameterValues(
         self, parameters: typing.Dict[str, typing.Any], context: QgsProcessingContext
     ) -> typing.Tuple[bool, str]:
@@ -61,16 +119,96 @@ class ConvertMesh2LandXML(QgsProcessingAlgorithm):
 
         xml_file = self.parameterAsString(parameters, self.OUTPUT, context)
 
+        write_profile = self.parameterAsBoolean(parameters, self.PROFILE, context)
+
+        compact_surfaces = self.parameterAsBoolean(parameters, self.COMPACT, context)
+
+        decimate_faces = self.parameterAsInt(parameters, self.DECIMATE_FACES, context)
+        decimate_error = self.parameterAsDouble(parameters, self.DECIMATE_ERROR, context)
+
+        # zero means the limit is not used, decimation is done if any limit is set
+        decimation_limits = {
+            "target_faces": decimate_faces if decimate_faces > 0 else None,
+            "max_error": decimate_error if decimate_error > 0 else None,
+        }
+        decimate_surfaces = decimate_faces > 0 or decimate_error > 0
+
+        profiler = Profiler(feedback, trace_memory=write_profile)
+
+        # reading of each layer and writing of the file
+        steps_feedback = QgsProcessingMultiStepFeedback(len(mesh_layers) + 1, feedback)
+
         landxml_writer = LandXMLWriter(mesh_layers[0].crs())
 
-        for mesh_layer in mesh_layers:
+        for i, mesh_layer in enumerate(mesh_layers):
             if feedback.isCanceled():
-                break
+                feedback.pushInfo("Conversion canceled.")
+                return {}
+
+            steps_feedback.setCurrentStep(i)
 
             feedback.pushCommandInfo(f"Processing layer: {mesh_layer.name()}")
 
-            landxml_writer.add_surface(mesh_layer)
+            with profiler.stage(f"Mesh load `{mesh_layer.name()}`") as stage:
+                landxml_writer.add_surface(mesh_layer)
+
+                _, mesh_arrays = landxml_writer.surfaces[-1]
+                stage.counts = {"vertices": mesh_arrays.vertex_count, "faces": mesh_arrays.face_count}
+
+            if compact_surfaces:
+                with profiler.stage(f"Mesh compaction `{mesh_layer.name()}`") as stage:
+                    name, mesh_arrays = landxml_writer.surfaces[-1]
+                    compacted_arrays = compact_mesh(mesh_arrays)
+
+                    landxml_writer.surfaces[-1] = (name, compacted_arrays)
+
+                    stage.counts = {
+                        "removed vertices": mesh_arrays.vertex_count - compacted_arrays.vertex_count,
+                        "removed faces": mesh_arrays.face_count - compacted_arrays.face_count,
+                    }
+
+            if decimate_surfaces:
+                with profiler.stage(f"Mesh decimation `{mesh_layer.name()}`") as stage:
+                    name, mesh_arrays = landxml_writer.surfaces[-1]
+                    decimated_arrays = decimate(mesh_arrays, **decimation_limits)
+
+                    landxml_writer.surfaces[-1] = (name, decimated_arrays)
+
+                    stage.counts = {
+                        "removed vertices": mesh_arrays.vertex_count - decimated_arrays.vertex_count,
+                        "faces": decimated_arrays.face_count,
+                    }
+
+        steps_feedback.setCurrentStep(len(mesh_layers))
+
+        try:
+            with profiler.stage("LandXML write") as stage:
+                landxml_writer.write(xml_file, feedback_progress(steps_feedback))
+
+                stage.counts = {
+                    "surfaces": len(landxml_writer.surfaces),
+                    "vertices": sum([x.vertex_count for _, x in landxml_writer.surfaces]),
+                    "faces": sum([x.face_count for _, x in landxml_writer.surfaces]),
+                }
+        except ConversionCanceledError:
+            # do not leave incomplete document
+            os.remove(xml_file)
+            feedback.pushInfo("Conversion canceled.")
+            return {}
+
+        steps_feedback.setProgress(100)
+
+        results = {self.OUTPUT: xml_file}
+
+        if write_profile:
+            profile_file = f"{landxml_base_name(xml_file)}.profile.json"
+
+            profiler.write(
+                profile_file, algorithm=self.name(), input=[x.source() for x in mesh_layers], output=xml_file
+            )
+
+            feedback.pushInfo(f"Profile saved: {profile_file}")
 
-        landxml_writer.write(xml_file)
+            results[self.PROFILE_FILE] = profile_file
 
-        return {self.OUTPUT: xml_file}
+        return results
@@ -0,0 +1,75 @@
+import typing
+
+from qgis.core import (
+    QgsProcessingAlgorithm,
+    QgsProcessingContext,
+    QgsProcessingException,
+    QgsProcessingFeedback,
+    QgsProcessingOutputNumber,
+    QgsProcessingOutputString,
+    QgsProcessingParameterFile,
+)
+
+from .classes.landxml_io import LANDXML_FILE_FILTER
+from .classes.landxml_reader import LandXMLReader
+
+
+class InspectLandXML(QgsProcessingAlgorithm):
+    INPUT = "INPUT"
+    NAMESPACE = "NAMESPACE"
+    CRS = "CRS"
+    SURFACE_COUNT = "SURFACE_COUNT"
+    SURFACE_NAMES = "SURFACE_NAMES"
+    POINT_COUNT = "POINT_COUNT"
+    FACE_COUNT = "FACE_COUNT"
+
+    def name(self):
+        return "inspectlandxml"
+
+    def displayName(self):
+        return "Inspect LandXML"
+
+    def createInstance(self):
+        return InspectLandXML()
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFile(self.INPUT, "Input LandXML File", fileFilter=LANDXML_FILE_FILTER))
+
+        self.addOutput(QgsProcessingOutputString(self.NAMESPACE, "Namespace"))
+        self.addOutput(QgsProcessingOutputString(self.CRS, "CRS"))
+        self.addOutput(QgsProcessingOutputNumber(self.SURFACE_COUNT, "Number of Surfaces"))
+        self.addOutput(QgsProcessingOutputString(self.SURFACE_NAMES, "Names of Surfaces"))
+        self.addOutput(QgsProcessingOutputNumber(self.POINT_COUNT, "Number of Points"))
+        self.addOutput(QgsProcessingOutputNumber(self.FACE_COUNT, "Number of Faces"))
+
+    def processAlgorithm(
+        self, parameters: typing.Dict[str, typing.Any], context: QgsProcessingContext, feedback: QgsProcessingFeedback
+    ):
+        landxml_file = self.parameterAsString(parameters, self.INPUT, context)
+
+        try:
+            land_xml = LandXMLReader.scan(landxml_file)
+        except ValueError as e:
+            raise QgsProcessingException(f"Input file error.\n{str(e)}")
+
+        namespace = ", ".join([x for x in land_xml.namespace.values() if x])
+        crs = land_xml.crs()
+
+        feedback.pushInfo(f"Namespace: `{namespace}`.")
+        feedback.pushInfo(f"CRS: `{crs.authid()}`.")
+        feedback.pushInfo(f"Number of surfaces: {land_xml.surface_count}.")
+
+        for surface in land_xml.surfaces:
+            feedback.pushInfo(
+                f"Surface `{surface.name}`: {surface.point_count} points, {surface.face_count} faces, "
+                f"extent: {surface.extent()}, elevation range: {(surface.z_min, surface.z_max)}."
+            )
+
+        return {
+            self.NAMESPACE: namespace,
+            self.CRS: crs.authid(),
+            self.SURFACE_COUNT: land_xml.surface_count,
+            self.SURFACE_NAMES: ";".join([x.name for x in land_xml.surfaces]),
+            self.POINT_COUNT: land_xml.point_count,
+            self.FACE_COUNT: land_xml.face_count,
+        }
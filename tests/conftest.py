@@ -1,7 +1,12 @@
+import typing
 from pathlib import Path
 
+import numpy as np
 import pytest
 
+from benchmarks.synthetic import synthetic_surfaces, write_landxml
+from landxmlconvertor.classes.landxml_reader import LandXMLReader
+
 
 @pytest.fixture
 def test_data_folder() -> Path:
@@ -18,3 +23,26 @@ def test_data_clean(test_data_folder: Path) -> str:
 def test_data_mesh2dm(test_data_folder: Path) -> str:
     file_path = test_data_folder / "mesh.2dm"
     return file_path.as_posix()
+
+
+@pytest.fixture
+def synthetic_landxml(request, tmp_path) -> str:
+    """LandXML file with 2 synthetic surfaces, number of points of each surface may be set by indirect parameter."""
+    file = (tmp_path / "synthetic.xml").as_posix()
+    write_landxml(file, synthetic_surfaces(2, getattr(request, "param", 20_000)))
+    return file
+
+
+def _assert_same_surfaces(land_xml: LandXMLReader, expected: LandXMLReader) -> None:
+    assert land_xml.crs() == expected.crs()
+    assert [x.name for x in land_xml.surfaces] == [x.name for x in expected.surfaces]
+
+    for surface, expected_surface in zip(land_xml.surfaces, expected.surfaces):
+        for name in ("vertex_ids", "x", "y", "z", "face_ids", "faces"):
+            np.testing.assert_array_equal(getattr(surface.arrays(), name), getattr(expected_surface.arrays(), name))
+
+
+@pytest.fixture
+def assert_same_surfaces() -> typing.Callable[[LandXMLReader, LandXMLReader], None]:
+    """Checks that both readers have the same CRS and surfaces with the same names, vertices and faces."""
+    return _assert_same_surfaces
@@ -1,3 +1,5 @@
+import pytest
+
 from landxmlconvertor.classes.mesh2dm_reader import Mesh2DMReader
 from landxmlconvertor.classes.mesh_elements import MeshFace, MeshVertex
 
@@ -16,3 +18,50 @@ def test_read(test_data_mesh2dm):
 
     assert all([isinstance(x.id, int) for x in mesh_2d.faces])
     assert all([all([isinstance(y, int) for y in x.points_ids]) for x in mesh_2d.faces])
+
+
+def test_read_arrays(test_data_mesh2dm):
+    mesh_2d = Mesh2DMReader(test_data_mesh2dm)
+
+    assert mesh_2d.mesh_arrays.vertex_count == 29
+    assert mesh_2d.mesh_arrays.face_count == 45
+    assert mesh_2d.mesh_arrays.faces.shape == (45, 3)
+
+    assert mesh_2d.points[0].id == 5
+    assert mesh_2d.points[0].x == 148078.62759250728
+    assert mesh_2d.points[0].y == 6399036.784479916
+    assert mesh_2d.points[0].z == 1.850000000093
+
+
+def test_read_irregular_records(tmp_path):
+    file_name = tmp_path / "mesh.2dm"
+    file_name.write_bytes(
+        b"MESH2D\r\n"
+        b'MESHNAME "mesh"\r\n'
+        b"ND  1   0.0 0.0\t1.5\r\n"
+        b"ND 2 1.0 0.0 2.5\r\n"
+        b"ND 3 1 1 3\r\n"
+        b"ND 4 0 1 4\r\n"
+        b"E4Q 2 1 2 3 4 7\r\n"
+        b"E3T  1 1 2 3\r\n"
+        b"E6T 3 1 2 3 4 5 6 1\r\n"
+        b"NS 1 2 -3"
+    )
+
+    mesh_2d = Mesh2DMReader(file_name.as_posix())
+
+    assert [(x.id, x.x, x.y, x.z) for x in mesh_2d.points] == [
+        (1, 0.0, 0.0, 1.5),
+        (2, 1.0, 0.0, 2.5),
+        (3, 1.0, 1.0, 3.0),
+        (4, 0.0, 1.0, 4.0),
+    ]
+    assert [(x.id, x.points_ids) for x in mesh_2d.faces] == [(2, [1, 2, 3, 4]), (1, [1, 2, 3])]
+
+
+def test_read_invalid_record(tmp_path):
+    file_name = tmp_path / "mesh.2dm"
+    file_name.write_text("MESH2D\nND 1 0.0 0.0 1.0\nND 2 1.0 x 1.0\n")
+
+    with pytest.raises(ValueError, match="Invalid 2DM record: `ND 2 1.0 x 1.0`"):
+        Mesh2DMReader(file_name.as_posix())
@@ -0,0 +1,38 @@
+from landxmlconvertor.classes import mesh2dm_writer
+from landxmlconvertor.classes.mesh2dm_reader import Mesh2DMReader
+from landxmlconvertor.classes.mesh2dm_writer import Mesh2DMWriter
+from landxmlconvertor.classes.mesh_arrays import MeshArrays
+from landxmlconvertor.classes.mesh_elements import MeshFace, MeshVertex
+
+
+def test_write_in_chunks(test_data_mesh2dm, tmp_path, monkeypatch):
+    monkeypatch.setattr(mesh2dm_writer, "WRITE_CHUNK_SIZE", 7)
+
+    mesh_2d = Mesh2DMReader(test_data_mesh2dm)
+
+    file_from_arrays = tmp_path / "arrays.2dm"
+    Mesh2DMWriter.from_mesh_arrays(mesh_2d.mesh_arrays).write(file_from_arrays.as_posix())
+
+    file_from_lists = tmp_path / "lists.2dm"
+    Mesh2DMWriter(list(mesh_2d.points), list(mesh_2d.faces)).write(file_from_lists.as_posix())
+
+    assert file_from_arrays.read_text() == file_from_lists.read_text()
+
+    mesh_2d_written = Mesh2DMReader(file_from_arrays.as_posix())
+
+    assert [(x.id, x.x, x.y, x.z) for x in mesh_2d_written.points] == [(x.id, x.x, x.y, x.z) for x in mesh_2d.points]
+    assert [(x.id, x.points_ids) for x in mesh_2d_written.faces] == [(x.id, x.points_ids) for x in mesh_2d.faces]
+
+
+def test_write_mixed_faces(tmp_path):
+    points = [MeshVertex(i + 1, float(i), float(i % 2), 0.5) for i in range(5)]
+    faces = [MeshFace(1, [1, 2, 3]), MeshFace(2, [2, 3, 4, 5])]
+
+    file_name = tmp_path / "mesh.2dm"
+    Mesh2DMWriter.from_mesh_arrays(MeshArrays.from_mesh_elements(points, faces)).write(file_name.as_posix())
+
+    lines = file_name.read_text().splitlines()
+
+    assert lines[0] == "MESH2D"
+    assert lines[1] == "ND 1 0.0 0.0 0.5"
+    assert lines[-2:] == ["E3T 1 1 2 3 1", "E4Q 2 2 3 4 5 1"]
@@ -1,12 +1,19 @@
 import tempfile
 from pathlib import Path
 
+import numpy as np
 import pytest
-from qgis.core import QgsCoordinateReferenceSystem, QgsMeshLayer
+from qgis.core import QgsCoordinateReferenceSystem, QgsMeshLayer, QgsProcessingFeedback
 
 from landxmlconvertor.classes.landxml_reader import LandXMLReader
 from landxmlconvertor.classes.landxml_writer import LandXMLWriter
+from landxmlconvertor.classes.mesh2dm_reader import Mesh2DMReader
 from landxmlconvertor.classes.mesh2dm_writer import Mesh2DMWriter
+from landxmlconvertor.classes.mesh_operations import compact_mesh
+from landxmlconvertor.classes.processes import process_pool
+from landxmlconvertor.classes.progress import ConversionCanceledError
+from landxmlconvertor.classes.qgs_mesh import create_qgs_mesh
+from landxmlconvertor.tool_convert_landxml_2_mesh import ConvertLandXML2Mesh
 
 
 @pytest.mark.parametrize(
@@ -34,6 +41,35 @@ def test_landxml_to_2dm(test_data_folder, filename):
         assert mesh.dataProvider().faceCount() == 362
 
 
+def test_landxml_to_2dm_from_arrays(test_data_clean):
+    land_xml = LandXMLReader(test_data_clean)
+
+    mesh_2dm_writer = Mesh2DMWriter.from_mesh_arrays(land_xml.all_arrays)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_2dm_file = Path(tmpdir) / "file.2dm"
+
+        mesh_2dm_writer.write(tmp_2dm_file.as_posix())
+
+        mesh = QgsMeshLayer(tmp_2dm_file.as_posix(), "layer", "mdal")
+
+        assert mesh.dataProvider().vertexCount() == 264
+        assert mesh.dataProvider().faceCount() == 362
+
+
+def test_landxml_to_qgs_mesh(test_data_clean):
+    land_xml = LandXMLReader(test_data_clean)
+
+    mesh = create_qgs_mesh(land_xml.all_points, land_xml.all_faces)
+
+    assert mesh.vertexCount() == 264
+    assert mesh.faceCount() == 362
+
+    points = land_xml.all_points
+    assert mesh.vertex(100).x() == points[100].x
+    assert mesh.vertex(100).z() == points[100].z
+
+
 def test_2dm_to_landxml(test_data_folder):
     current_filename = test_data_folder / "mesh.2dm"
 
@@ -53,3 +89,84 @@ def test_2dm_to_landxml(test_data_folder):
         assert landxml_reader.surface_count == 1
         assert len(landxml_reader.all_faces) == 45
         assert len(landxml_reader.all_points) == 29
+
+
+def test_2dm_to_landxml_coordinates(test_data_mesh2dm):
+    mesh_2dm = QgsMeshLayer(test_data_mesh2dm, "layer", "mdal")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_landxml_file = Path(tmpdir) / "file.xml"
+
+        landxml_writer = LandXMLWriter()
+        landxml_writer.add_surface(mesh_2dm)
+        landxml_writer.write(tmp_landxml_file.as_posix())
+
+        landxml_reader = LandXMLReader(tmp_landxml_file.as_posix())
+
+    mesh_2dm_reader = Mesh2DMReader(test_data_mesh2dm)
+
+    assert [(x.x, x.y, x.z) for x in landxml_reader.all_points] == [(x.x, x.y, x.z) for x in mesh_2dm_reader.points]
+    assert [x.id for x in landxml_reader.all_points] == list(range(1, 30))
+
+
+def test_parallel_surfaces_same_as_sequential(test_data_clean):
+    land_xml = LandXMLReader(test_data_clean)
+
+    algorithm = ConvertLandXML2Mesh()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        outputs = {}
+
+        with process_pool(3) as executor:
+            for name, surfaces_executor in [("sequential", None), ("parallel", executor)]:
+                mesh_files = [(Path(tmpdir) / name / f"{x.name}.2dm").as_posix() for x in land_xml.surfaces]
+
+                written = algorithm._write_surfaces(
+                    land_xml.surfaces,
+                    mesh_files,
+                    "2DM",
+                    QgsCoordinateReferenceSystem(),
+                    surfaces_executor,
+                    QgsProcessingFeedback(),
+                )
+
+                assert sorted(written) == sorted(mesh_files)
+
+                outputs[name] = [Path(x).read_text() for x in mesh_files]
+
+        assert outputs["sequential"] == outputs["parallel"]
+
+
+def test_parallel_surfaces_processing(test_data_clean):
+    land_xml = LandXMLReader(test_data_clean)
+
+    sequential = ConvertLandXML2Mesh._map_surfaces(
+        compact_mesh, land_xml.surfaces, None, QgsProcessingFeedback(), (0, 40)
+    )
+
+    with process_pool(3) as executor:
+        parallel = ConvertLandXML2Mesh._map_surfaces(
+            compact_mesh, land_xml.surfaces, executor, QgsProcessingFeedback(), (0, 40)
+        )
+
+    assert [x.name for x in parallel] == [x.name for x in land_xml.surfaces]
+
+    for sequential_surface, parallel_surface in zip(sequential, parallel):
+        assert np.array_equal(sequential_surface.arrays().faces, parallel_surface.arrays().faces)
+        assert np.array_equal(sequential_surface.arrays().z, parallel_surface.arrays().z)
+
+
+def test_canceled_surfaces_write(test_data_clean, tmp_path):
+    land_xml = LandXMLReader(test_data_clean)
+
+    mesh_files = [(tmp_path / f"{x.name}.2dm").as_posix() for x in land_xml.surfaces]
+
+    feedback = QgsProcessingFeedback()
+    feedback.cancel()
+
+    with pytest.raises(ConversionCanceledError):
+        ConvertLandXML2Mesh()._write_surfaces(
+            land_xml.surfaces, mesh_files, "2DM", QgsCoordinateReferenceSystem(), None, feedback
+        )
+
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,61 @@
+import os
+import shutil
+
+from landxmlconvertor.classes.landxml_cache import LandXMLReaderCache
+
+
+def test_cached_reader(test_data_clean):
+    cache = LandXMLReaderCache()
+
+    assert cache.peek(test_data_clean, streaming=True) is None
+
+    land_xml = cache.get(test_data_clean, streaming=True)
+
+    assert cache.get(test_data_clean, streaming=True) is land_xml
+    assert cache.peek(test_data_clean, streaming=True) is land_xml
+    assert len(cache) == 1
+    assert cache.memory_used == land_xml.nbytes
+
+    # different reader options are cached separately, side by side
+    land_xml_tree = cache.get(test_data_clean, progress=lambda x: True)
+
+    assert land_xml_tree is not land_xml
+    assert land_xml_tree.progress is None
+    assert len(cache) == 2
+    assert cache.get(test_data_clean, streaming=True) is land_xml
+
+
+def test_modified_file(test_data_clean, tmp_path):
+    file = (tmp_path / "surface.xml").as_posix()
+    shutil.copy(test_data_clean, file)
+
+    cache = LandXMLReaderCache()
+
+    land_xml = cache.get(file, streaming=True)
+    cache.get(file)
+
+    stat = os.stat(file)
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.peek(file, streaming=True) is None
+    assert cache.get(file, streaming=True) is not land_xml
+    assert len(cache) == 1
+
+
+def test_memory_budget(test_data_folder, test_data_clean):
+    nbytes = LandXMLReaderCache().get(test_data_clean).nbytes
+
+    cache = LandXMLReaderCache(memory_budget=nbytes)
+
+    cache.get(test_data_clean)
+    assert len(cache) == 1
+
+    # least recently used reader is evicted
+    cache.get((test_data_folder / "Example_Clean_without_schema.xml").as_posix())
+    assert cache.peek(test_data_clean) is None
+    assert cache.memory_used <= nbytes
+
+    # reader bigger than budget is not cached
+    cache = LandXMLReaderCache(memory_budget=0)
+    cache.get(test_data_clean)
+    assert len(cache) == 0
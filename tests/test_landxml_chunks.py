@@ -0,0 +1,141 @@
+import mmap
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from landxmlconvertor.classes import landxml_chunks
+from landxmlconvertor.classes.landxml_chunks import decode_faces_chunk, decode_points_chunk, find_blocks
+from landxmlconvertor.classes.landxml_reader import LandXMLReader
+
+SURFACE_WITH_HIDDEN_FACES = """<?xml version="1.0"?>
+<LandXML xmlns="http://www.landxml.org/schema/LandXML-1.2" version="1.2">
+  <Surfaces>
+    <Surface name="s">
+      <Definition surfType="TIN">
+        <Pnts>{points}</Pnts>
+        <Faces>{faces}</Faces>
+      </Definition>
+    </Surface>
+  </Surfaces>
+</LandXML>
+"""
+
+
+# small surfaces, so that workers do not take long to decode them
+SYNTHETIC_POINTS = [5_000]
+
+
+@pytest.mark.parametrize("synthetic_landxml", SYNTHETIC_POINTS, indirect=True)
+def test_find_blocks(synthetic_landxml):
+    with open(synthetic_landxml, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        blocks = find_blocks(data)
+
+        assert [x.kind for x in blocks] == ["Pnts", "Faces", "Pnts", "Faces"]
+
+        for block in blocks:
+            chunks = block.chunks(data, 4096)
+
+            assert len(chunks) > 1
+            assert chunks[0][0] == block.start
+            assert chunks[-1][1] == block.end
+            assert all(x[1] == y[0] for x, y in zip(chunks, chunks[1:]))
+            assert all(data[end - 1 : end] == b">" for _, end in chunks[:-1])
+
+        points = [decode_points_chunk(synthetic_landxml, *x) for x in blocks[0].chunks(data, 4096)]
+
+    expected = LandXMLReader(synthetic_landxml).get_surface_arrays(0)
+
+    assert np.array_equal(np.concatenate([x[0] for x in points]), expected.vertex_ids)
+    assert np.array_equal(np.concatenate([x[3] for x in points]), expected.z)
+
+
+def test_decode_faces_chunk(tmp_path):
+    file = tmp_path / "faces.xml"
+    file.write_text('<Faces><F>1 2 3</F><F i="1">2 3 4</F><F>1 2 3 4</F></Faces>')
+
+    face_numbers, faces, face_count = decode_faces_chunk(file.as_posix(), len("<Faces>"), len(file.read_text()) - 8)
+
+    assert face_numbers.tolist() == [1, 3]
+    assert faces.tolist() == [[1, 2, 3, -1], [1, 2, 3, 4]]
+    assert face_count == 3
+
+
+@pytest.mark.parametrize("synthetic_landxml", SYNTHETIC_POINTS, indirect=True)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_mmap_same_as_expat(synthetic_landxml, monkeypatch, workers, assert_same_surfaces):
+    monkeypatch.setattr(landxml_chunks, "CHUNK_SIZE", 16 * 1024)
+
+    assert_same_surfaces(
+        LandXMLReader(synthetic_landxml, parser="mmap", workers=workers), LandXMLReader(synthetic_landxml)
+    )
+
+
+def test_mmap_hidden_faces(tmp_path, monkeypatch, assert_same_surfaces):
+    """Numbers of faces continue across chunks, hidden faces are counted too."""
+    monkeypatch.setattr(landxml_chunks, "CHUNK_SIZE", 64)
+
+    points = "".join(f'<P id="{i + 1}">{i} {i % 7} {i * 0.5}</P>' for i in range(100))
+    hidden = ' i="1"'
+    faces = "".join(f"<F{hidden if i % 3 == 0 else ''}>{i + 1} {i + 2} {i + 3}</F>" for i in range(98))
+
+    file = tmp_path / "surface.xml"
+    file.write_text(SURFACE_WITH_HIDDEN_FACES.format(points=points, faces=faces))
+
+    land_xml = LandXMLReader(file.as_posix(), parser="mmap", workers=1)
+
+    assert_same_surfaces(land_xml, LandXMLReader(file.as_posix()))
+    assert land_xml.get_surface_arrays(0).face_ids[:3].tolist() == [2, 3, 5]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_mmap_invalid_face(tmp_path, monkeypatch, workers):
+    """Invalid face is reported by its number in the surface, not in the chunk, as by other backends."""
+    monkeypatch.setattr(landxml_chunks, "CHUNK_SIZE", 64)
+
+    points = "".join(f'<P id="{i + 1}">{i} {i % 7} {i * 0.5}</P>' for i in range(100))
+    faces = [f"<F>{i + 1} {i + 2} {i + 3}</F>" for i in range(98)]
+    faces[60] = "<F>61 x 63</F>"
+    faces[90] = "<F>91 92 y</F>"
+
+    file = tmp_path / "surface.xml"
+    file.write_text(SURFACE_WITH_HIDDEN_FACES.format(points=points, faces="".join(faces)))
+
+    with pytest.raises(ValueError) as expat_error:
+        LandXMLReader(file.as_posix(), parser="expat")
+
+    with pytest.raises(ValueError) as mmap_error:
+        LandXMLReader(file.as_posix(), parser="mmap", workers=workers)
+
+    assert "`61`" in str(expat_error.value)
+    assert str(mmap_error.value) == str(expat_error.value)
+
+
+@pytest.mark.parametrize(
+    "points",
+    [
+        # block found inside of comment does not match any element
+        '<!-- <Pnts><P id="9">0 0 0</P></Pnts> --><P id="1">0 0 1</P><P id="2">0 1 2</P><P id="3">1 0 3</P>',
+        # entity declared in the document cannot be resolved in single chunk
+        '<P id="1">0 0 1</P><P id="2">&coordinates;</P><P id="3">1 0 3</P>',
+    ],
+)
+def test_mmap_fallback(tmp_path, points, assert_same_surfaces):
+    text = SURFACE_WITH_HIDDEN_FACES.format(points=points, faces="<F>1 2 3</F>")
+    text = text.replace("<LandXML ", '<!DOCTYPE LandXML [<!ENTITY coordinates "0 1 2">]>\n<LandXML ', 1)
+
+    file = tmp_path / "surface.xml"
+    file.write_text(text)
+
+    land_xml = LandXMLReader(file.as_posix(), parser="mmap", workers=1)
+
+    assert_same_surfaces(land_xml, LandXMLReader(file.as_posix()))
+    assert land_xml.get_surface_arrays(0).vertex_ids.tolist() == [1, 2, 3]
+
+
+def test_mmap_empty_file(tmp_path):
+    file = tmp_path / "empty.xml"
+    file.write_bytes(b"")
+
+    with pytest.raises(ET.ParseError):
+        LandXMLReader(file.as_posix(), parser="mmap")
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from landxmlconvertor.classes import landxml_decoder
+from landxmlconvertor.classes.landxml_decoder import decode_coordinates, decode_faces, decode_rows
+from landxmlconvertor.classes.landxml_reader import LandXMLReader
+from landxmlconvertor.classes.mesh_arrays import NO_VERTEX
+
+MESSY_LANDXML = """<?xml version="1.0"?>
+<LandXML>
+  <Surfaces>
+    <Surface name="Messy">
+      <Definition surfType="TIN">
+        <Pnts>
+          <P id="1">0.0  0.0   1.0</P>
+          <P id="2">
+            0.0
+            1.0
+            2.0
+          </P>
+          <P id=" 3 ">1.0\t1.0\t3.0</P>
+          <P id="4"> 1.0 0.0 4.0 </P>
+        </Pnts>
+        <Faces>
+          <F>1  2 3</F>
+          <F i="1">1 3 4</F>
+          <F>
+            1 3 4 2
+          </F>
+        </Faces>
+      </Definition>
+    </Surface>
+  </Surfaces>
+</LandXML>
+"""
+
+
+def test_decode_rows():
+    values, counts = decode_rows(["1 2", "  3\t4\n5 ", None, "6"], np.float64)
+
+    np.testing.assert_array_equal(values, [1, 2, 3, 4, 5, 6])
+    np.testing.assert_array_equal(counts, [2, 3, 0, 1])
+
+    with pytest.raises(landxml_decoder.RowDecodeError) as e:
+        decode_rows(["1 2", "3 x", "4"], np.float64)
+    assert e.value.row == 1
+
+    with pytest.raises(landxml_decoder.RowDecodeError) as e:
+        decode_rows(["1 2 3", "4 5.5 6"], np.int64)
+    assert e.value.row == 1
+
+
+def test_decode_coordinates():
+    coordinates = decode_coordinates(["10 20 30", " 11\n21  31 "])
+
+    np.testing.assert_array_equal(coordinates, [[10, 20, 30], [11, 21, 31]])
+
+    with pytest.raises(ValueError, match="Invalid point `2` in surface `S`: `1 2`"):
+        decode_coordinates(["1 2 3", "1 2", "1 2 3"], "S", ["1", "2", "3"])
+
+    with pytest.raises(ValueError, match="Invalid point `3` in surface `S`: `1 2 z`"):
+        decode_coordinates(["1 2 3", "1 2 3", "1 2 z"], "S", ["1", "2", "3"])
+
+
+def test_decode_faces():
+    np.testing.assert_array_equal(decode_faces([1, 2], ["1 2 3", "2 3 4"]), [[1, 2, 3], [2, 3, 4]])
+    np.testing.assert_array_equal(decode_faces([1, 2], ["1 2 3 4", "2 3 4"]), [[1, 2, 3, 4], [2, 3, 4, NO_VERTEX]])
+
+    with pytest.raises(ValueError, match="Face `8` has 5 vertices"):
+        decode_faces([7, 8], ["1 2 3", "1 2 3 4 5"])
+
+    with pytest.raises(ValueError, match="Invalid face `7` in surface `S`"):
+        decode_faces([7, 8], ["1 2 3.5", "1 2 3"], "S")
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_messy_whitespace(tmp_path, monkeypatch, streaming):
+    monkeypatch.setattr(landxml_decoder, "DECODE_CHUNK_SIZE", 2)
+
+    file = tmp_path / "messy.xml"
+    file.write_text(MESSY_LANDXML)
+
+    mesh_arrays = LandXMLReader(file.as_posix(), streaming=streaming).get_surface_arrays(0)
+
+    np.testing.assert_array_equal(mesh_arrays.vertex_ids, [1, 2, 3, 4])
+    np.testing.assert_array_equal(mesh_arrays.x, [0, 1, 1, 0])
+    np.testing.assert_array_equal(mesh_arrays.y, [0, 0, 1, 1])
+    np.testing.assert_array_equal(mesh_arrays.z, [1, 2, 3, 4])
+
+    np.testing.assert_array_equal(mesh_arrays.face_ids, [1, 3])
+    np.testing.assert_array_equal(mesh_arrays.faces, [[1, 2, 3, NO_VERTEX], [1, 3, 4, 2]])
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_invalid_point(tmp_path, streaming):
+    file = tmp_path / "invalid.xml"
+    file.write_text(MESSY_LANDXML.replace("1.0\t1.0\t3.0", "1.0 1,0 3.0"))
+
+    with pytest.raises(ValueError, match="Invalid point ` 3 ` in surface `Messy`"):
+        LandXMLReader(file.as_posix(), streaming=streaming)
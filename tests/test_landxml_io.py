@@ -0,0 +1,95 @@
+import gzip
+import zipfile
+
+import pytest
+
+from landxmlconvertor.classes import landxml_reader
+from landxmlconvertor.classes.landxml_io import LandXMLInputFile, document_size, landxml_base_name
+from landxmlconvertor.classes.landxml_reader import LandXMLReader
+from landxmlconvertor.classes.landxml_writer import LandXMLWriter
+
+
+@pytest.fixture
+def compressed_files(test_data_clean, tmp_path):
+    data = open(test_data_clean, "rb").read()
+
+    gzip_file = tmp_path / "Example_Clean.xml.gz"
+    gzip_file.write_bytes(gzip.compress(data))
+
+    zip_file = tmp_path / "Example_Clean.zip"
+    with zipfile.ZipFile(zip_file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("readme.txt", "not a LandXML file")
+        archive.writestr("data/Example_Clean.xml", data)
+
+    return [gzip_file.as_posix(), zip_file.as_posix()]
+
+
+@pytest.mark.parametrize("parser", landxml_reader.PARSERS)
+def test_read_compressed(test_data_clean, compressed_files, parser, assert_same_surfaces):
+    if parser == "lxml" and not landxml_reader.lxml_available():
+        pytest.skip("lxml not installed")
+
+    expected = LandXMLReader(test_data_clean)
+
+    for file in compressed_files:
+        assert_same_surfaces(LandXMLReader(file, parser=parser), expected)
+
+
+def test_scan_compressed(test_data_clean, compressed_files):
+    expected = LandXMLReader.scan(test_data_clean)
+
+    for file in compressed_files:
+        land_xml_scan = LandXMLReader.scan(file)
+
+        assert land_xml_scan.surface_count == expected.surface_count
+        assert land_xml_scan.point_count == expected.point_count
+        assert land_xml_scan.face_count == expected.face_count
+
+
+def test_input_file(test_data_clean, compressed_files, tmp_path):
+    data = open(test_data_clean, "rb").read()
+
+    for file in [test_data_clean] + compressed_files:
+        assert document_size(file) == len(data)
+
+        with LandXMLInputFile(file) as input_file:
+            assert input_file.read() == data
+            assert input_file.tell() == input_file.size
+
+    archive_file = tmp_path / "empty.zip"
+    with zipfile.ZipFile(archive_file, "w") as archive:
+        archive.writestr("readme.txt", "not a LandXML file")
+
+    with pytest.raises(ValueError, match="No LandXML file in the archive"):
+        LandXMLReader(archive_file.as_posix())
+
+    broken_file = tmp_path / "broken.zip"
+    broken_file.write_bytes(b"PK\x03\x04 broken")
+
+    with pytest.raises(ValueError, match="Invalid zip archive"):
+        LandXMLReader(broken_file.as_posix())
+
+
+def test_write_compressed(test_data_clean, tmp_path, assert_same_surfaces):
+    land_xml = LandXMLReader(test_data_clean)
+
+    landxml_writer = LandXMLWriter()
+    for surface in land_xml.surfaces:
+        landxml_writer.add_surface_arrays(surface.name, surface.arrays())
+
+    landxml_writer.write((tmp_path / "file.xml").as_posix())
+    landxml_writer.write((tmp_path / "file.xml.gz").as_posix())
+
+    assert gzip.decompress((tmp_path / "file.xml.gz").read_bytes()) == (tmp_path / "file.xml").read_bytes()
+
+    assert_same_surfaces(
+        LandXMLReader((tmp_path / "file.xml.gz").as_posix(), streaming=True),
+        LandXMLReader((tmp_path / "file.xml").as_posix(), streaming=True),
+    )
+
+
+def test_landxml_base_name():
+    assert landxml_base_name("folder/surface.xml") == "folder/surface"
+    assert landxml_base_name("surface.xml.gz") == "surface"
+    assert landxml_base_name("surface.ZIP") == "surface"
+    assert landxml_base_name("surface") == "surface"
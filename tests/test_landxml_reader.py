@@ -1,11 +1,22 @@
+import os
 import xml.etree.ElementTree as ET
 
+import numpy as np
 import pytest
 from qgis.core import QgsCoordinateReferenceSystem
 
+from landxmlconvertor.classes import landxml_reader
 from landxmlconvertor.classes.landxml_elements import LandXMLSurface
 from landxmlconvertor.classes.landxml_reader import LandXMLReader
 from landxmlconvertor.classes.mesh_elements import MeshFace, MeshVertex
+from landxmlconvertor.classes.mesh_operations import ClipArea
+
+STREAMING_PARSERS = [
+    "iterparse",
+    "expat",
+    "mmap",
+    pytest.param("lxml", marks=pytest.mark.skipif(not landxml_reader.lxml_available(), reason="lxml not installed")),
+]
 
 
 @pytest.mark.parametrize(
@@ -103,3 +114,191 @@ def test_data_2(test_data_folder):
     assert landxml_reader.surface_count == 1
     assert len(landxml_reader.all_faces) == 6448
     assert len(landxml_reader.all_points) == 3330
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        ("Example_Clean.xml"),
+        ("Example_Clean_without_schema.xml"),
+        ("3D_modell_underlag_skyfall_20230915.xml"),
+        ("land_xml_empty_surface.xml"),
+        ("land_xml_no_surface.xml"),
+    ],
+)
+@pytest.mark.parametrize("parser", STREAMING_PARSERS)
+def test_streaming_same_as_tree(test_data_folder, filename, parser):
+    current_filename = test_data_folder / filename
+
+    land_xml = LandXMLReader(current_filename.as_posix())
+    land_xml_streamed = LandXMLReader(current_filename.as_posix(), parser=parser)
+
+    assert land_xml_streamed.streaming
+    assert land_xml_streamed.xml_tree is None
+    assert land_xml_streamed.xml_root.tag == land_xml.xml_root.tag
+    assert land_xml_streamed.namespace_prefix == land_xml.namespace_prefix
+    assert land_xml_streamed.crs() == land_xml.crs()
+    assert land_xml_streamed.surface_count == land_xml.surface_count
+
+    for surface, surface_streamed in zip(land_xml.surfaces, land_xml_streamed.surfaces):
+        assert surface_streamed.name == surface.name
+        assert surface_streamed.surface is None
+        assert [(x.id, x.x, x.y, x.z) for x in surface_streamed.points()] == [
+            (x.id, x.x, x.y, x.z) for x in surface.points()
+        ]
+        assert [(x.id, x.points_ids) for x in surface_streamed.faces()] == [
+            (x.id, x.points_ids) for x in surface.faces()
+        ]
+
+
+@pytest.mark.parametrize("parser", STREAMING_PARSERS)
+def test_streaming_errors(test_data_folder, tmp_path, parser):
+    with pytest.raises(ValueError, match="Not a valid LandXML file"):
+        LandXMLReader((test_data_folder / "just_xml.xml").as_posix(), parser=parser)
+
+    with pytest.raises(ValueError, match="Unsupported namespace: "):
+        LandXMLReader((test_data_folder / "land_xml_with_unsupported_schema.xml").as_posix(), parser=parser)
+
+    file = tmp_path / "broken.xml"
+    file.write_text((test_data_folder / "Example_Clean.xml").read_text()[:-100])
+
+    with pytest.raises(ET.ParseError):
+        LandXMLReader(file.as_posix(), parser=parser)
+
+
+@pytest.mark.parametrize("parser", STREAMING_PARSERS)
+def test_streaming_elements_one_by_one(tmp_path, parser):
+    """Texts split by comments and missing texts are read the same way as in element tree."""
+    file = tmp_path / "surface.xml"
+    file.write_text("""<?xml version="1.0"?>
+<LandXML xmlns="http://www.landxml.org/schema/LandXML-1.2" version="1.2">
+  <Surfaces>
+    <Surface name="s">
+      <Definition surfType="TIN">
+        <Pnts>
+          <P id="1">0 0 1</P>
+          <P id="2">0 1<!-- comment --> 2</P>
+          <P id="3">1 0 3</P>
+        </Pnts>
+        <Faces>
+          <F i="1">1 2 3</F>
+          <F>1 2 3</F>
+        </Faces>
+      </Definition>
+    </Surface>
+  </Surfaces>
+</LandXML>
+""")
+
+    land_xml = LandXMLReader(file.as_posix())
+    land_xml_streamed = LandXMLReader(file.as_posix(), parser=parser)
+
+    assert [(x.id, x.x, x.y, x.z) for x in land_xml_streamed.get_surface_points(0)] == [
+        (x.id, x.x, x.y, x.z) for x in land_xml.get_surface_points(0)
+    ]
+    assert [(x.id, x.points_ids) for x in land_xml_streamed.get_surface_faces(0)] == [(2, [1, 2, 3])]
+
+
+def test_parser_selection(test_data_clean, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+
+    assert LandXMLReader(test_data_clean).parser == "etree"
+    assert LandXMLReader(test_data_clean, streaming=True).parser == "iterparse"
+    assert LandXMLReader(test_data_clean, streaming=True, parser="etree").streaming is False
+
+    monkeypatch.setattr(landxml_reader, "lxml_available", lambda: False)
+    assert LandXMLReader(test_data_clean, parser="auto").parser == "etree"
+
+    monkeypatch.setattr(landxml_reader, "ETREE_MAX_SIZE", 1024)
+    assert LandXMLReader(test_data_clean, parser="auto").parser == "expat"
+
+    monkeypatch.setattr(landxml_reader, "lxml_available", lambda: True)
+    assert landxml_reader.select_parser(test_data_clean) == "lxml"
+
+    monkeypatch.setattr(landxml_reader, "LXML_MAX_SIZE", 1024)
+    assert landxml_reader.select_parser(test_data_clean) == "expat"
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    assert landxml_reader.select_parser(test_data_clean) == "mmap"
+
+    with pytest.raises(ValueError, match="Unknown parser `sax`"):
+        LandXMLReader(test_data_clean, parser="sax")
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        ("Example_Clean.xml"),
+        ("Example_Clean_without_schema.xml"),
+        ("3D_modell_underlag_skyfall_20230915.xml"),
+        ("land_xml_empty_surface.xml"),
+        ("land_xml_no_surface.xml"),
+    ],
+)
+def test_scan_same_as_reader(test_data_folder, filename):
+    current_filename = test_data_folder / filename
+
+    land_xml = LandXMLReader(current_filename.as_posix())
+    land_xml_scan = LandXMLReader.scan(current_filename.as_posix())
+
+    assert land_xml_scan.namespace == land_xml.namespace
+    assert land_xml_scan.crs() == land_xml.crs()
+    assert land_xml_scan.surface_count == land_xml.surface_count
+    assert land_xml_scan.point_count == len(land_xml.all_points)
+    assert land_xml_scan.face_count == len(land_xml.all_faces)
+
+    for surface, surface_scan in zip(land_xml.surfaces, land_xml_scan.surfaces):
+        mesh_arrays = surface.arrays()
+
+        assert surface_scan.name == surface.name
+        assert surface_scan.empty() == surface.empty()
+        assert surface_scan.point_count == mesh_arrays.vertex_count
+        assert surface_scan.face_count == mesh_arrays.face_count
+
+        if surface.empty():
+            assert surface_scan.extent() is None
+        else:
+            assert surface_scan.extent() == (
+                mesh_arrays.x.min(),
+                mesh_arrays.y.min(),
+                mesh_arrays.x.max(),
+                mesh_arrays.y.max(),
+            )
+            assert (surface_scan.z_min, surface_scan.z_max) == (mesh_arrays.z.min(), mesh_arrays.z.max())
+
+
+def test_scan_errors(test_data_folder):
+    with pytest.raises(ValueError, match="Not a valid LandXML file"):
+        LandXMLReader.scan((test_data_folder / "just_xml.xml").as_posix())
+
+    with pytest.raises(ValueError, match="Unsupported namespace: "):
+        LandXMLReader.scan((test_data_folder / "land_xml_with_unsupported_schema.xml").as_posix())
+
+
+@pytest.mark.parametrize("parser", ["etree"] + STREAMING_PARSERS)
+def test_clip_area(test_data_clean, monkeypatch, parser):
+    monkeypatch.setattr(landxml_reader, "CLIP_CHUNK_SIZE", 100)
+
+    land_xml = LandXMLReader(test_data_clean)
+
+    mesh_arrays = land_xml.get_surface_arrays(0)
+    x_min, x_max = np.percentile(mesh_arrays.x, [25, 75])
+    y_min, y_max = np.percentile(mesh_arrays.y, [25, 75])
+    clip_area = ClipArea((x_min, y_min, x_max, y_max))
+
+    land_xml_clipped = LandXMLReader(test_data_clean, parser=parser, clip_area=clip_area)
+
+    assert land_xml_clipped.surface_count == land_xml.surface_count
+
+    for surface, surface_clipped in zip(land_xml.surfaces, land_xml_clipped.surfaces):
+        expected = clip_area.clip(surface.arrays())
+        clipped = surface_clipped.arrays()
+
+        assert np.array_equal(clipped.vertex_ids, expected.vertex_ids)
+        assert np.array_equal(clipped.face_ids, expected.face_ids)
+        assert np.array_equal(clipped.faces, expected.faces)
+
+    clipped = land_xml_clipped.get_surface_arrays(0)
+
+    assert 0 < clipped.face_count < mesh_arrays.face_count
+    assert clipped.vertex_count < mesh_arrays.vertex_count
@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from landxmlconvertor.classes.landxml_reader import LandXMLReader
+from landxmlconvertor.classes.landxml_sidecar import MANIFEST_FILE, LandXMLSidecar, sidecar_path
+from landxmlconvertor.classes.mesh_operations import ClipArea
+
+
+@pytest.fixture
+def landxml_copy(test_data_clean, tmp_path) -> str:
+    file = (tmp_path / "surface.xml").as_posix()
+    shutil.copy(test_data_clean, file)
+    return file
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_sidecar(landxml_copy, streaming, assert_same_surfaces):
+    land_xml = LandXMLReader(landxml_copy, streaming=streaming, sidecar=True)
+
+    assert not land_xml.from_sidecar
+    assert os.path.isfile(os.path.join(sidecar_path(landxml_copy), MANIFEST_FILE))
+
+    cached = LandXMLReader(landxml_copy, streaming=streaming, sidecar=True)
+
+    assert cached.from_sidecar
+    assert cached.crs() == land_xml.crs()
+    assert_same_surfaces(land_xml, cached)
+
+    # arrays are memory-mapped, not copied
+    assert not cached.surfaces[0].arrays().x.flags.writeable
+
+
+def test_outdated_sidecar(landxml_copy):
+    LandXMLReader(landxml_copy, streaming=True, sidecar=True)
+
+    # modified content with the same size and modification time
+    stat = os.stat(landxml_copy)
+    with open(landxml_copy, "r+b") as file:
+        content = file.read()
+        file.seek(0)
+        file.write(content.replace(b"<Surfaces>", b"<Surfaces >", 1)[: len(content)])
+    os.utime(landxml_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert LandXMLSidecar.load(landxml_copy) is None
+
+    # outdated sidecar is replaced
+    assert not LandXMLReader(landxml_copy, streaming=True, sidecar=True).from_sidecar
+    assert LandXMLSidecar.load(landxml_copy) is not None
+
+    # only modification time changed
+    stat = os.stat(landxml_copy)
+    os.utime(landxml_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert LandXMLSidecar.load(landxml_copy) is None
+
+
+def test_broken_sidecar(landxml_copy):
+    LandXMLReader(landxml_copy, streaming=True, sidecar=True)
+
+    os.remove(os.path.join(sidecar_path(landxml_copy), "0_faces.npy"))
+    assert LandXMLSidecar.load(landxml_copy) is None
+
+    with open(os.path.join(sidecar_path(landxml_copy), MANIFEST_FILE), "w", encoding="utf-8") as file:
+        json.dump({"version": "unknown"}, file)
+    assert LandXMLSidecar.load(landxml_copy) is None
+
+    LandXMLSidecar.remove(landxml_copy)
+    assert not os.path.exists(sidecar_path(landxml_copy))
+
+
+def test_sidecar_clip_area(landxml_copy, assert_same_surfaces):
+    land_xml = LandXMLReader(landxml_copy, streaming=True)
+    x, y = land_xml.surfaces[0].arrays().x, land_xml.surfaces[0].arrays().y
+    clip_area = ClipArea((x.min(), y.min(), (x.min() + x.max()) / 2, (y.min() + y.max()) / 2))
+
+    # clipped surfaces are not stored
+    LandXMLReader(landxml_copy, streaming=True, clip_area=clip_area, sidecar=True)
+    assert LandXMLSidecar.load(landxml_copy) is None
+
+    LandXMLReader(landxml_copy, streaming=True, sidecar=True)
+
+    clipped = LandXMLReader(landxml_copy, streaming=True, clip_area=clip_area, sidecar=True)
+
+    assert clipped.from_sidecar
+    assert_same_surfaces(LandXMLReader(landxml_copy, streaming=True, clip_area=clip_area), clipped)
@@ -0,0 +1,88 @@
+import tempfile
+from pathlib import Path
+
+from landxmlconvertor.classes.landxml_reader import LandXMLReader
+from landxmlconvertor.classes.landxml_writer import LandXMLWriter
+from landxmlconvertor.classes.mesh_arrays import MeshArrays
+from landxmlconvertor.classes.qgs_mesh import mesh_arrays_from_qgs_mesh
+from landxmlconvertor.classes.xml_formatter import XmlFormatter
+
+
+def test_write_same_as_pretty_xml(test_data_clean):
+    land_xml = LandXMLReader(test_data_clean)
+
+    landxml_writer = LandXMLWriter()
+
+    for surface in land_xml.surfaces:
+        landxml_writer.add_surface_arrays(f'{surface.name} & <"name">', surface.arrays())
+
+    landxml_writer.add_surface_arrays("empty", MeshArrays.empty())
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_landxml_file = Path(tmpdir) / "file.xml"
+
+        landxml_writer.write(tmp_landxml_file.as_posix())
+
+        text = tmp_landxml_file.read_text(encoding="utf-8")
+
+    assert text == XmlFormatter.elementToPrettyXml(landxml_writer.LandXML).decode("utf-8")
+
+
+def test_write_no_surfaces():
+    landxml_writer = LandXMLWriter()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_landxml_file = Path(tmpdir) / "file.xml"
+
+        landxml_writer.write(tmp_landxml_file.as_posix())
+
+        text = tmp_landxml_file.read_text(encoding="utf-8")
+
+    assert "<Surfaces/>" in text
+    assert text == XmlFormatter.elementToPrettyXml(landxml_writer.LandXML).decode("utf-8")
+
+
+class PolygonMesh:
+    """Minimal stand-in of `QgsMesh` with faces of any number of vertices."""
+
+    class Vertex:
+        def __init__(self, x: float, y: float, z: float) -> None:
+            self.x = lambda: x
+            self.y = lambda: y
+            self.z = lambda: z
+
+    def __init__(self, vertices, faces) -> None:
+        self.vertices = [self.Vertex(*x) for x in vertices]
+        self.faces = faces
+
+    def vertexCount(self) -> int:
+        return len(self.vertices)
+
+    def faceCount(self) -> int:
+        return len(self.faces)
+
+    def vertex(self, index: int) -> "PolygonMesh.Vertex":
+        return self.vertices[index]
+
+    def face(self, index: int):
+        return self.faces[index]
+
+
+def test_write_pentagon_face(tmp_path):
+    mesh = PolygonMesh(
+        [(0, 0, 1), (2, 0, 2), (3, 2, 3), (1, 3, 4), (-1, 2, 5), (4, 0, 6)],
+        [[0, 1, 2, 3, 4], [1, 5, 2]],
+    )
+
+    mesh_arrays = mesh_arrays_from_qgs_mesh(mesh)
+
+    assert mesh_arrays.faces.tolist() == [[1, 2, 3], [1, 3, 4], [1, 4, 5], [2, 6, 3]]
+    assert mesh_arrays.face_ids.tolist() == [1, 2, 3, 4]
+
+    landxml_writer = LandXMLWriter()
+    landxml_writer.add_surface_arrays("pentagon", mesh_arrays)
+    landxml_writer.write((tmp_path / "file.xml").as_posix())
+
+    land_xml = LandXMLReader((tmp_path / "file.xml").as_posix())
+
+    assert land_xml.get_surface_arrays(0).faces.tolist() == mesh_arrays.faces.tolist()
@@ -0,0 +1,158 @@
+import numpy as np
+import pytest
+
+from landxmlconvertor.classes.landxml_elements import LandXMLSurface
+from landxmlconvertor.classes.landxml_reader import LandXMLReader
+from landxmlconvertor.classes.mesh_arrays import NO_VERTEX, MeshArrays
+from landxmlconvertor.classes.mesh_elements import MeshFace, MeshVertex
+from landxmlconvertor.classes.mesh_views import MeshFacesView, MeshVerticesView, _MeshArraysView
+
+
+def test_surface_arrays(test_data_clean):
+    land_xml = LandXMLReader(test_data_clean)
+
+    mesh_arrays = land_xml.get_surface_arrays(0)
+
+    assert isinstance(mesh_arrays, MeshArrays)
+    assert mesh_arrays.vertex_count == 29
+    assert mesh_arrays.face_count == 45
+
+    assert mesh_arrays.vertex_ids.dtype == np.int64
+    assert mesh_arrays.x.dtype == np.float64
+    assert mesh_arrays.faces.shape == (45, 3)
+    assert mesh_arrays.faces.dtype == np.int64
+
+    points = land_xml.get_surface_points(0)
+    assert mesh_arrays.vertex_ids.tolist() == [x.id for x in points]
+    assert mesh_arrays.x.tolist() == [x.x for x in points]
+    assert mesh_arrays.y.tolist() == [x.y for x in points]
+    assert mesh_arrays.z.tolist() == [x.z for x in points]
+
+    faces = land_xml.get_surface_faces(0)
+    assert mesh_arrays.face_ids.tolist() == [x.id for x in faces]
+    assert mesh_arrays.faces.tolist() == [x.points_ids for x in faces]
+
+
+def test_all_arrays(test_data_clean):
+    land_xml = LandXMLReader(test_data_clean)
+
+    mesh_arrays = land_xml.all_arrays
+
+    assert mesh_arrays.vertex_count == 29 + 92 + 143
+    assert mesh_arrays.face_count == 45 + 138 + 179
+
+    assert mesh_arrays.vertex_ids.tolist() == [x.id for x in land_xml.all_points]
+    assert mesh_arrays.faces.tolist() == [x.points_ids for x in land_xml.all_faces]
+
+    # ids are dense across surfaces
+    assert mesh_arrays.vertex_ids.tolist() == list(range(1, mesh_arrays.vertex_count + 1))
+    assert mesh_arrays.face_ids.tolist() == list(range(1, mesh_arrays.face_count + 1))
+    assert mesh_arrays.has_dense_ids()
+
+    # faces reference the same coordinates as in the individual surfaces
+    start = 0
+    for surface in land_xml.surfaces:
+        surface_arrays = surface.arrays()
+        end = start + surface_arrays.face_count
+
+        merged_indices = mesh_arrays.face_vertex_indices()[start:end]
+        surface_indices = surface_arrays.face_vertex_indices()
+
+        assert np.array_equal(mesh_arrays.x[merged_indices], surface_arrays.x[surface_indices])
+        assert np.array_equal(mesh_arrays.z[merged_indices], surface_arrays.z[surface_indices])
+
+        start = end
+
+
+def test_mixed_faces():
+    points = [MeshVertex(i + 1, float(i), float(i % 2), 0.0) for i in range(5)]
+    faces = [MeshFace(1, [1, 2, 3]), MeshFace(2, [2, 3, 4, 5])]
+
+    mesh_arrays = MeshArrays.from_mesh_elements(points, faces)
+
+    assert mesh_arrays.faces.shape == (2, 4)
+    assert mesh_arrays.faces[0, 3] == NO_VERTEX
+    assert mesh_arrays.face_sizes().tolist() == [3, 4]
+    assert [x.points_ids for x in MeshFacesView([mesh_arrays])] == [[1, 2, 3], [2, 3, 4, 5]]
+
+    joined = MeshArrays.concatenate([MeshArrays.from_mesh_elements(points, faces[:1]), mesh_arrays])
+
+    assert joined.vertex_count == 10
+    assert joined.faces.shape == (3, 4)
+    assert joined.faces[:, 3].tolist() == [NO_VERTEX, NO_VERTEX, 5]
+
+
+def test_surface_views(test_data_clean):
+    land_xml = LandXMLReader(test_data_clean)
+
+    surface = LandXMLSurface.from_mesh_arrays("surface", 1, land_xml.surfaces[1].arrays())
+
+    points = surface.points()
+
+    assert isinstance(points, MeshVerticesView)
+    assert len(points) == 92
+    assert [x.id for x in points[:3]] == surface.arrays().vertex_ids[:3].tolist()
+    assert surface.faces()[10].points_ids == surface.arrays().faces[10].tolist()
+
+    # views are read-only, modifying returned element does not change the surface
+    points[0].apply_id_offset(1)
+    assert points[0].id == surface.arrays().vertex_ids[0]
+
+    all_points = land_xml.all_points
+    assert all_points[29].id == 30
+    assert (all_points[29].x, all_points[29].y, all_points[29].z) == (points[0].x, points[0].y, points[0].z)
+    assert [x.id for x in all_points] == land_xml.all_arrays.vertex_ids.tolist()
+
+    # merged arrays are created once
+    assert land_xml.merged_surfaces() is land_xml.merged_surfaces()
+    assert land_xml.all_arrays is land_xml.all_arrays
+    assert land_xml.all_faces.parts == land_xml.all_points.parts
+
+
+def test_face_vertex_indices():
+    points = [MeshVertex(vertex_id, float(vertex_id), 0.0, 0.0) for vertex_id in [10, 3, 7, 25]]
+    faces = [MeshFace(1, [3, 7, 10]), MeshFace(2, [25, 10, 7])]
+
+    mesh_arrays = MeshArrays.from_mesh_elements(points, faces)
+
+    assert mesh_arrays.face_vertex_indices().tolist() == [[1, 2, 0], [3, 0, 2]]
+
+    with pytest.raises(ValueError, match="do not exist"):
+        MeshArrays.from_mesh_elements(points, [MeshFace(1, [3, 7, 11])]).face_vertex_indices()
+
+
+def test_renumber_consecutively():
+    # surfaces with large and overlapping vertex ids
+    points = [MeshVertex(vertex_id, float(vertex_id), 0.0, 0.0) for vertex_id in [20_000, 10_003, 15_007, 10_000]]
+    faces = [MeshFace(5, [10_003, 15_007, 20_000]), MeshFace(9, [10_000, 20_000, 15_007])]
+
+    mesh_arrays = MeshArrays.from_mesh_elements(points, faces)
+    assert not mesh_arrays.has_dense_ids()
+
+    first, second = MeshArrays.renumber_consecutively([mesh_arrays, mesh_arrays])
+
+    assert first.vertex_ids.tolist() == [1, 2, 3, 4]
+    assert first.face_ids.tolist() == [1, 2]
+    assert first.faces.tolist() == [[2, 3, 1], [4, 1, 3]]
+
+    assert second.vertex_ids.tolist() == [5, 6, 7, 8]
+    assert second.face_ids.tolist() == [3, 4]
+    assert second.faces.tolist() == [[6, 7, 5], [8, 5, 7]]
+
+    assert second.face_vertex_indices().tolist() == mesh_arrays.face_vertex_indices().tolist()
+
+    # dense ids are mapped directly, missing vertices are still detected
+    with pytest.raises(ValueError, match="do not exist"):
+        MeshArrays(
+            second.vertex_ids, second.x, second.y, second.z, second.face_ids, second.faces + 2
+        ).face_vertex_indices()
+
+
+def test_incomplete_view():
+    class IncompleteView(_MeshArraysView):
+        @staticmethod
+        def _part_length(mesh_arrays: MeshArrays) -> int:
+            return mesh_arrays.vertex_count
+
+    with pytest.raises(TypeError):
+        IncompleteView([])
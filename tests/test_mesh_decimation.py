@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_surface
+from landxmlconvertor.classes.mesh_arrays import MeshArrays
+from landxmlconvertor.classes.mesh_decimation import decimate
+
+
+def signed_areas(mesh: MeshArrays) -> np.ndarray:
+    triangles = mesh.face_vertex_indices()
+    x, y = mesh.x[triangles], mesh.y[triangles]
+    return (x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0]) - (x[:, 2] - x[:, 0]) * (y[:, 1] - y[:, 0])
+
+
+def boundary_points(mesh: MeshArrays) -> set:
+    triangles = mesh.face_vertex_indices()
+    edges = np.sort(np.stack([triangles, np.roll(triangles, -1, axis=1)], axis=2).reshape(-1, 2), axis=1)
+    unique_edges, counts = np.unique(edges, axis=0, return_counts=True)
+    vertices = np.unique(unique_edges[counts == 1])
+    return set(zip(mesh.x[vertices].tolist(), mesh.y[vertices].tolist()))
+
+
+def surface_heights(mesh: MeshArrays, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Heights of the mesh at the points, found by testing every triangle, NaN outside of the mesh."""
+    triangles = mesh.face_vertex_indices()
+    tx, ty, tz = mesh.x[triangles], mesh.y[triangles], mesh.z[triangles]
+
+    heights = np.full(x.size, np.nan)
+
+    for i in range(x.size):
+        area = (tx[:, 1] - tx[:, 0]) * (ty[:, 2] - ty[:, 0]) - (tx[:, 2] - tx[:, 0]) * (ty[:, 1] - ty[:, 0])
+        w1 = ((x[i] - tx[:, 0]) * (ty[:, 2] - ty[:, 0]) - (tx[:, 2] - tx[:, 0]) * (y[i] - ty[:, 0])) / area
+        w2 = ((tx[:, 1] - tx[:, 0]) * (y[i] - ty[:, 0]) - (x[i] - tx[:, 0]) * (ty[:, 1] - ty[:, 0])) / area
+        w0 = 1 - w1 - w2
+
+        inside = np.flatnonzero((w0 >= -1e-9) & (w1 >= -1e-9) & (w2 >= -1e-9))
+        if inside.size:
+            j = inside[0]
+            heights[i] = w0[j] * tz[j, 0] + w1[j] * tz[j, 1] + w2[j] * tz[j, 2]
+
+    return heights
+
+
+def test_decimate_target_faces():
+    mesh = synthetic_surface(5_000, seed=1)
+
+    decimated = decimate(mesh, target_faces=2_000)
+
+    assert decimated.face_count <= 2_000
+    assert decimated.face_count > 1_500
+    np.testing.assert_array_equal(decimated.vertex_ids, np.arange(1, decimated.vertex_count + 1))
+    np.testing.assert_array_equal(decimated.face_ids, np.arange(1, decimated.face_count + 1))
+
+    # no triangle is folded over and the outline is kept
+    assert np.all(signed_areas(decimated) > 0)
+    assert boundary_points(mesh) == boundary_points(decimated)
+
+    # kept vertices are not moved
+    original = set(zip(mesh.x.tolist(), mesh.y.tolist(), mesh.z.tolist()))
+    assert set(zip(decimated.x.tolist(), decimated.y.tolist(), decimated.z.tolist())) <= original
+
+
+def test_decimate_max_error():
+    mesh = synthetic_surface(2_000, seed=2)
+    max_error = 0.5
+
+    decimated = decimate(mesh, max_error=max_error)
+
+    assert decimated.face_count < mesh.face_count
+    assert np.all(signed_areas(decimated) > 0)
+
+    heights = surface_heights(decimated, mesh.x, mesh.y)
+
+    assert not np.any(np.isnan(heights))
+    assert np.max(np.abs(heights - mesh.z)) <= max_error + 1e-9
+
+
+def test_decimate_plane():
+    mesh = synthetic_surface(2_000, seed=3)
+    mesh.z = 2 * mesh.x - 3 * mesh.y + 10
+
+    decimated = decimate(mesh, max_error=1e-6)
+
+    # only the boundary vertices are needed to represent the plane
+    assert decimated.vertex_count < mesh.vertex_count / 5
+    np.testing.assert_allclose(surface_heights(decimated, mesh.x, mesh.y), mesh.z, atol=1e-6)
+
+
+def test_decimate_no_limit():
+    with pytest.raises(ValueError):
+        decimate(synthetic_surface(100))
+
+
+def test_decimate_polygon_faces():
+    """Faces wider than quads are fanned into triangles, none of their vertices or area is lost."""
+    mesh = MeshArrays(
+        np.arange(1, 6),
+        np.array([0.0, 2.0, 3.0, 1.0, -1.0]),
+        np.array([0.0, 0.0, 2.0, 3.0, 2.0]),
+        np.zeros(5),
+        np.array([1]),
+        np.array([[1, 2, 3, 4, 5]]),
+    )
+
+    decimated = decimate(mesh, target_faces=3)
+
+    assert decimated.vertex_count == 5
+    assert sorted(map(tuple, decimated.faces.tolist())) == [(1, 2, 3), (1, 3, 4), (1, 4, 5)]
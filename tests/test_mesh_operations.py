@@ -0,0 +1,220 @@
+import numpy as np
+import pytest
+
+from landxmlconvertor.classes.landxml_reader import LandXMLReader
+from landxmlconvertor.classes.mesh_arrays import NO_VERTEX, MeshArrays
+from landxmlconvertor.classes.mesh_elements import MeshFace, MeshVertex
+from landxmlconvertor.classes.mesh_operations import (
+    ClipArea,
+    close_vertex_pairs,
+    compact_mesh,
+    drop_unreferenced_vertices,
+    weld_vertices,
+)
+
+
+def square_surface(x_offset: float) -> MeshArrays:
+    """Unit square of two triangles on a plane sloped in both directions, vertices with arbitrary ids."""
+    points = [
+        MeshVertex(101, x_offset, 0.0, x_offset),
+        MeshVertex(102, x_offset + 1, 0.0, x_offset + 1),
+        MeshVertex(103, x_offset + 1, 1.0, x_offset + 3),
+        MeshVertex(104, x_offset, 1.0, x_offset + 2),
+    ]
+    faces = [MeshFace(1, [101, 102, 103]), MeshFace(2, [101, 103, 104])]
+
+    return MeshArrays.from_mesh_elements(points, faces)
+
+
+def test_close_vertex_pairs():
+    rng = np.random.default_rng(0)
+
+    x = rng.random(500) * 10
+    y = rng.random(500) * 10
+    tolerance = 0.2
+
+    pairs_i, pairs_j = close_vertex_pairs(x, y, tolerance)
+
+    distances = np.hypot(x[:, np.newaxis] - x, y[:, np.newaxis] - y)
+    expected = {(i, j) for i, j in zip(*np.nonzero(distances <= tolerance)) if i < j}
+
+    assert {(min(i, j), max(i, j)) for i, j in zip(pairs_i.tolist(), pairs_j.tolist())} == expected
+    assert len(pairs_i) == len(expected)
+
+    z = rng.random(500)
+
+    pairs_i, pairs_j = close_vertex_pairs(x, y, tolerance, z)
+
+    distances = np.sqrt(distances**2 + (z[:, np.newaxis] - z) ** 2)
+    expected = {(i, j) for i, j in zip(*np.nonzero(distances <= tolerance)) if i < j}
+
+    assert {(min(i, j), max(i, j)) for i, j in zip(pairs_i.tolist(), pairs_j.tolist())} == expected
+
+
+def test_weld_adjacent_surfaces():
+    # second square shares the edge at x = 1, within tolerance
+    merged = MeshArrays.concatenate(
+        MeshArrays.renumber_consecutively([square_surface(0.0), square_surface(1.0 + 1e-7)])
+    )
+
+    welded = weld_vertices(merged, 1e-6)
+
+    assert welded.vertex_count == 6
+    assert welded.face_count == 4
+    assert welded.vertex_ids.tolist() == list(range(1, 7))
+
+    # shared vertices keep coordinates of the first surface
+    assert welded.x[:4].tolist() == [0.0, 1.0, 1.0, 0.0]
+    assert welded.z.tolist() == pytest.approx([0.0, 1.0, 3.0, 2.0, 2.0, 4.0])
+
+    assert welded.faces.tolist() == [[1, 2, 3], [1, 3, 4], [2, 5, 6], [2, 6, 3]]
+
+    # nothing to weld
+    assert weld_vertices(merged, 1e-9) is merged
+    assert weld_vertices(merged, 0) is merged
+
+
+def test_weld_collapsed_faces():
+    points = [
+        MeshVertex(1, 0.0, 0.0, 0.0),
+        MeshVertex(2, 1.0, 0.0, 0.0),
+        MeshVertex(3, 1.0, 1.0, 0.0),
+        MeshVertex(4, 1.0, 1.001, 0.0),
+        MeshVertex(5, 0.0, 1.0, 0.0),
+    ]
+    faces = [MeshFace(1, [1, 2, 3, 4]), MeshFace(2, [2, 3, 4]), MeshFace(3, [1, 3, 5])]
+
+    welded = weld_vertices(MeshArrays.from_mesh_elements(points, faces), 0.01)
+
+    assert welded.vertex_count == 4
+    # quad becomes triangle, triangle of the close vertices is removed
+    assert welded.faces.tolist() == [[1, 2, 3, NO_VERTEX], [1, 3, 4, NO_VERTEX]]
+
+
+def test_weld_stacked_surfaces():
+    points = [
+        MeshVertex(1, 0.0, 0.0, 0.0),
+        MeshVertex(2, 1.0, 0.0, 0.0),
+        MeshVertex(3, 0.0, 1.0, 0.0),
+        MeshVertex(4, 0.0, 0.0, 5.0),
+        MeshVertex(5, 1.0, 0.0, 5.0),
+        MeshVertex(6, 0.0, 1.0, 5.0),
+    ]
+    faces = [MeshFace(1, [1, 2, 3]), MeshFace(2, [4, 5, 6])]
+    mesh = MeshArrays.from_mesh_elements(points, faces)
+
+    # same position in plan, different elevation
+    assert weld_vertices(mesh, 0.01) is mesh
+
+
+def test_weld_landxml(test_data_clean):
+    merged = LandXMLReader(test_data_clean).all_arrays
+
+    welded = weld_vertices(merged, 0.001)
+
+    assert welded.vertex_count < merged.vertex_count
+    assert welded.face_count < merged.face_count
+    assert welded.has_dense_ids()
+
+    indices = welded.face_vertex_indices()
+    assert np.all(indices[:, 0] != indices[:, 1])
+
+
+def test_clip_extent():
+    mesh = square_surface(0)
+
+    # extent overlaps bounding box of the second triangle, but not the triangle itself
+    clipped = ClipArea((0.8, 0.0, 1.0, 0.1)).clip(mesh)
+
+    assert clipped.face_ids.tolist() == [1]
+    assert clipped.vertex_ids.tolist() == [101, 102, 103]
+
+    assert ClipArea((-1, -1, 2, 2)).clip(mesh).face_count == 2
+    assert ClipArea((-1, -1, 2, 2)).clip(mesh).vertex_count == 4
+
+    outside = ClipArea((5, 5, 6, 6)).clip(mesh)
+    assert outside.face_count == 0
+    assert outside.vertex_count == 0
+
+
+def test_clip_polygons():
+    mesh = square_surface(0)
+
+    # polygon inside the second triangle
+    inside = [np.array([(0.1, 0.8), (0.2, 0.8), (0.1, 0.9)])]
+    assert ClipArea(polygons=[inside]).clip(mesh).face_ids.tolist() == [2]
+
+    # strip crossing both triangles, no vertices inside of each other
+    strip = [np.array([(0.45, -1), (0.55, -1), (0.55, 2), (0.45, 2)])]
+    assert ClipArea(polygons=[strip]).clip(mesh).face_ids.tolist() == [1, 2]
+
+    # extent is combined with polygons
+    assert ClipArea((0, 0.9, 0.8, 1), polygons=[strip]).clip(mesh).face_ids.tolist() == [2]
+
+    # whole square in hole of the polygon
+    with_hole = [np.array([(-5, -5), (5, -5), (5, 5), (-5, 5)]), np.array([(-1, -1), (2, -1), (2, 2), (-1, 2)])]
+    assert ClipArea(polygons=[with_hole]).clip(mesh).face_count == 0
+
+    # corner of the square in polygon
+    corner = [np.array([(0.9, 0.9), (2, 0.9), (2, 2), (0.9, 2)])]
+    assert ClipArea(polygons=[corner]).clip(mesh).face_ids.tolist() == [1, 2]
+
+    assert ClipArea(polygons=[inside]) == ClipArea(polygons=[inside])
+    assert ClipArea(polygons=[inside]) != ClipArea(polygons=[strip])
+
+
+def test_drop_unreferenced_vertices():
+    mesh = square_surface(0)
+
+    dropped = drop_unreferenced_vertices(
+        MeshArrays(mesh.vertex_ids, mesh.x, mesh.y, mesh.z, mesh.face_ids[:1], mesh.faces[:1])
+    )
+
+    assert dropped.vertex_ids.tolist() == [101, 102, 103]
+    assert dropped.faces.tolist() == [[101, 102, 103]]
+
+    assert drop_unreferenced_vertices(mesh) is mesh
+
+
+def test_compact_mesh():
+    points = [
+        MeshVertex(10, 0.0, 0.0, 0.0),
+        MeshVertex(20, 1.0, 0.0, 0.0),
+        MeshVertex(30, 1.0, 1.0, 0.0),
+        MeshVertex(40, 2.0, 2.0, 0.0),
+        MeshVertex(50, 5.0, 5.0, 0.0),
+        MeshVertex(60, 0.0, 1.0, 0.0),
+    ]
+    faces = [
+        MeshFace(1, [10, 20, 30]),
+        # duplicate with different order of vertices
+        MeshFace(2, [30, 10, 20]),
+        # repeated vertex
+        MeshFace(3, [10, 10, 20]),
+        # collinear vertices, zero area
+        MeshFace(4, [10, 30, 40]),
+        # quad with repeated corner becomes triangle
+        MeshFace(5, [10, 30, 30, 60]),
+    ]
+
+    compacted = compact_mesh(MeshArrays.from_mesh_elements(points, faces))
+
+    # vertex 50 is not referenced, 40 only by removed face
+    assert compacted.vertex_ids.tolist() == [1, 2, 3, 4]
+    assert compacted.x.tolist() == [0.0, 1.0, 1.0, 0.0]
+    assert compacted.face_ids.tolist() == [1, 2]
+    assert compacted.faces.tolist() == [[1, 2, 3], [1, 3, 4]]
+
+    # faces of small area
+    assert compact_mesh(MeshArrays.from_mesh_elements(points, faces), min_area=0.5).face_count == 0
+
+
+def test_compact_landxml(test_data_clean):
+    mesh = LandXMLReader(test_data_clean).get_surface_arrays(0)
+
+    compacted = compact_mesh(mesh)
+
+    assert compacted.has_dense_ids()
+    assert compacted.face_count <= mesh.face_count
+    assert compacted.vertex_count == drop_unreferenced_vertices(mesh).vertex_count
+    assert np.array_equal(compact_mesh(compacted).faces, compacted.faces)
@@ -0,0 +1,155 @@
+import csv
+import os
+import shutil
+import sys
+
+from landxmlconvertor.classes.landxml_reader import LandXMLReader
+from landxmlconvertor.classes.mesh2dm_reader import Mesh2DMReader
+from landxmlconvertor.classes.parallel import (
+    SUMMARY_COLUMNS,
+    ConversionResult,
+    ConversionTask,
+    convert_landxml_file,
+    output_names,
+    write_summary,
+)
+from landxmlconvertor.classes.processes import process_pool
+
+
+def test_convert_landxml_file(test_data_clean, tmp_path):
+    land_xml = LandXMLReader(test_data_clean)
+
+    result = convert_landxml_file(ConversionTask(test_data_clean, tmp_path.as_posix()))
+
+    assert result.succeeded
+    assert result.surfaces == land_xml.surface_count
+    assert result.faces == sum([x.arrays().face_count for x in land_xml.surfaces])
+    assert result.mesh_files == [(tmp_path / "Example_Clean" / f"{x.name}.2dm").as_posix() for x in land_xml.surfaces]
+    assert result.meshes == []
+
+    for mesh_file, surface in zip(result.mesh_files, land_xml.surfaces):
+        assert Mesh2DMReader(mesh_file).mesh_arrays.vertex_count == surface.arrays().vertex_count
+
+    merged = convert_landxml_file(ConversionTask(test_data_clean, tmp_path.as_posix(), merge_surfaces=True))
+
+    assert merged.mesh_files == [(tmp_path / "Example_Clean.2dm").as_posix()]
+    assert merged.vertices == land_xml.all_arrays.vertex_count
+
+    # other formats are left to the calling process
+    other = convert_landxml_file(ConversionTask(test_data_clean, tmp_path.as_posix(), "PLY", "ply"))
+
+    assert other.mesh_files == []
+    assert [x for x, _, _ in other.meshes] == [
+        (tmp_path / "Example_Clean" / f"{x.name}.ply").as_posix() for x in land_xml.surfaces
+    ]
+
+
+def test_failed_conversion(tmp_path):
+    broken_file = tmp_path / "broken.xml"
+    broken_file.write_text("<LandXML><Surfaces>")
+
+    result = convert_landxml_file(ConversionTask(broken_file.as_posix(), tmp_path.as_posix()))
+
+    assert not result.succeeded
+    assert "ParseError" in result.error
+    assert result.mesh_files == []
+
+
+def test_process_pool(test_data_folder, tmp_path):
+    files = []
+    for i in range(3):
+        file = tmp_path / f"file_{i}.xml"
+        shutil.copy(test_data_folder / "Example_Clean.xml", file)
+        files.append(file.as_posix())
+
+    (tmp_path / "broken.xml").write_text("<LandXML>")
+    files.append((tmp_path / "broken.xml").as_posix())
+
+    output_folder = (tmp_path / "output").as_posix()
+
+    with process_pool(2) as executor:
+        results = list(
+            executor.map(convert_landxml_file, [ConversionTask(x, output_folder, merge_surfaces=True) for x in files])
+        )
+
+    assert [x.succeeded for x in results] == [True, True, True, False]
+    assert sorted(os.listdir(output_folder)) == ["file_0.2dm", "file_1.2dm", "file_2.2dm"]
+
+    summary_file = (tmp_path / "summary.csv").as_posix()
+    write_summary(summary_file, results)
+
+    with open(summary_file, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+
+    assert tuple(rows[0].keys()) == SUMMARY_COLUMNS
+    assert [x["file"] for x in rows] == files
+    assert [x["status"] for x in rows] == ["ok", "ok", "ok", "failed"]
+    assert rows[0]["faces"] == str(results[0].faces)
+
+
+def test_canceled_result():
+    result = ConversionResult("file.xml")
+    result.canceled = True
+
+    assert not result.succeeded
+    assert result.summary_row()["status"] == "canceled"
+    assert result.summary_row()["error"] == ""
+
+
+def test_output_names_in_subfolders(test_data_folder, tmp_path):
+    input_folder = tmp_path / "input"
+
+    files = []
+    for folder in ["sub1", "sub2"]:
+        (input_folder / folder).mkdir(parents=True)
+        shutil.copy(test_data_folder / "Example_Clean.xml", input_folder / folder / "x.xml")
+        files.append((input_folder / folder / "x.xml").as_posix())
+
+    names = output_names(files, input_folder.as_posix())
+
+    assert names == [os.path.join("sub1", "x"), os.path.join("sub2", "x")]
+
+    output_folder = tmp_path / "output"
+
+    with process_pool(2) as executor:
+        results = list(
+            executor.map(
+                convert_landxml_file,
+                [
+                    ConversionTask(x, output_folder.as_posix(), merge_surfaces=True, output_name=y)
+                    for x, y in zip(files, names)
+                ],
+            )
+        )
+
+    assert [x.succeeded for x in results] == [True, True]
+    assert [x.mesh_files for x in results] == [
+        [os.path.join(output_folder.as_posix(), "sub1", "x.2dm")],
+        [os.path.join(output_folder.as_posix(), "sub2", "x.2dm")],
+    ]
+
+    for result in results:
+        assert Mesh2DMReader(result.mesh_files[0]).mesh_arrays.vertex_count == result.vertices
+
+
+def test_output_names_duplicates():
+    assert output_names(["a/x.xml", "b/x.xml", "a/x.xml.gz", "c/X.zip"]) == ["x", "x_2", "x_3", "X_4"]
+    assert output_names(["folder/a.xml", "other/a.xml"], "folder") == ["a", "a_2"]
+
+
+def loaded_modules():
+    return list(sys.modules.keys())
+
+
+def test_worker_imports(test_data_clean, tmp_path):
+    """Workers are spawned without QGIS application, they must not import the plugin and its algorithms."""
+    with process_pool(1) as executor:
+        result = executor.submit(convert_landxml_file, ConversionTask(test_data_clean, tmp_path.as_posix())).result()
+        modules = executor.submit(loaded_modules).result()
+
+    assert result.succeeded
+    assert "landxmlconvertor.classes.parallel" in modules
+    assert "landxmlconvertor.plugin" not in modules
+    assert "landxmlconvertor.provider_landxmlplugin" not in modules
+    assert "landxmlconvertor.tool_convert_landxml_2_mesh" not in modules
+    assert "qgis.gui" not in modules
@@ -0,0 +1,74 @@
+import json
+
+import numpy as np
+import pytest
+from qgis.core import QgsProcessingFeedback
+
+from landxmlconvertor.classes.profiler import Profiler
+
+
+def test_profiler_stages(tmp_path):
+    profiler = Profiler(QgsProcessingFeedback(), trace_memory=True)
+
+    with profiler.stage("allocation") as stage:
+        values = np.ones(1024 * 1024)
+        stage.counts = {"values": values.size}
+
+    with profiler.stage("nothing"):
+        pass
+
+    assert [x.name for x in profiler.stages] == ["allocation", "nothing"]
+    assert profiler.stages[0].counts == {"values": 1024 * 1024}
+    assert profiler.stages[0].peak_memory >= values.nbytes
+    assert profiler.stages[1].peak_memory < values.nbytes
+    assert profiler.total_time >= sum([x.time for x in profiler.stages])
+
+    assert "allocation: " in str(profiler.stages[0])
+    assert "values 1048576" in str(profiler.stages[0])
+
+    profile_file = tmp_path / "profile.json"
+    profiler.write(profile_file.as_posix(), algorithm="test")
+
+    profile = json.loads(profile_file.read_text())
+
+    assert profile["algorithm"] == "test"
+    assert [x["name"] for x in profile["stages"]] == ["allocation", "nothing"]
+    assert profile["stages"][0]["counts"] == {"values": 1024 * 1024}
+
+
+def test_profiler_nested_stages():
+    profiler = Profiler(trace_memory=True)
+
+    with profiler.stage("outer"):
+        values = np.ones(1024 * 1024)
+        del values
+
+        with profiler.stage("small inner"):
+            np.ones(1024)
+
+    with profiler.stage("outer"):
+        with profiler.stage("large inner"):
+            np.ones(2 * 1024 * 1024)
+
+        with profiler.stage("small inner"):
+            np.ones(1024)
+
+    assert [x.name for x in profiler.stages] == ["small inner", "outer", "large inner", "small inner", "outer"]
+
+    # peak of the outer stage is not only the peak of its last inner stage
+    assert profiler.stages[0].peak_memory < 1024 * 1024
+    assert profiler.stages[1].peak_memory >= 1024 * 1024 * 8
+    assert profiler.stages[4].peak_memory >= profiler.stages[2].peak_memory >= 2 * 1024 * 1024 * 8
+
+
+def test_profiler_without_memory():
+    profiler = Profiler()
+
+    with pytest.raises(ValueError):
+        with profiler.stage("failing"):
+            raise ValueError("error")
+
+    # failed stage is still measured
+    assert profiler.stages[0].name == "failing"
+    assert profiler.stages[0].peak_memory is None
+    assert "peak memory" not in str(profiler.stages[0])
@@ -0,0 +1,140 @@
+import typing
+
+import pytest
+
+from benchmarks.synthetic import synthetic_surfaces, write_2dm
+from landxmlconvertor.classes import landxml_chunks, landxml_reader, landxml_writer, mesh2dm_writer
+from landxmlconvertor.classes.landxml_reader import LandXMLReader
+from landxmlconvertor.classes.landxml_writer import LandXMLWriter
+from landxmlconvertor.classes.mesh2dm_reader import Mesh2DMReader
+from landxmlconvertor.classes.mesh2dm_writer import Mesh2DMWriter
+from landxmlconvertor.classes.progress import ConversionCanceledError, ProgressPoller
+
+
+class ProgressRecorder:
+    """Records reported progress, cancels after `cancel_after` calls."""
+
+    def __init__(self, cancel_after: typing.Optional[int] = None) -> None:
+        self.cancel_after = cancel_after
+        self.values: typing.List[float] = []
+
+    def __call__(self, progress: float) -> bool:
+        self.values.append(progress)
+        return self.cancel_after is None or len(self.values) < self.cancel_after
+
+
+def test_poller():
+    recorder = ProgressRecorder()
+    poller = ProgressPoller(recorder, total=100, interval=30)
+
+    for _ in range(100):
+        poller.step()
+    poller.finish()
+
+    assert recorder.values == [30.0, 60.0, 90.0, 100.0]
+
+    poller = ProgressPoller(ProgressRecorder(cancel_after=2), total=100, interval=10)
+
+    with pytest.raises(ConversionCanceledError):
+        for _ in range(100):
+            poller.step()
+
+    assert poller.count == 20
+
+    # without callback polling does nothing
+    poller = ProgressPoller(None)
+    poller.step(1_000_000)
+    poller.finish()
+
+
+@pytest.mark.parametrize(
+    "parser",
+    [
+        "etree",
+        "iterparse",
+        "expat",
+        pytest.param(
+            "lxml", marks=pytest.mark.skipif(not landxml_reader.lxml_available(), reason="lxml not installed")
+        ),
+        "mmap",
+    ],
+)
+def test_read_progress(synthetic_landxml, monkeypatch, parser):
+    monkeypatch.setattr(landxml_reader, "PARSE_BLOCK_SIZE", 64 * 1024)
+    monkeypatch.setattr(landxml_chunks, "CHUNK_SIZE", 64 * 1024)
+
+    recorder = ProgressRecorder()
+    land_xml = LandXMLReader(synthetic_landxml, parser=parser, progress=recorder)
+
+    assert land_xml.surface_count == 2
+    assert len(recorder.values) > 5
+    assert recorder.values == sorted(recorder.values)
+    assert recorder.values[-1] == 100.0
+
+    with pytest.raises(ConversionCanceledError):
+        LandXMLReader(synthetic_landxml, parser=parser, progress=ProgressRecorder(cancel_after=2))
+
+
+def test_scan_progress(synthetic_landxml, monkeypatch):
+    monkeypatch.setattr(landxml_reader, "PARSE_BLOCK_SIZE", 64 * 1024)
+
+    recorder = ProgressRecorder()
+    scan = LandXMLReader.scan(synthetic_landxml, progress=recorder)
+
+    assert scan.point_count == LandXMLReader.scan(synthetic_landxml).point_count
+    assert len(recorder.values) > 5
+    assert recorder.values[-1] == 100.0
+
+    with pytest.raises(ConversionCanceledError):
+        LandXMLReader.scan(synthetic_landxml, progress=ProgressRecorder(cancel_after=2))
+
+
+def test_2dm_progress(tmp_path, monkeypatch):
+    mesh_arrays = synthetic_surfaces(1, 20_000)[0]
+
+    file = (tmp_path / "synthetic.2dm").as_posix()
+    write_2dm(file, mesh_arrays)
+
+    monkeypatch.setattr(Mesh2DMReader, "BLOCK_SIZE", 64 * 1024)
+
+    recorder = ProgressRecorder()
+    mesh_2d = Mesh2DMReader(file, progress=recorder)
+
+    assert mesh_2d.mesh_arrays.vertex_count == mesh_arrays.vertex_count
+    assert len(recorder.values) > 5
+    assert recorder.values == sorted(recorder.values)
+
+    with pytest.raises(ConversionCanceledError):
+        Mesh2DMReader(file, progress=ProgressRecorder(cancel_after=2))
+
+    monkeypatch.setattr(mesh2dm_writer, "WRITE_CHUNK_SIZE", 1000)
+
+    recorder = ProgressRecorder()
+    Mesh2DMWriter.from_mesh_arrays(mesh_arrays).write((tmp_path / "written.2dm").as_posix(), recorder)
+
+    assert len(recorder.values) > 5
+    assert recorder.values == sorted(recorder.values)
+    assert recorder.values[-1] == 100.0
+
+    with pytest.raises(ConversionCanceledError):
+        Mesh2DMWriter.from_mesh_arrays(mesh_arrays).write(
+            (tmp_path / "canceled.2dm").as_posix(), ProgressRecorder(cancel_after=2)
+        )
+
+
+def test_landxml_write_progress(tmp_path, monkeypatch):
+    monkeypatch.setattr(landxml_writer, "WRITE_CHUNK_SIZE", 1000)
+
+    writer = LandXMLWriter()
+    for i, mesh_arrays in enumerate(synthetic_surfaces(2, 20_000)):
+        writer.add_surface_arrays(f"Surface {i + 1}", mesh_arrays)
+
+    recorder = ProgressRecorder()
+    writer.write((tmp_path / "written.xml").as_posix(), recorder)
+
+    assert len(recorder.values) > 5
+    assert recorder.values == sorted(recorder.values)
+    assert recorder.values[-1] == 100.0
+
+    with pytest.raises(ConversionCanceledError):
+        writer.write((tmp_path / "canceled.xml").as_posix(), ProgressRecorder(cancel_after=2))
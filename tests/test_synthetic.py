@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_surface, synthetic_surfaces, write_2dm, write_landxml
+from landxmlconvertor.classes.landxml_reader import LandXMLReader
+from landxmlconvertor.classes.mesh2dm_reader import Mesh2DMReader
+
+
+def test_synthetic_surface():
+    mesh_arrays = synthetic_surface(1000, seed=1)
+
+    assert mesh_arrays.vertex_count >= 1000
+    assert mesh_arrays.face_count == 2 * (32 - 1) * (32 - 1)
+    assert mesh_arrays.has_dense_ids()
+    assert mesh_arrays.face_vertex_indices().max() == mesh_arrays.vertex_count - 1
+
+    # deterministic for the same seed
+    assert np.array_equal(mesh_arrays.z, synthetic_surface(1000, seed=1).z)
+    assert not np.array_equal(mesh_arrays.z, synthetic_surface(1000, seed=2).z)
+
+
+@pytest.mark.parametrize("namespace", [True, False])
+def test_synthetic_landxml(tmp_path, namespace):
+    surfaces = synthetic_surfaces(2, 500)
+
+    file = (tmp_path / "synthetic.xml").as_posix()
+    write_landxml(file, surfaces, namespace=namespace)
+
+    land_xml = LandXMLReader(file, streaming=True)
+
+    assert land_xml.namespace_prefix == ("LandXML-1.2:" if namespace else "")
+    assert land_xml.crs().authid() == "EPSG:3007"
+    assert land_xml.surface_count == 2
+
+    for surface, mesh_arrays in zip(land_xml.surfaces, surfaces):
+        assert np.array_equal(surface.arrays().x, mesh_arrays.x)
+        assert np.array_equal(surface.arrays().z, mesh_arrays.z)
+        assert np.array_equal(surface.arrays().faces, mesh_arrays.faces)
+
+
+def test_synthetic_2dm(tmp_path):
+    mesh_arrays = synthetic_surface(500)
+
+    file = (tmp_path / "synthetic.2dm").as_posix()
+    write_2dm(file, mesh_arrays)
+
+    mesh_2dm = Mesh2DMReader(file).mesh_arrays
+
+    assert np.array_equal(mesh_2dm.vertex_ids, mesh_arrays.vertex_ids)
+    assert np.array_equal(mesh_2dm.y, mesh_arrays.y)
+    assert np.array_equal(mesh_2dm.faces, mesh_arrays.faces)